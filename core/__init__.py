@@ -17,7 +17,7 @@ root_modules = [
 
 core_modules = [
     "sv_custom_exceptions", "update_system",
-    "sockets", "socket_data",
+    "sockets", "socket_data", "output_cache",
     "handlers",
     "events", "node_group",
     "tasks",
@@ -91,10 +91,7 @@ class GroupUpdateTree(us.UpdateTree):
             # walker = self._debug_color(walker)
             for node, prev_socks in walker:
                 with us.AddStatistic(node, self):
-                    us.prepare_input_data(prev_socks, node.inputs)
-                    if error := node.dependency_error:
-                        raise error
-                    node.process()
+                    self.process_node(node, prev_socks)
 
             if is_opened_tree:
                 if self._tree.show_time_mode == "Cumulative":
@@ -311,6 +311,8 @@ class SvGroupTreeNode(SverchCustomTreeNode, bpy.types.NodeCustomGroup):
     """Node for keeping sub trees"""
     bl_idname = 'SvGroupTreeNode'
     bl_label = 'Group node (Alpha)'
+    # group trees keep execution path in a class attribute
+    updates_other_nodes = True
 
     # todo add methods: switch_on_off
 
@@ -0,0 +1,267 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""Memoization of node outputs for the update system.
+
+When the `SvNodeTreeCommon.sv_cache_outputs` option of a tree is on, before
+calling `process` method of a node the update system calculates a fingerprint
+of the node - a hash of its input data, properties and sockets state. If
+outputs of the node with the same fingerprint were stored previously they are
+put into output sockets instead of calling the `process` method.
+
+Data which can't be hashed by value (curves, surfaces, fields etc.) is
+identified by the object identity. Since nodes which did not change return
+the very same objects this is enough to get hits downstream of them. Cache
+entries keep such objects alive, so their identifiers can't be reused.
+
+Only nodes which declare that their outputs depend on their inputs and
+properties only (`is_output_cacheable`) are cached. Even then nodes which read
+or write Blender data (scene and animation dependent ones, nodes with pointers
+to data blocks) are never cached."""
+
+import hashlib
+import io
+import pickle
+from collections import OrderedDict
+from itertools import chain
+from threading import Lock
+from types import FunctionType, BuiltinFunctionType
+from typing import TYPE_CHECKING, Optional, NamedTuple, Any
+
+import numpy as np
+
+from sverchok.core.socket_data import (socket_data_cache, sv_set_socket,
+                                       sv_forget_socket, estimate_size,
+                                       write_property)
+
+if TYPE_CHECKING:
+    from sverchok.node_tree import SverchCustomTreeNode as SvNode
+
+CACHE_HITS_KEY = "US_cache_hits"
+CACHE_MISSES_KEY = "US_cache_misses"
+
+
+def _increment(node: 'SvNode', key: str):
+    node[key] = node.get(key, 0) + 1
+
+
+class NotCacheable(Exception):
+    """Raised during fingerprinting of a node which should not be cached"""
+
+
+def _by_identity(kind, obj_id):
+    """Stub used in pickled fingerprints instead of objects which are
+    identified by their identity"""
+    return kind, obj_id
+
+
+class _Fingerprinter(pickle.Pickler):
+    """Pickler which serializes only plain data. Other objects are replaced
+    with their identifiers and are kept in the keep_alive list."""
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.keep_alive = []
+
+    def reducer_override(self, obj):
+        if isinstance(obj, (type, FunctionType, BuiltinFunctionType)):
+            return NotImplemented  # pickled by reference
+        if isinstance(obj, (np.ndarray, np.generic, np.dtype)):
+            return NotImplemented
+        if hasattr(obj, 'as_pointer'):
+            # Blender data can be changed without any notice for the tree
+            raise NotCacheable(obj)
+        if type(obj).__module__ == 'mathutils':
+            # vectors, matrices and quaternions are compared by value
+            return tuple, (tuple(tuple(i) if hasattr(i, '__len__') else i for i in obj),)
+        if isinstance(obj, (int, float, str, bytes, list, tuple, dict, set, frozenset)):
+            return NotImplemented
+        self.keep_alive.append(obj)
+        return _by_identity, (type(obj).__qualname__, id(obj))
+
+
+# properties which do not effect outputs but can be changed by the update system
+_volatile_props = {'n_id', 's_id', 'objects_number', 'refresh'}
+
+
+def _rna_values(struct):
+    """Values of properties registered by Sverchok (not built-in ones)
+    of a node, a socket or a property group"""
+    values = []
+    for prop in struct.bl_rna.properties:
+        if not prop.is_runtime or prop.identifier in _volatile_props:
+            continue
+        value = getattr(struct, prop.identifier, None)
+        if prop.type == 'POINTER':
+            if value is None:
+                values.append(None)
+            elif hasattr(value, 'users'):  # ID data block
+                raise NotCacheable(prop.identifier)
+            else:
+                values.append(_rna_values(value))
+        elif prop.type == 'COLLECTION':
+            values.append([_rna_values(item) for item in value])
+        elif prop.type == 'ENUM' and prop.is_enum_flag:
+            values.append(tuple(sorted(value)))
+        elif getattr(prop, 'is_array', False):
+            values.append(tuple(value))
+        else:
+            values.append(value)
+    return values
+
+
+def can_cache(node: 'SvNode') -> bool:
+    """Whether outputs of the node can be memoized in principle"""
+    return (len(node.outputs) > 0
+            and getattr(node, 'is_output_cacheable', False)
+            and not getattr(node, 'is_scene_dependent', False)
+            and not getattr(node, 'is_animation_dependent', False))
+
+
+def fingerprint(node: 'SvNode') -> Optional[tuple[bytes, list]]:
+    """Returns hash of everything what can effect outputs of the node
+    together with list of objects which were hashed by identity.
+    Input data should be already prepared.
+    If the node can't be cached it returns None."""
+    if not can_cache(node):
+        return None
+    buffer = io.BytesIO()
+    pickler = _Fingerprinter(buffer)
+    try:
+        sockets = [(s.is_linked, s.hide, _rna_values(s))
+                   for s in chain(node.inputs, node.outputs)]
+        input_data = [socket_data_cache.get(s.socket_id) if s.is_linked else None
+                      for s in node.inputs]
+        pickler.dump((node.bl_idname, node.id_data.sv_draft, _rna_values(node),
+                      sockets, input_data))
+    except (NotCacheable, pickle.PicklingError, TypeError, AttributeError):
+        return None
+    digest = hashlib.blake2b(buffer.getbuffer(), digest_size=20).digest()
+    return digest, pickler.keep_alive
+
+
+class _Entry(NamedTuple):
+    outputs: dict[str, Any]  # socket identifier -> data
+    keep_alive: list
+    size: int
+
+
+class NodeOutputCache:
+    """LRU storage of node outputs with memory budget"""
+    def __init__(self, max_size: int):
+        """:max_size: maximum size of stored data in bytes"""
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple[str, bytes], _Entry] = OrderedDict()
+        self._size = 0
+        self._lock = Lock()  # nodes can be updated from several threads
+        # node id -> fingerprint with which the node was updated last time
+        self._last_digests: dict[str, Optional[bytes]] = dict()
+
+    @property
+    def size(self) -> int:
+        """Approximate number of bytes occupied by cached data"""
+        return self._size
+
+    def restore(self, node: 'SvNode', digest: bytes) -> bool:
+        """Puts stored outputs into the node output sockets.
+        Returns False if there is no outputs with given fingerprint."""
+        key = (node.node_id, digest)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            write_property(_increment, node, CACHE_MISSES_KEY)
+            return False
+        for socket in node.outputs:
+            data = entry.outputs.get(socket.identifier)
+            if data is None:
+                sv_forget_socket(socket)
+            else:
+                # data was already post processed by the socket
+                sv_set_socket(socket, data)
+                write_property(setattr, socket, 'objects_number', len(data))
+        write_property(_increment, node, CACHE_HITS_KEY)
+        return True
+
+    def swap_digest(self, node: 'SvNode', digest: Optional[bytes]) -> Optional[bytes]:
+        """Remembers fingerprint with which the node is updated now and
+        returns the fingerprint of its previous update. None means that
+        the node was updated without the cache or failed."""
+        with self._lock:
+            last_digest = self._last_digests.get(node.node_id)
+            self._last_digests[node.node_id] = digest
+        return last_digest
+
+    def store(self, node: 'SvNode', digest: bytes, keep_alive: list):
+        """Saves current outputs of the node"""
+        outputs = dict()
+        for socket in node.outputs:
+            data = socket_data_cache.get(socket.socket_id)
+            if data is not None:
+                outputs[socket.identifier] = data
+        size = sum(estimate_size(d) for d in outputs.values())
+        if size > self.max_size:
+            return
+        key = (node.node_id, digest)
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key).size
+            self._entries[key] = _Entry(outputs, keep_alive, size)
+            self._size += size
+            while self._size > self.max_size:
+                _, old = self._entries.popitem(last=False)
+                self._size -= old.size
+
+    def forget(self, node: 'SvNode', identities_only=False):
+        """Removes stored outputs of the node. If identities_only is True
+        only entries which keep alive objects hashed by identity are removed,
+        other entries are still valid after their input data is recalculated."""
+        with self._lock:
+            keys = [key for key, entry in self._entries.items()
+                    if key[0] == node.node_id and (entry.keep_alive or not identities_only)]
+            for key in keys:
+                self._size -= self._entries.pop(key).size
+            if not identities_only:
+                self._last_digests.pop(node.node_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+_tree_caches: dict[str, NodeOutputCache] = dict()
+
+
+def get_cache(tree) -> Optional[NodeOutputCache]:
+    """Returns output cache of the tree. If caching is disabled in the tree
+    it returns None"""
+    if not getattr(tree, 'sv_cache_outputs', False):
+        return None
+    max_size = tree.sv_cache_size * 2**20
+    cache = _tree_caches.get(tree.tree_id)
+    if cache is None:
+        cache = _tree_caches[tree.tree_id] = NodeOutputCache(max_size)
+    cache.max_size = max_size
+    return cache
+
+
+def reset_cache(tree=None):
+    """Removes stored outputs of the given tree or of all trees.
+    Also it resets statistics of the tree nodes."""
+    if tree is None:
+        _tree_caches.clear()
+        return
+    _tree_caches.pop(tree.tree_id, None)
+    for node in tree.nodes:
+        for key in (CACHE_HITS_KEY, CACHE_MISSES_KEY):
+            if key in node:
+                del node[key]
+
+
+def unregister():
+    reset_cache()
@@ -17,12 +17,16 @@
 # ##### END GPL LICENSE BLOCK #####
 
 """For internal usage of the sockets module"""
+import hashlib
 import logging
+import sys
+import threading
 from collections import UserDict
 from itertools import chain
 from traceback import format_list, extract_stack
 from typing import NewType, Optional, Literal
 
+import numpy as np
 from bpy.types import NodeSocket
 from sverchok.core.sv_custom_exceptions import SvNoDataError
 from sverchok.utils.handle_blender_data import BlTrees
@@ -154,6 +158,9 @@ class DebugMemory(UserDict):
 
 
 socket_data_cache: dict[SockId, list] = dict()
+# approximate size in bytes of data of output sockets, input sockets share
+# the data with output ones
+socket_data_sizes: dict[SockId, int] = dict()
 # socket_data_cache = DebugMemory(socket_data_cache)
 
 
@@ -166,21 +173,146 @@ def sv_deep_copy(lst):
     if isinstance(lst, (list, tuple)):
         if lst and not isinstance(lst[0], (list, tuple)):
             return lst[:]
+        # tuples of numbers (vertices, edges) are immutable and can be shared
+        # between copies, it saves a function call per tuple
+        if isinstance(lst, list) and lst and all(
+                type(t) is tuple and t and not isinstance(t[0], (list, tuple)) for t in lst):
+            return lst[:]
         return [sv_deep_copy(l) for l in lst]
     return lst
 
 
+# SockId -> (data, checksum) of data which was got without copying
+_borrowed_data: dict[SockId, tuple[list, bytes]] = dict()
+
+
+def _checksum(data) -> bytes:
+    """Hash of socket data content. Objects other than lists, tuples, arrays,
+    numbers and strings are hashed by identity."""
+    hasher = hashlib.blake2b(digest_size=16)
+
+    def update(item):
+        if isinstance(item, (list, tuple)):
+            hasher.update(b'[' if isinstance(item, list) else b'(')
+            for i in item:
+                update(i)
+            hasher.update(b']')
+        elif isinstance(item, np.ndarray):
+            hasher.update(str((item.dtype, item.shape)).encode())
+            hasher.update(np.ascontiguousarray(item).tobytes())
+        elif isinstance(item, (int, float, str, bytes, np.generic)) or item is None:
+            hasher.update(repr(item).encode())
+        else:
+            hasher.update(str(id(item)).encode())
+    update(data)
+    return hasher.digest()
+
+
+def check_borrowed_data(node):
+    """In debug mode sockets remember data which was got by nodes without
+    copying (deepcopy=False). This function should be called after the node
+    has been processed. It logs an error if the node has changed such data,
+    which means that the node damaged outputs of previous nodes and should
+    copy its input data."""
+    if not _borrowed_data:
+        return
+    for socket in node.inputs:
+        if (borrowed := _borrowed_data.pop(socket.socket_id, None)) is None:
+            continue
+        data, checksum = borrowed
+        if _checksum(data) != checksum:
+            sv_logger.error(f'Node "{node.name}" of "{node.id_data.name}" tree '
+                            f'has changed input data of "{socket.name}" socket '
+                            f'which was got without copying (deepcopy=False)')
+
+
+def forget_borrowed_data():
+    """Data got without copying by nodes which were not checked by the
+    check_borrowed_data function should not be kept. It should be called
+    after the tree update"""
+    _borrowed_data.clear()
+
+
+def estimate_size(data) -> int:
+    """Returns approximate number of bytes occupied by socket data.
+    Long lists are not walked entirely, the size is extrapolated from several
+    of their items. Curves, surfaces and other objects with control points
+    are estimated by the size of control points."""
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    if isinstance(data, (list, tuple)):
+        size = sys.getsizeof(data)
+        if len(data) <= 16:
+            return size + sum(estimate_size(item) for item in data)
+        step = len(data) // 8
+        sample = data[::step][:8]
+        return size + sum(estimate_size(item) for item in sample) * len(data) // len(sample)
+    if hasattr(data, 'get_control_points'):
+        try:
+            return sys.getsizeof(data) + estimate_size(data.get_control_points())
+        except Exception:
+            pass
+    return sys.getsizeof(data)
+
+
+_thread_data = threading.local()
+
+
+class DeferredWrites:
+    """Blender data should be changed only in the main thread. Inside this
+    context changes made via the `write_property` function are collected
+    instead, so a node can be updated in a worker thread. Then the changes
+    should be made in the main thread by the apply method."""
+    def __init__(self):
+        self._writes = []
+
+    def __enter__(self):
+        _thread_data.writes = self._writes
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _thread_data.writes = None
+
+    def apply(self):
+        for func, args in self._writes:
+            func(*args)
+        self._writes.clear()
+
+
+def write_property(func, *args):
+    """Calls the function which changes Blender data, e.g. setattr, or
+    postpones the call if it is made inside DeferredWrites context"""
+    writes = getattr(_thread_data, 'writes', None)
+    if writes is None:
+        func(*args)
+    else:
+        writes.append((func, args))
+
+
 def sv_forget_socket(socket):
     """deletes socket data from cache"""
     try:
         del socket_data_cache[socket.socket_id]
     except KeyError:
         pass
+    socket_data_sizes.pop(socket.socket_id, None)
 
 
 def sv_set_socket(socket, data):
     """sets socket data for socket"""
     socket_data_cache[socket.socket_id] = data
+    if socket.is_output:
+        socket_data_sizes[socket.socket_id] = estimate_size(data)
+
+
+def socket_data_size(socket) -> int:
+    """Approximate number of bytes occupied by data of an output socket"""
+    return socket_data_sizes.get(socket.socket_id, 0)
+
+
+def node_data_size(node) -> int:
+    """Approximate number of bytes occupied by data of outputs of a node"""
+    return sum(socket_data_sizes.get(s.socket_id, 0) for s in node.outputs)
 
 
 def sv_get_socket(socket, deepcopy=True):
@@ -191,7 +323,11 @@ def sv_get_socket(socket, deepcopy=True):
     """
     data = socket_data_cache.get(socket.socket_id)
     if data is not None:
-        return sv_deep_copy(data) if deepcopy else data
+        if deepcopy:
+            return sv_deep_copy(data)
+        if not socket.is_output and sv_logger.isEnabledFor(logging.DEBUG):
+            _borrowed_data[socket.socket_id] = (data, _checksum(data))
+        return data
     else:
         raise SvNoDataError(socket)
 
@@ -215,6 +351,8 @@ def clear_all_socket_cache():
     Reset socket cache for all node-trees.
     """
     socket_data_cache.clear()
+    socket_data_sizes.clear()
+    _borrowed_data.clear()
 
 
 def unregister():
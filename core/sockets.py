@@ -27,7 +27,7 @@ from bpy.props import StringProperty, BoolProperty, FloatVectorProperty, IntProp
 from bpy.types import NodeTree, NodeSocket
 
 from sverchok.core.socket_conversions import ConversionPolicies
-from sverchok.core.socket_data import sv_get_socket, sv_set_socket, sv_forget_socket
+from sverchok.core.socket_data import sv_get_socket, sv_set_socket, sv_forget_socket, write_property
 from sverchok.core.sv_custom_exceptions import SvNoDataError
 
 from sverchok.data_structure import (
@@ -455,7 +455,7 @@ class SvSocketCommon(SvSocketProcessing):
             data = self.postprocess_output(data)
 
         # it's expensive to call sv_get method to update the number in other places
-        self.objects_number = len(data)
+        write_property(setattr, self, 'objects_number', len(data))
 
         sv_set_socket(self, data)
 
@@ -1,6 +1,7 @@
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 from copy import copy
-from functools import lru_cache
+from functools import lru_cache, cache
 from graphlib import TopologicalSorter
 from itertools import chain
 from time import perf_counter
@@ -9,8 +10,12 @@ from typing import TYPE_CHECKING, Optional, Generator, Iterable
 from bpy.types import Node, NodeSocket, NodeTree, NodeLink
 import sverchok.core.events as ev
 import sverchok.core.tasks as ts
+import sverchok.core.output_cache as oc
 from sverchok.core.sv_custom_exceptions import CancelError, SvNoDataError
 from sverchok.core.socket_conversions import conversions
+from sverchok.core.socket_data import (check_borrowed_data, socket_data_size,
+                                       sv_forget_socket, DeferredWrites,
+                                       forget_borrowed_data)
 from sverchok.utils.profile import profile
 from sverchok.utils.sv_logging import node_error_logger
 from sverchok.utils.tree_walk import bfs_walk
@@ -183,10 +188,36 @@ class SearchTree:
         records nodes statistics
         If suppress is True an error during node execution will be suppressed"""
         with AddStatistic(node, suppress):
-            prepare_input_data(self.previous_sockets(node), node.inputs)
-            if error := node.dependency_error:
-                raise error
+            self.process_node(node, self.previous_sockets(node))
+
+    def process_node(self, node: 'SvNode', prev_socks: list[Optional[NodeSocket]]) -> bool:
+        """Prepares input data and calls process method of the given node.
+        If output cache of the tree is enabled and the node has stored
+        outputs for current inputs and properties, the outputs are restored
+        instead of calling the process method. Returns True if the restored
+        outputs are the same as the node had after its previous update, so
+        next nodes do not have to be updated. Restored outputs can also
+        belong to an older state of the node (e.g. a property was changed
+        and then changed back), False is returned in this case."""
+        prepare_input_data(prev_socks, node.inputs)
+        cache = oc.get_cache(self._tree)
+        if cache is not None:
+            # if the node fails its previous state is unknown
+            last_digest = cache.swap_digest(node, None)
+        if error := node.dependency_error:
+            raise error
+        key = cache and oc.fingerprint(node)
+        if key is None:
             node.process()
+            return False
+        digest, keep_alive = key
+        if cache.restore(node, digest):
+            cache.swap_digest(node, digest)
+            return digest == last_digest
+        node.process()
+        cache.store(node, digest, keep_alive)
+        cache.swap_digest(node, digest)
+        return False
 
     def _remove_reroutes(self):
         for r in self._tree.nodes:
@@ -454,19 +485,26 @@ class UpdateTree(SearchTree):
 
         # print(f"UPDATE NODES {event.type=}, {event.tree.name=}")
         up_tree = cls.get(tree, refresh_tree=True)
-        if update_nodes:
+        if update_nodes and tree.sv_threads > 1:
+            try:
+                yield from up_tree._walk_parallel(tree.sv_threads)
+            except CancelError:
+                pass
+        elif update_nodes:
             walker = up_tree._walk()
             # walker = up_tree._debug_color(walker)
             try:
                 for node, prev_socks in walker:
                     with AddStatistic(node):
                         yield node
-                        prepare_input_data(prev_socks, node.inputs)
-                        if error := node.dependency_error:
-                            raise error
-                        node.process()
+                        if up_tree.process_node(node, prev_socks):
+                            up_tree._cached_nodes.add(node)
             except CancelError:
                 pass
+        forget_borrowed_data()
+
+        if update_nodes and tree.sv_memory_limit:
+            up_tree._evict_data(tree.sv_memory_limit * 2**20)
 
         if update_interface:
             if up_tree._tree.show_time_mode == "Cumulative":
@@ -478,6 +516,7 @@ class UpdateTree(SearchTree):
     @classmethod
     def reset_tree(cls, tree: NodeTree = None):
         """Remove tree data or data of all trees from the cache"""
+        oc.reset_cache(tree)
         if tree is not None and tree.tree_id in cls._tree_catch:
             del cls._tree_catch[tree.tree_id]
 
@@ -521,6 +560,11 @@ class UpdateTree(SearchTree):
         self.is_animation_updated = True
         self.is_scene_updated = True
         self._outdated_nodes: Optional[set[SvNode]] = None  # None means outdated all
+        # nodes which output data was forgotten to save memory
+        self._evicted_nodes: set[SvNode] = set()
+        # nodes which outputs were restored from the output cache during walk
+        # and are the same as after their previous update
+        self._cached_nodes: set[SvNode] = set()
 
         # https://stackoverflow.com/a/68550238
         self._sort_nodes = lru_cache(maxsize=1)(self.__sort_nodes)
@@ -530,6 +574,7 @@ class UpdateTree(SearchTree):
             'is_animation_updated',
             'is_scene_updated',
             '_outdated_nodes',
+            '_evicted_nodes',
         ]
 
     def _animation_nodes(self) -> set['SvNode']:
@@ -552,14 +597,9 @@ class UpdateTree(SearchTree):
                     sc_nodes.add(node)
         return sc_nodes
 
-    def _walk(self) -> tuple[Node, list[NodeSocket]]:
-        """Yields nodes in order of their proper execution. It starts yielding
-        from outdated nodes. It keeps the outdated_nodes storage in proper
-        state. It checks after yielding the error status of the node. If the
-        node has error it goes into outdated_nodes. It uses cached walker, so
-        it works more efficient when outdated nodes are the same between the
-        method calls."""
-
+    def _pop_outdated(self) -> Optional[frozenset['SvNode']]:
+        """Returns nodes from which the walk should be started and clears
+        the outdated_nodes storage. None means all nodes should be walked."""
         # walk all nodes in the tree
         if self._outdated_nodes is None:
             outdated = None
@@ -568,15 +608,210 @@ class UpdateTree(SearchTree):
         else:
             outdated = frozenset(self._outdated_nodes)
             self._outdated_nodes.clear()
+        return outdated
 
-        for node, other_socks in self._sort_nodes(outdated):
+    def _walk(self) -> tuple[Node, list[NodeSocket]]:
+        """Yields nodes in order of their proper execution. It starts yielding
+        from outdated nodes. It keeps the outdated_nodes storage in proper
+        state. It checks after yielding the error status of the node. If the
+        node has error it goes into outdated_nodes. It uses cached walker, so
+        it works more efficient when outdated nodes are the same between the
+        method calls.
+        If output cache of the tree is enabled, nodes which were not outdated
+        themselves and which previous nodes have not changed their outputs
+        (were skipped or restored from the cache to the same state which
+        they had after previous update) are skipped too."""
+
+        outdated = self._pop_outdated()
+        use_cache = outdated is not None and oc.get_cache(self._tree) is not None
+        changed = set()  # nodes which outputs could change during the walk
+        self._cached_nodes.clear()
+
+        walk = self._sort_nodes(outdated)
+        walked = {n for n, _ in walk}
+        for node in self._evicted_inputs(walked):
+            yield node, self.previous_sockets(node)
+            self._evicted_nodes.discard(node)
+            self._restore_next_inputs(node, walked)
+
+        for node, other_socks in walk:
+            if use_cache and node not in outdated and node not in self._evicted_nodes \
+                    and changed.isdisjoint(self._from_nodes[node]):
+                continue
             # execute node only if all previous nodes are updated
             if all(n.get(UPDATE_KEY, True) for sock in other_socks if (n := self._sock_node.get(sock))):
                 yield node, other_socks
+                self._evicted_nodes.discard(node)
                 if node.get(ERROR_KEY, False):
                     self._outdated_nodes.add(node)
+                if node not in self._cached_nodes:
+                    changed.add(node)
             else:
                 node[UPDATE_KEY] = False
+                changed.add(node)
+
+    def _walk_parallel(self, workers: int) -> Generator['SvNode', None, None]:
+        """Updates outdated nodes like main_update method with _walk do but
+        executes nodes which inputs are ready concurrently in a pool of
+        threads. Nodes which are not marked as thread safe are executed in the
+        main thread when the pool is idle. Statistics of nodes and other
+        changes of Blender properties are applied in the main thread too. It yields a node before its execution
+        only when none of nodes is executed by the pool, so Blender can't get
+        control while the threads are working. The walk is the same as in the _walk method,
+        the output cache is also respected."""
+        outdated = self._pop_outdated()
+        use_cache = outdated is not None and oc.get_cache(self._tree) is not None
+        changed = set()  # nodes which outputs could change during the walk
+
+        prev_socks = dict(self._sort_nodes(outdated))
+        for node in self._evicted_inputs(prev_socks):
+            yield node
+            self._update_node_safe(node, self.previous_sockets(node))
+            self._evicted_nodes.discard(node)
+            self._restore_next_inputs(node, prev_socks)
+        sorter = TopologicalSorter({n: {_n for _n in self._from_nodes[n] if _n in prev_socks}
+                                    for n in prev_socks})
+        sorter.prepare()
+
+        def finish(_node, is_cached):
+            self._evicted_nodes.discard(_node)
+            if _node.get(ERROR_KEY, False):
+                self._outdated_nodes.add(_node)
+            if not is_cached:
+                changed.add(_node)
+            sorter.done(_node)
+
+        ready: deque[SvNode] = deque()
+        pinned: deque[SvNode] = deque()  # waiting until the pool is idle
+        running: dict[Future, SvNode] = dict()
+        with ThreadPoolExecutor(workers, thread_name_prefix='sverchok') as pool:
+            while sorter.is_active():
+                ready.extend(sorter.get_ready())
+                if not running:
+                    ready.extend(pinned)
+                    pinned.clear()
+                while ready:
+                    node = ready.popleft()
+                    socks = prev_socks[node]
+                    if use_cache and node not in outdated and node not in self._evicted_nodes \
+                            and changed.isdisjoint(self._from_nodes[node]):
+                        sorter.done(node)
+                    # execute node only if all previous nodes are updated
+                    elif not all(n.get(UPDATE_KEY, True) for sock in socks if (n := self._sock_node.get(sock))):
+                        node[UPDATE_KEY] = False
+                        finish(node, False)
+                    elif is_main_thread_node(type(node)):
+                        if running:
+                            pinned.append(node)
+                        else:
+                            yield node
+                            finish(node, self._update_node_safe(node, socks))
+                    else:
+                        if not running:
+                            yield node
+                        generate_ids(node, socks)
+                        running[pool.submit(self._process_node_in_thread, node, socks)] = node
+                if running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        node = running.pop(future)
+                        is_cached, error, update_time, writes = future.result()
+                        writes.apply()
+                        check_borrowed_data(node)
+                        AddStatistic.record(node, error, update_time)
+                        finish(node, is_cached)
+
+    def _evicted_inputs(self, nodes: Iterable['SvNode']) -> list['SvNode']:
+        """Returns nodes which output data was evicted but is required by
+        given nodes, in order of their execution. Their recalculation
+        should not effect next nodes because their inputs are the same."""
+        nodes = set(nodes)
+        if not self._evicted_nodes:
+            return []
+        required = set()
+        stack = [n for node in nodes for n in self._from_nodes.get(node, [])]
+        while stack:
+            node = stack.pop()
+            if node in nodes or node in required or node not in self._evicted_nodes:
+                continue
+            required.add(node)
+            stack.extend(self._from_nodes.get(node, []))
+        return self.sort_nodes(required)
+
+    def _evict_data(self, max_size: int):
+        """Forgets output data of intermediate nodes, biggest first, until
+        size of the tree data fits given size. Data of sockets connected to
+        nodes without outputs (viewers) and data of nodes which are used by
+        nodes updating other nodes is never forgotten. The evicted nodes
+        are recalculated when their data is needed by next nodes.
+        Input sockets of next nodes and entries of the output cache refer to
+        the same data, so they are released too, otherwise the memory would
+        not be freed."""
+        # nodes like Loop Out can update previous nodes themselves
+        special_nodes = [n for n in self._from_nodes if getattr(n, 'updates_other_nodes', False)]
+        protected = self.nodes_to(special_nodes) if special_nodes else set()
+        cache = oc.get_cache(self._tree)
+        total_size = 0
+        candidates = []
+        for node in self._from_nodes:
+            node_size = sum(socket_data_size(s) for s in node.outputs)
+            total_size += node_size
+            if not node_size or node in self._evicted_nodes or node in protected:
+                continue
+            to_nodes = [self._sock_node[s] for out in node.outputs
+                        for s in self._to_socks.get(out, [])]
+            if to_nodes and all(n.outputs for n in to_nodes):
+                candidates.append((node_size, node))
+
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        for node_size, node in candidates:
+            if total_size <= max_size:
+                break
+            for out in node.outputs:
+                sv_forget_socket(out)
+                for in_sock in self._to_socks.get(out, []):
+                    sv_forget_socket(in_sock)
+            if cache is not None:
+                cache.forget(node)
+                for next_node in self._to_nodes[node]:
+                    # entries which keep the evicted objects alive
+                    cache.forget(next_node, identities_only=True)
+            self._evicted_nodes.add(node)
+            total_size -= node_size
+
+    def _restore_next_inputs(self, node: 'SvNode', walked: Iterable['SvNode']):
+        """Input sockets of next nodes are forgotten together with evicted
+        outputs of the node. When the node is recalculated the data is put
+        back into next nodes which are not going to be updated, so they keep
+        their inputs in the state of their last update."""
+        for next_node in self._to_nodes[node]:
+            if next_node not in walked:
+                prepare_input_data(self.previous_sockets(next_node), next_node.inputs)
+
+    def _update_node_safe(self, node: 'SvNode', prev_socks: list[Optional[NodeSocket]]) -> bool:
+        """Updates node, records its statistics and suppresses its errors.
+        Returns True if outputs of the node were restored from output cache"""
+        with AddStatistic(node):
+            return self.process_node(node, prev_socks)
+        return False
+
+    def _process_node_in_thread(self, node: 'SvNode', prev_socks: list[Optional[NodeSocket]]
+                                ) -> tuple[bool, Optional[Exception], float, DeferredWrites]:
+        """Updates node in a worker thread and suppresses its errors. Unlike
+        _update_node_safe it does not record statistics, and changes of
+        Blender properties (numbers of objects in sockets, cache counters)
+        are postponed, because Blender data can be changed only in the main
+        thread. Returns True if outputs were restored from output cache,
+        error, update time and the postponed changes"""
+        start = perf_counter()
+        with DeferredWrites() as writes:
+            try:
+                is_cached = self.process_node(node, prev_socks)
+            except CancelError:
+                raise
+            except Exception as e:
+                return False, e, 0, writes
+        return is_cached, None, perf_counter() - start, writes
 
     def __sort_nodes(self,
                      from_nodes: frozenset['SvNode'] = None,
@@ -677,6 +912,52 @@ class UpdateTree(SearchTree):
             yield node, *args
 
 
+def _is_id_struct(struct) -> bool:
+    """Whether given RNA struct is a Blender data block"""
+    while struct is not None:
+        if struct.identifier == 'ID':
+            return True
+        struct = struct.base
+    return False
+
+
+def _has_id_pointers(struct, visited: set[str]) -> bool:
+    """Whether given RNA struct or its nested property groups can keep
+    pointers to Blender data blocks"""
+    visited.add(struct.identifier)
+    for prop in struct.properties:
+        if prop.type not in {'POINTER', 'COLLECTION'} or not prop.is_runtime:
+            continue
+        if _is_id_struct(prop.fixed_type):
+            return True
+        if prop.fixed_type.identifier not in visited \
+                and _has_id_pointers(prop.fixed_type, visited):
+            return True
+    return False
+
+
+@cache
+def is_main_thread_node(node_class) -> bool:
+    """Nodes which read or write Blender data should not be executed in
+    parallel with other nodes. Nodes should declare that they are thread
+    safe explicitly. It can be used by nodes which update other nodes in
+    threads themselves, like Evolver"""
+    return (not getattr(node_class, 'is_thread_safe', False)
+            or getattr(node_class, 'updates_other_nodes', False)
+            or getattr(node_class, 'is_scene_dependent', False)
+            or getattr(node_class, 'is_animation_dependent', False)
+            or _has_id_pointers(node_class.bl_rna, set()))
+
+
+def generate_ids(node: 'SvNode', prev_socks: list[Optional[NodeSocket]]):
+    """Identifiers of nodes and sockets are generated lazily and are stored
+    in ID properties, which should not be written by worker threads. It should
+    be called in the main thread before the node is updated in a worker"""
+    node.node_id
+    for socket in chain(node.inputs, node.outputs, (s for s in prev_socks if s is not None)):
+        socket.socket_id
+
+
 class AddStatistic:
     """It caches errors during execution of process method of a node and saves
     update time, update status and error"""
@@ -694,20 +975,27 @@ class AddStatistic:
         return None
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if exc_type is None:
-            self._node[UPDATE_KEY] = True
-            self._node[ERROR_KEY] = None
-            self._node[TIME_KEY] = perf_counter() - self._start
-        else:
-            node_error_logger.error(exc_val, exc_info=True)
-            self._node[UPDATE_KEY] = False
-            self._node[ERROR_KEY] = repr(exc_val)
+        check_borrowed_data(self._node)
+        self.record(self._node, exc_val, perf_counter() - self._start)
 
         if self._supress and exc_type is not None:
             if issubclass(exc_type, CancelError):
                 return False
             return issubclass(exc_type, Exception)
 
+    @staticmethod
+    def record(node: 'SvNode', error: Optional[BaseException], update_time: float):
+        """Saves update status, error and update time of the node. It should
+        be called in the main thread"""
+        if error is None:
+            node[UPDATE_KEY] = True
+            node[ERROR_KEY] = None
+            node[TIME_KEY] = update_time
+        else:
+            node_error_logger.error(error, exc_info=error)
+            node[UPDATE_KEY] = False
+            node[ERROR_KEY] = repr(error)
+
 
 def prepare_input_data(prev_socks: list[Optional[NodeSocket]],
                        input_socks: list[NodeSocket]):
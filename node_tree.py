@@ -34,13 +34,15 @@ from pathlib import Path
 from typing import Iterable, final, Optional
 
 import bpy
-from bpy.props import StringProperty, BoolProperty, EnumProperty
+from bpy.props import StringProperty, BoolProperty, EnumProperty, IntProperty
 from bpy.types import NodeTree, NodeSocket
 
 import sverchok
 from sverchok.core.sv_custom_exceptions import SvNoDataError, DependencyError
 import sverchok.core.events as ev
 from sverchok.core.event_system import handle_event
+from sverchok.core.output_cache import reset_cache, CACHE_HITS_KEY, CACHE_MISSES_KEY
+from sverchok.core.socket_data import node_data_size
 from sverchok.data_structure import classproperty, post_load_call
 from sverchok.utils.sv_node_utils import recursive_framed_location_finder
 from sverchok.utils.docstring import SvDocstring
@@ -69,6 +71,34 @@ class SvNodeTreeCommon:
         description="Mode of showing node update timings",
     )
 
+    sv_show_memory_nodes: BoolProperty(
+        name="Node memory",
+        description="Show approximate size of output data of nodes",
+        default=False,
+        options=set(),
+        update=lambda s, c: handle_event(ev.TreeEvent(s)))
+
+    def _reset_output_cache(self, context):
+        reset_cache(self)
+        handle_event(ev.TreeEvent(self))
+
+    #: Reuse outputs of nodes if their inputs and properties were not changed.
+    #: Read more in `sverchok.core.output_cache`.
+    sv_cache_outputs: BoolProperty(
+        name="Cache outputs",
+        description="Remember outputs of nodes and reuse them when inputs and properties of the nodes are the same",
+        default=False,
+        options=set(),
+        update=_reset_output_cache)
+
+    sv_cache_size: IntProperty(
+        name="Cache size",
+        description="Memory budget of the output cache in megabytes",
+        default=256,
+        min=1,
+        subtype='UNSIGNED',
+        options=set())
+
     @property
     def tree_id(self):
         """Identifier of the tree. [Rational](#blender-data-blocks-ids)."""
@@ -208,6 +238,29 @@ class SverchCustomTree(NodeTree, SvNodeTreeCommon):
         options=set(),
     )
 
+    #: Nodes which inputs are ready are executed concurrently by the number of threads.
+    #: Read more in `UpdateNodes.is_thread_safe`.
+    sv_threads: IntProperty(
+        name="Threads",
+        description="Number of threads to execute independent nodes concurrently, 1 means serial execution",
+        default=1,
+        min=1,
+        soft_max=16,
+        options=set(),
+    )
+
+    #: Output data of intermediate nodes is forgotten when the tree data exceeds the limit.
+    #: The nodes are recalculated when their data is required again.
+    sv_memory_limit: IntProperty(
+        name="Memory limit",
+        description="Maximum size of nodes data in megabytes, 0 means no limit. "
+                    "Data of intermediate nodes above the limit is forgotten and recalculated when needed",
+        default=0,
+        min=0,
+        subtype='UNSIGNED',
+        options=set(),
+    )
+
     sv_scene_update: BoolProperty(
         name="Scene update",
         description="Update upon changes in the scene",
@@ -335,6 +388,29 @@ class UpdateNodes:
     
     ![image](https://user-images.githubusercontent.com/28003269/193507101-60a28c3f-50a1-4117-a66f-25b0b4e07e13.png)"""
 
+    is_thread_safe = False
+    """When the `SverchCustomTree.sv_threads` option of a tree is more than 1,
+    the node can be executed in a separate thread simultaneously with other
+    nodes. Set it to True only for nodes which neither read nor write Blender
+    data (objects, GPU resources, texts, ID properties) in their process
+    method. Scene and animation dependent nodes, nodes with pointer properties
+    to Blender data blocks and nodes which update other nodes are always
+    executed in the main thread."""
+
+    updates_other_nodes = False
+    """Set it to True for nodes which execute other nodes of the tree
+    themselves, like Loop Out node. Such nodes are executed in the main thread
+    and outputs of nodes connected to them are never evicted from memory."""
+
+    is_output_cacheable = False
+    """When the `SvNodeTreeCommon.sv_cache_outputs` option of a tree is on,
+    outputs of the node can be reused if its inputs and properties are
+    the same as in one of previous updates. Set it to True only for nodes
+    which outputs depend on nothing else but their inputs and properties,
+    i.e. nodes without side effects, which do not read Blender data (texts,
+    objects), external files, random generator without seed or user code.
+    Scene and animation dependent nodes are never cached."""
+
     def sv_init(self, context):
         """
         This method will be called during node creation
@@ -466,10 +542,19 @@ class UpdateNodes:
             sv_bgl.callback_disable(error_pref + self.node_id)
             self.set_temp_color()
 
-        # show update timing
+        # show update timing, data size and output cache statistics
+        text = []
         if update_time is not None:
-            update_time = int(update_time * 1000)
-            sv_bgl.draw_text(self, f'{update_time}ms', update_pref + self.node_id, align="UP", dynamic_location=False)
+            text.append(f'{int(update_time * 1000)}ms')
+        if self.id_data.sv_show_memory_nodes and (size := node_data_size(self)):
+            text.append(f'{size / 2**20:.1f}MB')
+        if self.id_data.sv_cache_outputs:
+            hits = self.get(CACHE_HITS_KEY, 0)
+            total = hits + self.get(CACHE_MISSES_KEY, 0)
+            if total:
+                text.append(f'cache {hits}/{total}')
+        if text:
+            sv_bgl.draw_text(self, ' '.join(text), update_pref + self.node_id, align="UP", dynamic_location=False)
         else:
             sv_bgl.callback_disable(update_pref + self.node_id)
 
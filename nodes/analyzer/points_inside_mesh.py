@@ -18,6 +18,7 @@
 
 
 from itertools import cycle
+import numpy as np
 import bpy
 from bpy.props import (IntProperty, FloatProperty, BoolProperty, EnumProperty, FloatVectorProperty)
 from mathutils import Vector
@@ -27,6 +28,7 @@ from mathutils.noise import seed_set, random_unit_vector
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, list_match_func, list_match_modes
 from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
+from sverchok.utils.points_in_mesh import inside_mesh_winding, inside_mesh_projection
 
 
 def generate_random_unitvectors():
@@ -38,6 +40,9 @@ def generate_random_unitvectors():
 
 directions = generate_random_unitvectors()
 
+# how many of the samples should consider the point inside, per number of samples
+min_votes = {1: 1, 2: 1, 3: 2, 4: 3, 5: 4, 6: 4}
+
 
 def get_points_in_mesh(verts, faces, points, eps=0.0, num_samples=3):
     mask_inside = []
@@ -98,6 +103,13 @@ def are_inside(verts, faces, points, eps):
     return mask_inside
 
 
+def get_points_in_mesh_np(verts, faces, points, eps=0.0, num_samples=3):
+    votes = np.zeros(len(points), dtype=np.int64)
+    for direction in directions[:num_samples]:
+        votes += inside_mesh_winding(verts, faces, points, tuple(direction))
+    return (votes >= min_votes[num_samples]).tolist()
+
+
 def get_points_in_mesh_2D(verts, faces, points, normal, eps=0.0):
     mask_totals = []
     bvh = BVHTree.FromPolygons(verts, faces, all_triangles=False, epsilon=eps)
@@ -139,6 +151,23 @@ def get_points_in_mesh_2D_clip(verts, faces, points, normal, clip_distance, eps=
     return mask_totals
 
 
+def get_points_in_mesh_2D_np(verts, faces, points, normal, eps=0.0):
+    mask = np.zeros(len(points), dtype=bool)
+    for direction in normal:
+        if any(direction):
+            mask |= inside_mesh_projection(verts, faces, points, direction)
+    return mask.tolist()
+
+
+def get_points_in_mesh_2D_clip_np(verts, faces, points, normal, clip_distance, eps=0.0, matchig_method='REPEAT'):
+    mask = np.zeros(len(points), dtype=bool)
+    normal, clip_distance = list_match_func[matchig_method]([normal, clip_distance])
+    for direction, dist in zip(normal, clip_distance):
+        if any(direction):
+            mask |= inside_mesh_projection(verts, faces, points, direction, max_distance=dist)
+    return mask.tolist()
+
+
 class SvPointInside(SverchCustomTreeNode, bpy.types.Node):
     """
     Triggers: Mask verts with geom
@@ -147,6 +176,9 @@ class SvPointInside(SverchCustomTreeNode, bpy.types.Node):
     bl_idname = 'SvPointInside'
     bl_label = 'Points Inside Mesh'
     sv_icon = 'SV_POINTS_INSIDE_MESH'
+    # works with socket data only
+    is_thread_safe = True
+    is_output_cacheable = True
 
     mode_options = [(k[0], k[1], '', i) for i, k in enumerate([("algo_1", "Regular"), ("algo_2", "Multisample")])]
     dimension_options = [(k, k, '', i) for i, k in enumerate(["2D", "3D"])]
@@ -197,6 +229,16 @@ class SvPointInside(SverchCustomTreeNode, bpy.types.Node):
         min=1, max=6, default=3,
         update=updateNode)
 
+    implementation: EnumProperty(
+        name="Implementation",
+        description="Implementation of ray casting for Multisample and 2D modes",
+        items=[
+            ('NUMPY', "NumPy", "Vectorized ray casting, much faster for many points", 0),
+            ('MATHUTILS', "MathUtils", "Ray casting with Blender's BVH tree, one point at a time", 1)
+        ],
+        default='MATHUTILS',
+        update=updateNode)
+
     list_match_global: EnumProperty(
         name="Match Global",
         description="Behavior on different list lengths, multiple objects level",
@@ -219,6 +261,7 @@ class SvPointInside(SverchCustomTreeNode, bpy.types.Node):
         s = self.outputs.new('SvVerticesSocket', 'verts') # to be removed in MK2
         s.label = "Inside Vertices" # to be removed in MK2
         self.outputs.new('SvVerticesSocket', 'Outside Vertices')
+        self.implementation = 'NUMPY'
         self.update_sockets(context)
 
     def draw_buttons(self, context, layout):
@@ -228,11 +271,14 @@ class SvPointInside(SverchCustomTreeNode, bpy.types.Node):
         else:
             layout.prop(self, 'selected_algo', expand=True)
             if self.selected_algo == 'algo_2':
-                layout.prop(self, 'epsilon_bvh', text='Epsilon')
+                if self.implementation == 'MATHUTILS':
+                    layout.prop(self, 'epsilon_bvh', text='Epsilon')
                 layout.prop(self, 'num_samples', text='Samples')
 
     def draw_buttons_ext(self, context, layout):
         self.draw_buttons(context, layout)
+        if self.dimensions_mode == '2D' or self.selected_algo == 'algo_2':
+            layout.prop(self, 'implementation')
         layout.prop(self, 'list_match_global', text='Global Match')
         if self.dimensions_mode == '2D' and self.limit_max_dist:
             layout.prop(self, 'list_match_local', text='Local Match')
@@ -257,19 +303,20 @@ class SvPointInside(SverchCustomTreeNode, bpy.types.Node):
         # general options
         params.append(cycle([self.epsilon_bvh]))
         # special options and main_func
+        use_numpy = self.implementation == 'NUMPY'
 
         if self.dimensions_mode == '3D':
             if self.selected_algo == 'algo_1':
                 main_func = are_inside
             elif self.selected_algo == 'algo_2':
                 params.append(cycle([self.num_samples]))
-                main_func = get_points_in_mesh
+                main_func = get_points_in_mesh_np if use_numpy else get_points_in_mesh
         else:
             if self.limit_max_dist:
                 params.append(cycle([self.list_match_local]))
-                main_func = get_points_in_mesh_2D_clip
+                main_func = get_points_in_mesh_2D_clip_np if use_numpy else get_points_in_mesh_2D_clip
             else:
-                main_func = get_points_in_mesh_2D
+                main_func = get_points_in_mesh_2D_np if use_numpy else get_points_in_mesh_2D
 
         return main_func, params
 
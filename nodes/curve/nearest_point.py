@@ -5,7 +5,7 @@ from bpy.props import EnumProperty, BoolProperty, IntProperty
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level
 from sverchok.utils.curve import SvCurve
-from sverchok.utils.manifolds import nearest_point_on_curve
+from sverchok.utils.manifolds import nearest_point_on_curve, NEWTON
 
 
 class SvExNearestPointOnCurveNode(SverchCustomTreeNode, bpy.types.Node):
@@ -35,7 +35,8 @@ class SvExNearestPointOnCurveNode(SverchCustomTreeNode, bpy.types.Node):
     solvers = [
             ('Brent', "Brent", "Uses inverse parabolic interpolation when possible to speed up convergence of golden section method", 0),
             ('Bounded', "Bounded", "Uses the Brent method to find a local minimum in the interval", 1),
-            ('Golden', 'Golden Section', "Uses the golden section search technique", 2)
+            ('Golden', 'Golden Section', "Uses the golden section search technique", 2),
+            (NEWTON, "Newton", "Uses Newton iterations for all points at once; fast for many points", 3)
         ]
 
     method : EnumProperty(
@@ -53,6 +54,8 @@ class SvExNearestPointOnCurveNode(SverchCustomTreeNode, bpy.types.Node):
         layout.prop(self, 'method')
 
     def sv_init(self, context):
+        # old nodes keep previous default method
+        self.method = NEWTON
         self.inputs.new('SvCurveSocket', "Curve")
         p = self.inputs.new('SvVerticesSocket', "Point")
         p.use_prop = True
@@ -25,6 +25,9 @@ class SvExRbfCurveNode(SverchCustomTreeNode, bpy.types.Node):
     bl_icon = 'CURVE_NCURVE'
     sv_icon = 'SV_INTERP_CURVE'
     sv_dependencies = {'scipy'}
+    # works with socket data only
+    is_thread_safe = True
+    is_output_cacheable = True
 
     function : EnumProperty(
             name = "Function",
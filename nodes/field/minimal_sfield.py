@@ -22,6 +22,9 @@ class SvExMinimalScalarFieldNode(SverchCustomTreeNode, bpy.types.Node):
     bl_idname = 'SvExMinimalScalarFieldNode'
     bl_label = 'RBF Scalar Field'
     sv_dependencies = {'scipy'}
+    # works with socket data only
+    is_thread_safe = True
+    is_output_cacheable = True
 
     function : EnumProperty(
             name = "Function",
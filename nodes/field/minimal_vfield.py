@@ -22,6 +22,9 @@ class SvExMinimalVectorFieldNode(SverchCustomTreeNode, bpy.types.Node):
     bl_idname = 'SvExMinimalVectorFieldNode'
     bl_label = 'RBF Vector Field'
     sv_dependencies = {'scipy'}
+    # works with socket data only
+    is_thread_safe = True
+    is_output_cacheable = True
 
     function : EnumProperty(
             name = "Function",
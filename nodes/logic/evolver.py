@@ -9,7 +9,10 @@
 import ast
 import random
 import time
-from collections import namedtuple
+from time import perf_counter
+from collections import namedtuple, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from typing import NamedTuple, Union
 import numpy as np
 
@@ -18,7 +21,9 @@ from mathutils.noise import seed_set, random
 from bpy.props import (
     BoolProperty, StringProperty, EnumProperty, IntProperty, FloatProperty)
 
-from sverchok.core.update_system import UpdateTree
+from sverchok.core.update_system import (UpdateTree, AddStatistic, prepare_input_data, is_main_thread_node,
+                                         generate_ids)
+from sverchok.core.socket_data import DeferredWrites
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
 from sverchok.utils.sv_operator_mixins import SvGenericNodeLocator
@@ -133,6 +138,7 @@ class ListInputGene(NamedTuple):
             node = tree.nodes[self.name]
             listinput_setF(node, agent_gene, self)
         else:
+            node = tree.nodes[self.name]
             for i in range(self.num_length):
                 node.vector_list[3*i] = self.values[agent_gene[i][0]]
                 node.vector_list[3*i + 1] = self.values[agent_gene[i][1]]
@@ -338,6 +344,130 @@ def random_element_swap(new_gene):
     new_gene[item_a] = new_gene[item_b]
     new_gene[item_b] = temp_g
 
+def genome_key(genes):
+    '''hashable representation of agent genes'''
+    if isinstance(genes, (list, tuple)):
+        return tuple(genome_key(g) for g in genes)
+    return genes
+
+
+def copy_tree(tree):
+    '''Copy of the tree which is not evaluated by the update system
+    and does not share socket data with the original tree'''
+    tree_copy = tree.copy()
+    tree_copy.tree_id_memory = ''
+    tree_copy.sv_animate = False
+    tree_copy.sv_scene_update = False
+    tree_copy.sv_process = False
+    for node in tree_copy.nodes:
+        if hasattr(node, 'n_id'):
+            node.n_id = ''
+        for socket in chain(node.inputs, node.outputs):
+            if hasattr(socket, 's_id'):
+                socket.s_id = ''
+    return tree_copy
+
+
+def remove_tree_copy(tree_copy):
+    UpdateTree.reset_tree(tree_copy)
+    for node in tree_copy.nodes:
+        for socket in chain(node.inputs, node.outputs):
+            if hasattr(socket, 'sv_forget'):
+                socket.sv_forget()
+    bpy.data.node_groups.remove(tree_copy)
+
+
+class FitnessEvaluator:
+    '''Sets genes of agents to the tree nodes and updates only nodes which
+    are between the gene nodes and the Evolver node to get the fitness'''
+
+    def __init__(self, tree, node_name, genes_def):
+        self.tree = tree
+        self.node = tree.nodes[node_name]
+        self.genes_def = genes_def
+        self.up_tree = UpdateTree.get(tree)
+        gene_nodes = {tree.nodes[g.name] for g in genes_def}
+        fitness_nodes = self.up_tree.nodes_to([self.node]) - {self.node}
+        self.exec_order = self.up_tree.sort_nodes(self.up_tree.nodes_from(gene_nodes) & fitness_nodes)
+        # the nodes which do not depend on genes are updated only once
+        self.init_order = self.up_tree.sort_nodes(fitness_nodes - set(self.exec_order))
+        # gene nodes are updated in the main thread where their values are set,
+        # next nodes can be updated in a worker thread
+        self.gene_order = [n for n in self.exec_order if n in gene_nodes]
+        self.thread_order = [n for n in self.exec_order if n not in gene_nodes]
+        self.is_initialized = False
+        self.has_error = False
+        # ids are generated lazily, they should exist before nodes are processed in other threads
+        for node in self.thread_order:
+            generate_ids(node, self.up_tree.previous_sockets(node))
+
+    def is_thread_safe(self):
+        '''Whether the nodes which depend on gene nodes can be updated in a worker thread'''
+        gene_inputs = self.up_tree.nodes_to(self.gene_order)
+        return not any(is_main_thread_node(type(node)) or node in gene_inputs
+                       for node in self.thread_order)
+
+    def set_genes(self, agent_genes):
+        sv_process = self.tree.sv_process
+        try:
+            self.tree.sv_process = False
+            for gen_data, agent_gene in zip(self.genes_def, agent_genes):
+                gen_data.set_node_with_gene(self.tree, agent_gene)
+        finally:
+            self.tree.sv_process = sv_process
+
+    def _process(self, nodes):
+        '''Updates the nodes and returns their statistics instead of
+        recording them. Execution stops on the first error'''
+        statistics = []
+        for node in nodes:
+            start = perf_counter()
+            try:
+                self.up_tree.process_node(node, self.up_tree.previous_sockets(node))
+            except Exception as e:
+                statistics.append((node, e, 0))
+                self.has_error = True
+                break
+            statistics.append((node, None, perf_counter() - start))
+        return statistics
+
+    def process_main_nodes(self, all_nodes):
+        '''Updates the nodes which do not depend on genes, if they were not
+        updated yet, and the gene nodes. If all_nodes is True, the nodes which
+        depend on genes are updated too. It should be called in the main thread'''
+        self.has_error = False
+        nodes = [] if self.is_initialized else self.init_order
+        statistics = self._process(nodes)
+        if self.has_error:
+            return statistics
+        self.is_initialized = True
+        return statistics + self._process(self.exec_order if all_nodes else self.gene_order)
+
+    def process_thread_nodes(self):
+        '''Updates the nodes which depend on gene nodes, it can be called in
+        a worker thread, changes of Blender properties are postponed and
+        returned together with statistics of the nodes'''
+        with DeferredWrites() as writes:
+            statistics = [] if self.has_error else self._process(self.thread_order)
+        return statistics, writes
+
+    def calc_fitness(self, statistics, writes=None):
+        '''Records statistics of processed nodes and reads the fitness,
+        it should be called in the main thread'''
+        if writes is not None:
+            writes.apply()
+        for node, error, update_time in statistics:
+            AddStatistic.record(node, error, update_time)
+            if error is not None:
+                raise error
+
+        prepare_input_data(self.up_tree.previous_sockets(self.node), self.node.inputs)
+        agent_fitness = self.node.inputs[0].sv_get(deepcopy=False)[0]
+        if isinstance(agent_fitness, list):
+            agent_fitness = agent_fitness[0]
+        return agent_fitness
+
+
 class DNA:
 
     def __init__(self, genes_def, random_val=True, empty=False):
@@ -358,26 +488,6 @@ class DNA:
                 agent_gene = gene.init_val
                 self.genes.append(agent_gene)
 
-    def evaluate_fitness(self, tree, node, s_tree: UpdateTree, exec_order):
-        try:
-            tree.sv_process = False
-            for gen_data, agent_gene in zip(self.genes_def, self.genes):
-                gen_data.set_node_with_gene(tree, agent_gene)
-
-            tree.sv_process = True
-            for node in exec_order:
-                try:
-                    s_tree.update_node(node, suppress=False)
-                except Exception:
-                    raise
-
-            agent_fitness = node.inputs[0].sv_get(deepcopy=False)[0]
-            if isinstance(agent_fitness, list):
-                agent_fitness = agent_fitness[0]
-            self.fitness = agent_fitness
-        finally:
-            tree.sv_process = True
-
     def cross_over(self, other_ancestor, mutation_threshold):
 
         new_agent = DNA(self.genes_def, empty=True)
@@ -412,9 +522,13 @@ class Population:
         self.population_g: list[DNA] = []
         self.init_population(node.population_n)
 
-        self._tree = UpdateTree.get(tree)
-        exec_order = self._tree.nodes_from([tree.nodes[g.name] for g in self.genes])
-        self.exec_order = self._tree.sort_nodes(exec_order)
+        # fitness of already evaluated genomes, agents are often repeated
+        # because of elitism and low mutation
+        self.fitness_memory = dict()
+        self.evaluators = [FitnessEvaluator(tree, node.name, self.genes)]
+        self.pool = None
+        self.generation_times = []
+        self.evaluated_n = 0
 
     def init_population(self, population_n):
 
@@ -436,12 +550,60 @@ class Population:
             for i in range(population_n-len(previous_population)):
                 self.population_g.append(DNA(self.genes))
 
+    def init_workers(self, workers):
+        '''Creates copies of the tree to evaluate several agents concurrently.
+        Copies are not created unless all nodes which depend on gene nodes
+        are marked as thread safe'''
+        if workers < 2 or not self.evaluators[0].is_thread_safe():
+            return
+        for i in range(workers - 1):
+            tree_copy = copy_tree(self.tree)
+            self.evaluators.append(FitnessEvaluator(tree_copy, self.node.name, self.genes))
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix='sv_evolver')
+
+    def free_workers(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        for evaluator in self.evaluators[1:]:
+            remove_tree_copy(evaluator.tree)
+        del self.evaluators[1:]
+
     def evaluate_fitness_g(self):
-        try:
-            for agent in self.population_g:
-                agent.evaluate_fitness(self.tree, self.node, self._tree, self.exec_order)
-        finally:
-            self.tree.sv_process = True
+        start = time.time()
+        to_evaluate = defaultdict(list)  # genome -> agents
+        for agent in self.population_g:
+            key = genome_key(agent.genes)
+            if key in self.fitness_memory:
+                agent.fitness = self.fitness_memory[key]
+            else:
+                to_evaluate[key].append(agent)
+
+        genomes = list(to_evaluate)
+        workers_n = len(self.evaluators)
+        for i in range(0, len(genomes), workers_n):
+            batch = genomes[i: i + workers_n]
+            evaluators = self.evaluators[:len(batch)]
+            # Blender data is modified only in the main thread
+            for evaluator, key in zip(evaluators, batch):
+                evaluator.set_genes(to_evaluate[key][0].genes)
+            use_pool = self.pool is not None and len(batch) > 1
+            statistics = [evaluator.process_main_nodes(all_nodes=not use_pool) for evaluator in evaluators]
+            writes = [None] * len(batch)
+            if use_pool:
+                results = self.pool.map(FitnessEvaluator.process_thread_nodes, evaluators)
+                for i, (thread_statistics, thread_writes) in enumerate(results):
+                    statistics[i] += thread_statistics
+                    writes[i] = thread_writes
+            fitness = [evaluator.calc_fitness(s, w) for evaluator, s, w in zip(evaluators, statistics, writes)]
+
+            for key, agent_fitness in zip(batch, fitness):
+                self.fitness_memory[key] = agent_fitness
+                for agent in to_evaluate[key]:
+                    agent.fitness = agent_fitness
+
+        self.evaluated_n = len(genomes)
+        self.generation_times.append(time.time() - start)
 
     def population_genes(self):
         return [agent.genes for agent in self.population_g]
@@ -474,7 +636,11 @@ class Population:
 
     def print_time_info(self, iteration):
         print(' '*80,end='\r')
-        print("Evolver on %s iteration" % (iteration + 1),"%s sec" % (time.time() - self.time_start), end='\r')
+        print("Evolver on %s iteration" % (iteration + 1),
+              "%s sec" % (time.time() - self.time_start),
+              "(generation: %.3f sec, %s of %s agents evaluated)" % (
+                  self.generation_times[-1], self.evaluated_n, len(self.population_g)),
+              end='\r')
 
     def goal_achieved(self, fittest, mode, goal):
         if mode == "MAX":
@@ -492,6 +658,7 @@ class Population:
         evolver_mem[node_id]["genes"] = self.genes
         evolver_mem[node_id]["population"] = population_all[-1]
         evolver_mem[node_id]["fitness"] = fitness_all[-1]
+        evolver_mem[node_id]["generation_times"] = self.generation_times
 
     def evolve(self):
         population_all = []
@@ -504,33 +671,37 @@ class Population:
         use_fitness_goal = self.node.use_fitness_goal
         goal = self.node.fitness_goal
 
-        for iteration in range(iterations - 1):
-            self.evaluate_fitness_g()
-            self.population_g.sort(key=lambda x: x.fitness, reverse=(mode == "MAX"))
-            population_all.append(self.population_genes())
-            actual_population_fitenss = self.population_fitness()
-            fitness_all.append(actual_population_fitenss)
-
-            if use_fitness_goal and self.goal_achieved(actual_population_fitenss[0], mode, goal):
-                goal_achieved = True
-                info = "Goal achieved in %s iterations  " % (iteration + 1)
-                print(info)
-                break
-
-            self.print_time_info(iteration)
-            if (time.time() - self.time_start) > max_time:
-                info = "Max. time reached in %s iterations  " % (iteration + 1)
-                print(info)
-                break
-
-            self.population_g = self.get_new_population(actual_population_fitenss, mode)
-
-
-        if not goal_achieved:
-            self.evaluate_fitness_g()
-            self.population_g.sort(key=lambda x: x.fitness, reverse=(mode == "MAX"))
-            population_all.append(self.population_genes())
-            fitness_all.append(self.population_fitness())
+        self.init_workers(self.node.workers)
+        try:
+            for iteration in range(iterations - 1):
+                self.evaluate_fitness_g()
+                self.population_g.sort(key=lambda x: x.fitness, reverse=(mode == "MAX"))
+                population_all.append(self.population_genes())
+                actual_population_fitenss = self.population_fitness()
+                fitness_all.append(actual_population_fitenss)
+
+                if use_fitness_goal and self.goal_achieved(actual_population_fitenss[0], mode, goal):
+                    goal_achieved = True
+                    info = "Goal achieved in %s iterations  " % (iteration + 1)
+                    print(info)
+                    break
+
+                self.print_time_info(iteration)
+                if (time.time() - self.time_start) > max_time:
+                    info = "Max. time reached in %s iterations  " % (iteration + 1)
+                    print(info)
+                    break
+
+                self.population_g = self.get_new_population(actual_population_fitenss, mode)
+
+
+            if not goal_achieved:
+                self.evaluate_fitness_g()
+                self.population_g.sort(key=lambda x: x.fitness, reverse=(mode == "MAX"))
+                population_all.append(self.population_genes())
+                fitness_all.append(self.population_fitness())
+        finally:
+            self.free_workers()
 
         self.store_data(population_all, fitness_all)
         self.node.info_label = info
@@ -597,6 +768,8 @@ class SvEvolverNode(SverchCustomTreeNode, bpy.types.Node):
     bl_idname = 'SvEvolverNode'
     bl_label = 'Evolver'
     bl_icon = 'RNA'
+    # the node updates nodes of the tree itself
+    updates_other_nodes = True
 
     def props_changed(self, context):
         if self.node_id in evolver_mem:
@@ -683,6 +856,14 @@ class SvEvolverNode(SverchCustomTreeNode, bpy.types.Node):
         name='Max Seconds', description='Maximum execution Time',
         update=props_changed)
 
+    workers: IntProperty(
+        default=1,
+        min=1,
+        name='Workers',
+        description='Number of agents evaluated concurrently on copies of the tree, '
+                    '1 means serial evaluation in the tree itself',
+        update=props_changed)
+
     info_label: StringProperty(default="Not Executed")
 
     memory: StringProperty(default="")
@@ -709,6 +890,7 @@ class SvEvolverNode(SverchCustomTreeNode, bpy.types.Node):
         layout.prop(self, "fitness_booster")
         layout.prop(self, "mutation")
         layout.prop(self, "max_time")
+        layout.prop(self, "workers")
         if self.use_fitness_goal:
             goal_row = layout.row(align=True)
             goal_row.prop(self, "use_fitness_goal", text="")
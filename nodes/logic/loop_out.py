@@ -49,6 +49,8 @@ class SvLoopOutNode(LoopNode, SverchCustomTreeNode, bpy.types.Node):
     bl_idname = 'SvLoopOutNode'
     bl_label = 'Loop Out'
     bl_icon = 'CON_FOLLOWPATH'
+    # the node updates nodes of the loop body itself
+    updates_other_nodes = True
 
     mode: EnumProperty(
         name='Mode', description='Maximum allowed iterations',
@@ -22,10 +22,11 @@ from bpy.props import EnumProperty, BoolProperty
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, match_long_cycle as mlr
 from sverchok.utils.csg_core import CSG
+from sverchok.utils.csg_np import NpCSG
 from sverchok.utils.nodes_mixins.sockets_config import ModifierLiteNode
 
 
-def Boolean(VA, PA, VB, PB, operation):
+def boolean_py(VA, PA, VB, PB, operation):
     a = CSG.Obj_from_pydata(VA, PA)
     b = CSG.Obj_from_pydata(VB, PB)
     faces = []
@@ -48,11 +49,26 @@ def Boolean(VA, PA, VB, PB, operation):
     return [vertices, faces]
 
 
+def boolean_np(VA, PA, VB, PB, operation):
+    a = NpCSG.Obj_from_pydata(VA, PA)
+    b = NpCSG.Obj_from_pydata(VB, PB)
+    if operation == 'DIFF':
+        result = a.subtract(b)
+    elif operation == 'JOIN':
+        result = a.union(b)
+    elif operation == 'ITX':
+        result = a.intersect(b)
+    return list(result.to_pydata())
+
+
 class SvCSGBooleanNodeMK2(ModifierLiteNode, SverchCustomTreeNode, bpy.types.Node):
     '''CSG Boolean Node MK2'''
     bl_idname = 'SvCSGBooleanNodeMK2'
     bl_label = 'CSG Boolean MK2'
     bl_icon = 'MOD_BOOLEAN'
+    # works with socket data only
+    is_thread_safe = True
+    is_output_cacheable = True
 
     mode_options = [
         ("ITX", "Intersect", "", 0),
@@ -87,6 +103,15 @@ class SvCSGBooleanNodeMK2(ModifierLiteNode, SverchCustomTreeNode, bpy.types.Node
         default=True,
         update=update_mode)
 
+    implementation: EnumProperty(
+        name="Implementation",
+        items=[
+            ('NUMPY', "NumPy", "Array-based implementation, faster on big meshes", 0),
+            ('PYTHON', "Python", "Original pure Python implementation", 1)
+        ],
+        default='NUMPY',
+        update=updateNode)
+
     def sv_init(self, context):
         self.inputs.new('SvVerticesSocket', 'Verts A')
         self.inputs.new('SvStringsSocket',  'Polys A')
@@ -115,12 +140,17 @@ class SvCSGBooleanNodeMK2(ModifierLiteNode, SverchCustomTreeNode, bpy.types.Node
         if self.nest_objs:
             col.prop(self, "out_last", toggle=True)
 
+    def draw_buttons_ext(self, context, layout):
+        self.draw_buttons(context, layout)
+        layout.prop(self, 'implementation')
+
     def process(self):
         OutV, OutP = self.outputs
         if not OutV.is_linked:
             return
         VertA, PolA, VertB, PolB, VertN, PolN = self.inputs
         SMode = self.selected_mode
+        Boolean = boolean_np if self.implementation == 'NUMPY' else boolean_py
         out = []
         recursionlimit = sys.getrecursionlimit()
         sys.setrecursionlimit(10000)
@@ -189,6 +189,17 @@ class SvPulgaPhysicsSolverNode(SverchCustomTreeNode, bpy.types.Node):
         default=False,
         update=updateNode)
 
+    neighbours_skin: FloatProperty(
+        name='Neighbours Skin',
+        description='Extra search distance of neighbours lists used by KDTree forces, relative to the force distance. '
+                    'Neighbours are searched again only when particles move further than half of it. 0 = search every iteration',
+        default=0.1, min=0.0, precision=3, update=updateNode)
+
+    log_timings: BoolProperty(
+        name='Log Timings',
+        description='Write the time spent by every force to the log',
+        default=False, update=updateNode)
+
     def sv_init(self, context):
 
         '''create sockets'''
@@ -229,6 +240,8 @@ class SvPulgaPhysicsSolverNode(SverchCustomTreeNode, bpy.types.Node):
         '''draw buttons on the N-panel'''
         self.draw_buttons(context, layout)
         layout.prop(self, "output_numpy", toggle=False)
+        layout.prop(self, "neighbours_skin")
+        layout.prop(self, "log_timings")
 
 
     def get_data(self):
@@ -249,6 +262,8 @@ class SvPulgaPhysicsSolverNode(SverchCustomTreeNode, bpy.types.Node):
         gates_dict = {}
         gates_dict["accumulate"] = self.accumulative
         gates_dict["output"] = self.output_numpy
+        gates_dict["neighbours_skin"] = self.neighbours_skin
+        gates_dict["timings"] = self.log_timings
 
 
         return gates_dict
@@ -16,13 +16,26 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
-from ast import literal_eval
+import os
 
 import bpy
-from bpy.props import BoolProperty, StringProperty, IntProperty
+from bpy.props import BoolProperty, IntProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import updateNode, node_id, changable_sockets
+from sverchok.data_structure import updateNode, changable_sockets
+from sverchok.utils.frame_cache import SvFrameCache
+
+
+def cache_directory(node_id):
+    """Directory for frames of the node which do not fit into memory,
+    next to the blend file like caches of Blender simulations"""
+    blend_path = bpy.data.filepath
+    if blend_path:
+        name = os.path.splitext(os.path.basename(blend_path))[0]
+        root = os.path.join(os.path.dirname(blend_path), f"blendcache_{name}")
+    else:
+        root = bpy.app.tempdir
+    return os.path.join(root, "sverchok", node_id)
 
 
 class SvCacheNode(SverchCustomTreeNode, bpy.types.Node):
@@ -33,11 +46,30 @@ class SvCacheNode(SverchCustomTreeNode, bpy.types.Node):
     sv_icon = 'SV_CACHE'
 
     is_animation_dependent = True
-    
-    cache_amount: IntProperty(default=1, min=0)
-    cache_offset: IntProperty(default=1, min=0)
+
+    cache_amount: IntProperty(
+        name="Extra frames", default=1, min=0,
+        description="Number of frames kept besides the ones needed for the offset, "
+                    "frames out of this window are forgotten",
+        update=updateNode)
+    cache_offset: IntProperty(default=1, min=0, update=updateNode)
+    memory_limit: IntProperty(
+        name="Memory limit", default=0, min=0, subtype='UNSIGNED',
+        description="Maximum size of data kept in memory in megabytes, "
+                    "least recently used frames are removed first. 0 means no limit",
+        update=updateNode)
+    spill_to_disk: BoolProperty(
+        name="Spill to disk", default=False,
+        description="Write frames which do not fit into the memory limit to compressed "
+                    "files in the cache folder of the blend file instead of forgetting them",
+        update=updateNode)
+    preload_frames: IntProperty(
+        name="Preload", default=2, min=0,
+        description="Number of next frames which are read from disk in background "
+                    "during animation playback",
+        update=updateNode)
     node_dict = {}
-    
+
     def sv_init(self, context):
         self.inputs.new("SvStringsSocket", "Data")
         self.outputs.new("SvStringsSocket", "Data")
@@ -45,26 +77,52 @@ class SvCacheNode(SverchCustomTreeNode, bpy.types.Node):
 
     def sv_draw_buttons(self, context, layout):
         layout.prop(self, "cache_offset")
+        layout.prop(self, "cache_amount")
+
+    def sv_draw_buttons_ext(self, context, layout):
+        self.sv_draw_buttons(context, layout)
+        layout.prop(self, "memory_limit")
+        layout.prop(self, "spill_to_disk")
+        row = layout.row()
+        row.enabled = self.spill_to_disk
+        row.prop(self, "preload_frames")
 
     def sv_update(self):
         changable_sockets(self, "Data", ["Data"])
-        
-    def process(self):
+
+    def sv_free(self):
+        cache = self.node_dict.pop(self.node_id, None)
+        if cache is not None:
+            cache.clear()
+
+    def get_cache(self):
         n_id = self.node_id
-        data = self.node_dict.get(n_id)
-        if not data:
-            self.node_dict[n_id] = {}
-            data = self.node_dict.get(n_id)
-            
+        cache = self.node_dict.get(n_id)
+        if cache is None:
+            cache = self.node_dict[n_id] = SvFrameCache()
+        cache.max_size = self.memory_limit * 2**20
+        # the folder changes when the blend file is saved for the first time
+        cache.move_to(cache_directory(n_id) if self.spill_to_disk else None)
+        return cache
+
+    def process(self):
+        cache = self.get_cache()
+
         frame_current = bpy.context.scene.frame_current
         out_frame = frame_current - self.cache_offset
-        data[frame_current] = self.inputs[0].sv_get()
-        out_data = data.get(out_frame, [])
+        cache.keep_window(out_frame - self.cache_amount, frame_current + self.cache_amount)
+        cache.set(frame_current, self.inputs[0].sv_get())
+        out_data = cache.get(out_frame, [])
         self.outputs[0].sv_set(out_data)
 
+        screen = bpy.context.screen
+        if self.preload_frames and screen is not None and screen.is_animation_playing:
+            cache.preload(out_frame + i for i in range(1, self.preload_frames + 1))
+
+
 def register():
     bpy.utils.register_class(SvCacheNode)
 
+
 def unregister():
     bpy.utils.unregister_class(SvCacheNode)
-
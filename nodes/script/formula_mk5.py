@@ -18,7 +18,8 @@ from sverchok.data_structure import (updateNode,
                                      list_match_func, numpy_list_match_modes,
                                      enum_item_4)
 
-from sverchok.utils.modules.eval_formula import get_variables, safe_eval
+from sverchok.utils.modules.eval_formula import get_variables, sv_compile, make_safe_env
+from sverchok.utils.script_importhelper import safe_names, safe_names_np
 from sverchok.utils.sv_itertools import recurse_f_level_control
 
 def transform_data(data, transform):
@@ -41,22 +42,44 @@ def ensure_list(value):
         return value.tolist()
     return list(value)
 
+def broadcast_result(value, count):
+    """Make array of values for each of count elements from result of
+    vectorized evaluation of a formula. Components of tuple results, like
+    (x, y, 0), are broadcast separately, so that the array has shape (count, 3)"""
+    if isinstance(value, (tuple, list)):
+        return np.stack([broadcast_result(component, count) for component in value], axis=1)
+    value = np.asarray(value)
+    if value.ndim == 0 or value.shape[0] != count:
+        # the formula does not depend on variables in element-wise manner
+        value = np.broadcast_to(value, (count,) + value.shape)
+    return value
+
 def formula_func(parameters, constant, matching_f):
 
-    formulas, separate, var_names, transformations, as_list = constant
+    formulas, separate, var_names, transformations, as_list, env, vectorize = constant
+
+    if vectorize:
+        columns = [np.asarray(values) for values in matching_f(parameters)]
+        if not columns or not len(columns[0]):
+            return []
+        count = len(columns[0])
+        env.update(zip(var_names, columns))
+        values = [broadcast_result(eval(formula, env), count).tolist() for formula in formulas]
+        if separate:
+            return [list(vector) for vector in zip(*values)]
+        return [value for vector in zip(*values) for value in vector]
 
     object_results = []
     for values in zip(*matching_f(parameters)):
         vals = [transform_data(d, tr) for d, tr in zip(values, transformations)]
-        variables = dict(zip(var_names, vals))
+        env.update(zip(var_names, vals))
         vector = []
         for formula in formulas:
-            if formula:
-                value = safe_eval(formula, variables)
-                if as_list:
-                    vector.append(ensure_list(value))
-                else:
-                    vector.append(value)
+            value = eval(formula, env)
+            if as_list:
+                vector.append(ensure_list(value))
+            else:
+                vector.append(value)
         if separate:
             object_results.append(vector)
         else:
@@ -124,6 +147,11 @@ class SvFormulaNodeMk5(SverchCustomTreeNode, bpy.types.Node):
 
     use_ast: BoolProperty(name="AST", description="uses the ast.literal_eval module", update=updateNode)
     as_list: BoolProperty(name="List output", description="Forces a regular list output", update=updateNode)
+    vectorize: BoolProperty(
+        name="Vectorize",
+        description="Evaluate each formula once for whole lists of values, passed to variables as NumPy arrays; math functions work with arrays. "
+                    "Vectors are passed as arrays of shape (n, 3), so use x[:, 0] instead of x[0] to get X components. Transform of inputs is not used",
+        update=updateNode)
     ui_message: StringProperty(name="ui message")
     list_match: EnumProperty(
         name="List Match",
@@ -172,6 +200,7 @@ class SvFormulaNodeMk5(SverchCustomTreeNode, bpy.types.Node):
         layout.prop(self, "output_dimensions")
         layout.prop(self, "list_match")
         layout.prop(self, "as_list")
+        layout.prop(self, "vectorize")
 
         layout.prop(self, "output_type")
 
@@ -309,7 +338,10 @@ class SvFormulaNodeMk5(SverchCustomTreeNode, bpy.types.Node):
             matching_f = list_match_func[self.list_match]
             parameters = matching_f(input_values)
             desired_levels = [s.depth for s in self.inputs]
-            ops = [self.formulas(), self.separate, var_names, [s.transform for s in self.inputs], self.as_list]
+            formulas = [sv_compile(formula) for formula in self.formulas() if formula]
+            env = make_safe_env(safe_names_np if self.vectorize else safe_names)
+            ops = [formulas, self.separate, var_names, [s.transform for s in self.inputs], self.as_list,
+                   env, self.vectorize]
 
             results = recurse_f_level_control(parameters, ops, formula_func, matching_f, desired_levels)
 
@@ -326,9 +358,10 @@ class SvFormulaNodeMk5(SverchCustomTreeNode, bpy.types.Node):
                 results = joined_formulas(*self.formulas())
             else:
                 vector = []
+                env = make_safe_env()
                 for formula in self.formulas():
                     if formula:
-                        value = safe_eval(formula, dict())
+                        value = eval(sv_compile(formula), env)
                         vector.append(value)
                 results.extend(vector)
 
@@ -30,6 +30,9 @@ class DelaunayTriangulation2DNode(SverchCustomTreeNode, bpy.types.Node):
     bl_label = 'Delaunay 2D'
     bl_icon = 'OUTLINER_OB_EMPTY'
     sv_icon = 'SV_DELAUNAY'
+    # works with socket data only
+    is_thread_safe = True
+    is_output_cacheable = True
 
     def sv_init(self, context):
         self.inputs.new('SvVerticesSocket', "Vertices")
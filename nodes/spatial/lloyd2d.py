@@ -22,6 +22,9 @@ class SvLloyd2dNode(SverchCustomTreeNode, bpy.types.Node):
     bl_label = 'Lloyd 2D'
     bl_icon = 'OUTLINER_OB_EMPTY'
     sv_icon = 'SV_VORONOI'
+    # works with socket data only
+    is_thread_safe = True
+    is_output_cacheable = True
 
     clip: FloatProperty(
         name='clip', description='Clipping Distance',
@@ -39,6 +42,18 @@ class SvLloyd2dNode(SverchCustomTreeNode, bpy.types.Node):
         default = 'BOX',
         update = updateNode)
 
+    engines = [
+            ('FORTUNE', "Fortune", "Pure Python implementation of Fortune's algorithm", 0),
+            ('SCIPY', "SciPy", "Use scipy.spatial.Voronoi; much faster for big numbers of points", 1)
+        ]
+
+    engine: EnumProperty(
+        name = "Engine",
+        description = "Implementation of Voronoi diagram",
+        items = engines,
+        default = 'FORTUNE',
+        update = updateNode)
+
     iterations : IntProperty(
         name = "Iterations",
         description = "Number of Lloyd algorithm iterations",
@@ -59,6 +74,7 @@ class SvLloyd2dNode(SverchCustomTreeNode, bpy.types.Node):
     def draw_buttons_ext(self, context, layout):
         self.draw_buttons(context, layout)
         layout.prop(self, "clip", text="Clipping")
+        layout.prop(self, "engine")
 
     def process(self):
 
@@ -82,7 +98,8 @@ class SvLloyd2dNode(SverchCustomTreeNode, bpy.types.Node):
             new_verts = []
             for verts, iterations, weights in zip_long_repeat(*params):
                 iter_verts = lloyd2d(self.bound_mode, verts, iterations,
-                                clip = self.clip, weight_field = weights)
+                                clip = self.clip, weight_field = weights,
+                                engine = self.engine)
                 new_verts.append(iter_verts)
             if nested_output:
                 verts_out.append(new_verts)
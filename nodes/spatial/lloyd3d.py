@@ -24,6 +24,9 @@ class SvLloyd3dNode(SverchCustomTreeNode, bpy.types.Node):
     bl_icon = 'OUTLINER_OB_EMPTY'
     sv_icon = 'SV_VORONOI'
     sv_dependencies = {'scipy'}
+    # works with socket data only
+    is_thread_safe = True
+    is_output_cacheable = True
 
     iterations : IntProperty(
         name = "Iterations",
@@ -32,6 +32,9 @@ class SvExVoronoi3DNode(SverchCustomTreeNode, bpy.types.Node):
     bl_icon = 'OUTLINER_OB_EMPTY'
     sv_icon = 'SV_VORONOI'
     sv_dependencies = {'scipy'}
+    # works with socket data only
+    is_thread_safe = True
+    is_output_cacheable = True
 
     out_modes = [
         ('RIDGES', "Ridges", "Each output mesh object will represent one ridge, i.e. a part of plane which separates to regions of Voronoi diagram", 0),
@@ -33,6 +33,9 @@ class Voronoi2DNode(SverchCustomTreeNode, bpy.types.Node):
     bl_label = 'Voronoi 2D'
     bl_icon = 'OUTLINER_OB_EMPTY'
     sv_icon = 'SV_VORONOI'
+    # works with socket data only
+    is_thread_safe = True
+    is_output_cacheable = True
 
     clip: FloatProperty(
         name='clip', description='Clipping Distance. Amount of space to be added for bounding line',
@@ -50,6 +53,18 @@ class Voronoi2DNode(SverchCustomTreeNode, bpy.types.Node):
         default = 'BOX',
         update = updateNode)
 
+    engines = [
+            ('FORTUNE', "Fortune", "Pure Python implementation of Fortune's algorithm", 0),
+            ('SCIPY', "SciPy", "Use scipy.spatial.Voronoi; much faster for big numbers of points", 1)
+        ]
+
+    engine: EnumProperty(
+        name = "Engine",
+        description = "Implementation of Voronoi diagram",
+        items = engines,
+        default = 'FORTUNE',
+        update = updateNode)
+
     draw_bounds: BoolProperty(
         name = "Draw Bounds",
         description = "Draw bounding edges",
@@ -107,6 +122,7 @@ class Voronoi2DNode(SverchCustomTreeNode, bpy.types.Node):
 
     def draw_buttons_ext(self, context, layout):
         self.draw_buttons(context, layout)
+        layout.prop(self, 'engine')
         if self.make_faces:
             layout.prop(self, 'ordered_faces')
 
@@ -138,7 +154,8 @@ class Voronoi2DNode(SverchCustomTreeNode, bpy.types.Node):
                         draw_hangs = self.draw_hangs,
                         make_faces = self.make_faces,
                         ordered_faces = self.ordered_faces,
-                        max_sides = max_sides)
+                        max_sides = max_sides,
+                        engine = self.engine)
 
             pts_out.append(new_vertices)
             edges_out.append(edges)
@@ -25,6 +25,9 @@ class SvExVoronoiSphereNode(SverchCustomTreeNode, bpy.types.Node):
     bl_icon = 'OUTLINER_OB_EMPTY'
     sv_icon = 'SV_VORONOI'
     sv_dependencies = {'scipy'}
+    # works with socket data only
+    is_thread_safe = True
+    is_output_cacheable = True
 
     radius: FloatProperty(name="Radius", default=1.0, min=0.0, description="The sphere radius", update=updateNode)
 
@@ -190,9 +190,6 @@ class SvEvalSurfaceNode(SverchCustomTreeNode, bpy.types.Node):
         v_max = surface.get_v_max()
         us = np.linspace(u_min, u_max, num=samples_u)
         vs = np.linspace(v_min, v_max, num=samples_v)
-        us, vs = np.meshgrid(us, vs)
-        us = us.flatten()
-        vs = vs.flatten()
         return us, vs
 
     def make_edges_and_faces(self, samples_u, samples_v, get_edges, get_faces):
@@ -266,6 +263,9 @@ class SvEvalSurfaceNode(SverchCustomTreeNode, bpy.types.Node):
                 if self.eval_mode == 'GRID':
                     target_us, target_vs = self.make_grid_input(surface, samples_u, samples_v)
                     new_edges, new_faces = self.make_edges_and_faces(samples_u, samples_v, self.outputs['Edges'].is_linked, self.outputs['Faces'].is_linked)
+                    # V index changes slowest in the output
+                    new_verts = surface.evaluate_grid(target_us, target_vs)
+                    new_verts = np.transpose(new_verts, axes=(1,0,2)).reshape((-1, 3))
                 else:
                     if self.input_mode == 'VERTICES':
                         target_us, target_vs = self.parse_input(target_verts) # this mode take aligned target_us, target_vs
@@ -283,7 +283,7 @@ class SvEvalSurfaceNode(SverchCustomTreeNode, bpy.types.Node):
                         target_us, target_vs = self._wrap(surface, target_us, target_vs)
                     new_edges = []
                     new_faces = []
-                new_verts = surface.evaluate_array(target_us, target_vs)
+                    new_verts = surface.evaluate_array(target_us, target_vs)
 
                 new_verts = self.build_output(surface, new_verts)
                 if not self.output_numpy:
@@ -30,6 +30,9 @@ class SvExMarchingCubesNode(DraftMode, SverchCustomTreeNode, bpy.types.Node):
     bl_label = 'Marching Cubes'
     bl_icon = 'OUTLINER_OB_EMPTY'
     sv_icon = 'SV_EX_MCUBES'
+    # works with socket data only
+    is_thread_safe = True
+    is_output_cacheable = True
 
     iso_value : FloatProperty(
             name = "Value",
@@ -84,6 +87,13 @@ class SvExMarchingCubesNode(DraftMode, SverchCustomTreeNode, bpy.types.Node):
             min = 4,
             update = updateNode)
 
+    slab_size : IntProperty(
+            name = "Slab size",
+            description = "Process the grid by slabs of this many layers along Z, to limit memory usage on large grids; 0 means process the whole grid at once",
+            default = 0,
+            min = 0,
+            update = updateNode)
+
     def update_sockets(self, context):
         self.outputs['VertexNormals'].hide_safe = self.implementation != 'skimage'
         self.inputs['Samples'].hide_safe = self.sample_mode != 'UNI'
@@ -115,7 +125,7 @@ class SvExMarchingCubesNode(DraftMode, SverchCustomTreeNode, bpy.types.Node):
         modes.append(("skimage", "SciKit-Image", "SciKit-Image", 0))
     if mcubes is not None:
         modes.append(("mcubes", "PyMCubes", "PyMCubes", 1))
-    modes.append(('python', "Pure Python", "Pure Python implementation", 2))
+    modes.append(('python', "NumPy", "Built-in NumPy implementation", 2))
 
     implementation : EnumProperty(
             name = "Implementation",
@@ -150,7 +160,12 @@ class SvExMarchingCubesNode(DraftMode, SverchCustomTreeNode, bpy.types.Node):
     def draw_buttons(self, context, layout):
         layout.prop(self, "implementation", text="")
         layout.prop(self, "sample_mode")
-    
+
+    def draw_buttons_ext(self, context, layout):
+        self.draw_buttons(context, layout)
+        if self.implementation == 'python':
+            layout.prop(self, "slab_size")
+
     def draw_label(self):
         label = self.label or self.name
         if self.id_data.sv_draft:
@@ -249,7 +264,7 @@ class SvExMarchingCubesNode(DraftMode, SverchCustomTreeNode, bpy.types.Node):
                 new_verts, new_faces = new_verts.tolist(), new_faces.tolist()
                 new_normals = normals.tolist()
             else: # python
-                new_verts, new_faces = isosurface_np(func_values, value)
+                new_verts, new_faces = isosurface_np(func_values, value, slab_size=self.slab_size)
                 new_verts = self.scale_back(b1n, b2n, samples_x, samples_y, samples_z, new_verts)
                 new_verts = new_verts.tolist()
                 new_normals = []
@@ -27,6 +27,9 @@ class SvExMinSurfaceFromCurveNode(SverchCustomTreeNode, bpy.types.Node):
     bl_icon = 'OUTLINER_OB_EMPTY'
     sv_icon = 'SV_EX_MINSURFACE'
     sv_dependencies = {'scipy'}
+    # works with socket data only
+    is_thread_safe = True
+    is_output_cacheable = True
 
     function : EnumProperty(
             name = "Function",
@@ -25,6 +25,9 @@ class SvExMinimalSurfaceNode(SverchCustomTreeNode, bpy.types.Node):
     bl_icon = 'OUTLINER_OB_EMPTY'
     sv_icon = 'SV_EX_MINSURFACE'
     sv_dependencies = {'scipy'}
+    # works with socket data only
+    is_thread_safe = True
+    is_output_cacheable = True
 
     def update_sockets(self, context):
         self.inputs['Matrix'].hide_safe = self.coord_mode == 'UV'
@@ -4,7 +4,7 @@ from bpy.props import EnumProperty, BoolProperty, IntProperty
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level
 from sverchok.utils.surface import SvSurface
-from sverchok.utils.manifolds import nearest_point_on_surface
+from sverchok.utils.manifolds import nearest_point_on_surface, NEWTON
 
 
 class SvExNearestPointOnSurfaceNode(SverchCustomTreeNode, bpy.types.Node):
@@ -33,7 +33,8 @@ class SvExNearestPointOnSurfaceNode(SverchCustomTreeNode, bpy.types.Node):
         ('L-BFGS-B', "L-BFGS-B", "L-BFGS-B algorithm", 0),
         ('CG', "Conjugate Gradient", "Conjugate gradient algorithm", 1),
         ('TNC', "Truncated Newton", "Truncated Newton algorithm", 2),
-        ('SLSQP', "SLSQP", "Sequential Least SQuares Programming algorithm", 3)
+        ('SLSQP', "SLSQP", "Sequential Least SQuares Programming algorithm", 3),
+        (NEWTON, "Newton", "Newton iterations for all points at once; scipy is used only for points where they do not converge", 4)
     ]
 
     method : EnumProperty(
@@ -56,9 +57,12 @@ class SvExNearestPointOnSurfaceNode(SverchCustomTreeNode, bpy.types.Node):
         self.draw_buttons(context, layout)
         if self.precise:
             layout.prop(self, 'method')
-            layout.prop(self, 'sequential')
+            if self.method != NEWTON:
+                layout.prop(self, 'sequential')
 
     def sv_init(self, context):
+        # old nodes keep previous default method
+        self.method = NEWTON
         self.inputs.new('SvSurfaceSocket', "Surface")
         p = self.inputs.new('SvVerticesSocket', "Point")
         p.use_prop = True
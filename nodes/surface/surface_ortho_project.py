@@ -1,13 +1,11 @@
 
-import numpy as np
-
 import bpy
 from bpy.props import IntProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level
 from sverchok.utils.surface import SvSurface
-from sverchok.utils.manifolds import ortho_project_surface
+from sverchok.utils.manifolds import ortho_project_surface_array
 
 
 class SvExOrthoProjectSurfaceNode(SverchCustomTreeNode, bpy.types.Node):
@@ -51,14 +49,10 @@ class SvExOrthoProjectSurfaceNode(SverchCustomTreeNode, bpy.types.Node):
         uv_out = []
         for surfaces, src_points_i in zip_long_repeat(surfaces_s, src_point_s):
             for surface, src_points in zip_long_repeat(surfaces, src_points_i):
-                new_points = []
-                new_uv = []
-                for src_point in src_points:
-                    src_point = np.array(src_point)
-                    u, v, point = ortho_project_surface(src_point, surface, init_samples=self.samples)
-                    new_uv.append((u, v, 0))
-                    new_points.append(point)
-                points_out.append(new_points)
+                us, vs, new_points, result = ortho_project_surface_array(src_points, surface, init_samples=self.samples)
+                self.debug("Ortho projection: %s", result)
+                new_uv = [(u, v, 0) for u, v in zip(us.tolist(), vs.tolist())]
+                points_out.append(new_points.tolist())
                 uv_out.append(new_uv)
 
         self.outputs['Point'].sv_set(points_out)
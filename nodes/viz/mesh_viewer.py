@@ -7,6 +7,7 @@
 
 from itertools import cycle
 
+import numpy as np
 import bpy
 from bpy.props import BoolProperty
 from mathutils import Matrix
@@ -180,13 +181,19 @@ class SvMeshViewer(Show3DProperties, SvViewerNode, SverchCustomTreeNode, bpy.typ
         create_mesh_data = zip(self.mesh_data, cycle(verts), cycle(edges), cycle(faces), cycle(mesh_matrices),
                                cycle(mat_indexes))
         for me_data, v, e, f, m, mat_i in create_mesh_data:
-            me_data.regenerate_mesh(self.base_data_name, v, e, f, m, self.fast_mesh_update)
+            if isinstance(v, np.ndarray):
+                me_data.regenerate_np_mesh(self.base_data_name, me.NpMesh(v, e, f), m, self.fast_mesh_update)
+            else:
+                me_data.regenerate_mesh(self.base_data_name, v, e, f, m, self.fast_mesh_update)
             if self.material:
                 me_data.mesh.materials.clear()
                 me_data.mesh.materials.append(self.material)
             if mat_indexes:
                 with fix_error_msg({TypeError: "Unsupported material format"}):
-                    mat_i = [int(mi) for _, mi in zip(me_data.mesh.polygons, cycle(mat_i))]
+                    if isinstance(mat_i, np.ndarray) and len(mat_i):
+                        mat_i = np.resize(mat_i.astype(np.int32, copy=False), len(me_data.mesh.polygons))
+                    else:
+                        mat_i = [int(mi) for _, mi in zip(me_data.mesh.polygons, cycle(mat_i))]
                 me_data.mesh.polygons.foreach_set('material_index', mat_i)
             me_data.set_smooth(self.is_smooth_mesh)
 
@@ -6,13 +6,14 @@
 # License-Filename: LICENSE
 
 
-from itertools import cycle
+from itertools import cycle, chain
 
 from mathutils import Vector, Matrix
 from mathutils.geometry import tessellate_polygon as tessellate
 from mathutils.noise import random, seed_set
 import bpy
 from bpy.props import StringProperty, FloatProperty, IntProperty, EnumProperty, BoolProperty, FloatVectorProperty
+import numpy as np
 import bgl
 import gpu
 from gpu_extras.batch import batch_for_shader
@@ -61,30 +62,96 @@ default_fragment_shader = '''
     }
 '''
 
-def ensure_triangles(coords, indices, handle_concave_quads):
+def triangulate_np(coords, indices, handle_concave_quads):
     """
-    this fully tesselates the incoming topology into tris,
-    not optimized for meshes that don't contain ngons
+    Splits polygons into triangles, polygons are grouped by number of sides
+    and triangles of each group are created with array operations:
+    triangles are kept, quads are split into [a, b, c], [a, c, d] unless concave quads
+    should be handled, other polygons are checked for convexity and convex ones are fan-triangulated.
+    Only concave polygons are tessellated one by one.
+    Returns triangles, indexes of their polygons and whether triangulation depends on coordinates
     """
-    new_indices = []
-    face_index = []
-    concat = new_indices.append
-    concat2 = new_indices.extend
-    for idf, idxset in enumerate(indices):
-        num_verts = len(idxset)
-        if num_verts == 3:
-            concat(tuple(idxset))
-            face_index.append(idf)
-        elif num_verts == 4 and not handle_concave_quads:
-            # a b c d  ->  [a, b, c], [a, c, d]
-            concat2([(idxset[0], idxset[1], idxset[2]), (idxset[0], idxset[2], idxset[3])])
-            face_index.extend([idf, idf])
-        else:
+    loop_total = np.fromiter(map(len, indices), dtype=np.int64, count=len(indices))
+    flat = np.fromiter(chain.from_iterable(indices), dtype=np.int64, count=loop_total.sum())
+    loop_start = np.cumsum(loop_total) - loop_total
+
+    fan = loop_total >= 3
+    checked = (loop_total > 4) | ((loop_total == 4) & handle_concave_quads)
+    concave_polys = np.zeros(0, dtype=np.int64)
+    if checked.any():
+        # a corner is concave if it turns against normal of the polygon (Newell's method)
+        polys = np.flatnonzero(checked)
+        totals, starts = loop_total[polys], loop_start[polys]
+        sub_starts = np.cumsum(totals) - totals
+        position = np.arange(totals.sum()) - np.repeat(sub_starts, totals)
+        totals_r, starts_r = np.repeat(totals, totals), np.repeat(starts, totals)
+        co = np.asarray(coords, dtype=np.float64)
+        v = co[flat[starts_r + position]]
+        v_next = co[flat[starts_r + (position + 1) % totals_r]]
+        v_prev = co[flat[starts_r + (position - 1) % totals_r]]
+        normals = np.add.reduceat(np.cross(v, v_next), sub_starts)
+        turns = np.einsum('ij,ij->i', np.cross(v - v_prev, v_next - v), np.repeat(normals, totals, axis=0))
+        concave_polys = polys[np.logical_or.reduceat(turns < 0, sub_starts)]
+        fan[concave_polys] = False
+
+    fan_polys = np.flatnonzero(fan)
+    tris_number = loop_total[fan_polys] - 2
+    face_index = np.repeat(fan_polys, tris_number)
+    first = np.repeat(loop_start[fan_polys], tris_number)
+    i = np.arange(tris_number.sum()) - np.repeat(np.cumsum(tris_number) - tris_number, tris_number) + 1
+    triangles = np.stack([flat[first], flat[first + i], flat[first + i + 1]], axis=1)
+
+    if len(concave_polys):
+        concave_tris, concave_index = [], []
+        for idf in concave_polys.tolist():
+            idxset = indices[idf]
             subcoords = [Vector(coords[idx]) for idx in idxset]
             for pol in tessellate([subcoords]):
-                concat([idxset[i] for i in pol])
-                face_index.append(idf)
-    return new_indices, face_index
+                concave_tris.append([idxset[i] for i in pol])
+                concave_index.append(idf)
+        if concave_tris:
+            face_index = np.concatenate([face_index, concave_index])
+            order = np.argsort(face_index, kind='stable')
+            triangles = np.concatenate([triangles, np.array(concave_tris, dtype=np.int64)])[order]
+            face_index = face_index[order]
+
+    return triangles, face_index, bool(checked.any())
+
+
+def ensure_triangles(coords, indices, handle_concave_quads):
+    """
+    this fully tesselates the incoming topology into tris,
+    only concave polygons are tessellated one by one, see triangulate_np
+    """
+    triangles, face_index, _ = triangulate_np(coords, indices, handle_concave_quads)
+    return triangles.tolist(), face_index.tolist()
+
+
+# node id -> object index -> (polygons, vertices, handle_concave_quads, depends_on_coords, triangulation)
+triangulation_cache = dict()
+
+
+def get_triangles(config, vecs, polygons, obj_index):
+    """
+    Triangulation of polygons which is reused while the same polygons are drawn,
+    so changes of colors or of other drawing options do not trigger triangulation
+    """
+    if config.all_triangles:
+        return polygons, list(range(len(polygons)))
+
+    cached = config.triangulation_cache.get(obj_index)
+    if cached is not None:
+        c_polygons, c_vecs, c_handle_concave, depends_on_coords, triangulation = cached
+        if c_polygons is polygons and c_handle_concave == config.handle_concave_quads \
+                and (c_vecs is vecs or not depends_on_coords):
+            config.new_triangulation_cache[obj_index] = cached
+            return triangulation
+
+    triangles, face_index, depends_on_coords = triangulate_np(vecs, polygons, config.handle_concave_quads)
+    triangulation = triangles.tolist(), face_index.tolist()
+    config.new_triangulation_cache[obj_index] = (
+        polygons, vecs, config.handle_concave_quads, depends_on_coords, triangulation)
+    return triangulation
 
 
 def fill_points_colors(vectors_color, data, color_per_point, random_colors):
@@ -307,15 +374,11 @@ def face_light_factor(vecs, polygons, light):
 def vert_light_factor(vecs, polygons, light):
     return (np_dot(np_vertex_normals(vecs, polygons, output_numpy=True), light)*0.5+0.5).tolist()
 
-def polygons_geom(config, vecs, polygons, p_vertices, p_vertex_colors, p_indices, v_path, p_cols, idx_p_offset, points_colors):
+def polygons_geom(config, vecs, polygons, p_vertices, p_vertex_colors, p_indices, v_path, p_cols, idx_p_offset, points_colors, obj_index=0):
     '''generates polygons geometry'''
 
     if (config.color_per_polygon and not config.polygon_use_vertex_color) or config.shade_mode == 'facet':
-        if config.all_triangles:
-            polygon_indices = polygons
-            original_idx = list(range(len(polygons)))
-        else:
-            polygon_indices, original_idx = ensure_triangles(vecs, polygons, config.handle_concave_quads)
+        polygon_indices, original_idx = get_triangles(config, vecs, polygons, obj_index)
 
 
         if config.shade_mode == 'facet':
@@ -338,11 +401,7 @@ def polygons_geom(config, vecs, polygons, p_vertices, p_vertex_colors, p_indices
         p_vertex_colors.extend(v_c)
         p_indices.extend(idx)
     else:
-        if config.all_triangles:
-            polygon_indices = polygons
-            original_idx = list(range(len(polygons)))
-        else:
-            polygon_indices, original_idx = ensure_triangles(vecs, polygons, config.handle_concave_quads)
+        polygon_indices, original_idx = get_triangles(config, vecs, polygons, obj_index)
         p_vertices.extend(v_path)
 
         if config.shade_mode == 'smooth':
@@ -442,7 +501,12 @@ def generate_mesh_geom(config, vecs_in):
     else:
         points_color = []
 
-    for vecs, mat, polygons, edges, p_cols, e_col in zip(vecs_in, mats_in, cycle(polygons_s), cycle(edges_s), cycle(pol_color), cycle(edge_color)):
+    # triangulations which are not used anymore are forgotten
+    n_id = node_id(config.node)
+    config.triangulation_cache = triangulation_cache.get(n_id, dict())
+    config.new_triangulation_cache = triangulation_cache[n_id] = dict()
+
+    for obj_index, (vecs, mat, polygons, edges, p_cols, e_col) in enumerate(zip(vecs_in, mats_in, cycle(polygons_s), cycle(edges_s), cycle(pol_color), cycle(edge_color))):
         if use_matrix:
             v_path = [(mat @ Vector(v))[:] for v in vecs]
         else:
@@ -451,7 +515,7 @@ def generate_mesh_geom(config, vecs_in):
         if config.draw_edges:
             edges_geom(config, edges, e_col, v_path, e_vertices, e_vertex_colors, e_indices, idx_e_offset)
         if config.draw_polys:
-            polygons_geom(config, vecs, polygons, p_vertices, p_vertex_colors, p_indices, v_path, p_cols, idx_p_offset, points_color)
+            polygons_geom(config, vecs, polygons, p_vertices, p_vertex_colors, p_indices, v_path, p_cols, idx_p_offset, points_color, obj_index)
 
     if config.draw_verts:
         if config.uniform_verts:
@@ -565,7 +629,7 @@ class SvViewerDrawMk4(SverchCustomTreeNode, bpy.types.Node):
 
     handle_concave_quads: BoolProperty(
         name='Handle Concave Quads', default=False, update=updateNode,
-        description='tessellate quads using geometry.tessellate_polygon, expect some speed impact')
+        description='check quads for convexity and tessellate concave ones using geometry.tessellate_polygon, expect some speed impact')
 
     point_size: IntProperty(
         min=1, default=4, name='Verts Size',
@@ -943,6 +1007,7 @@ class SvViewerDrawMk4(SverchCustomTreeNode, bpy.types.Node):
 
     def sv_free(self):
         callback_disable(node_id(self))
+        triangulation_cache.pop(node_id(self), None)
 
     def show_viewport(self, is_show: bool):
         """It should be called by node tree to show/hide objects"""
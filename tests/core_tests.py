@@ -28,3 +28,35 @@ class CoreTests(SverchokTestCase):
                         self.fail(str(e))
                     self.assertIsNotNone(module)
 
+
+
+class SocketDataTests(SverchokTestCase):
+
+    def test_deep_copy(self):
+        from sverchok.core.socket_data import sv_deep_copy
+        verts = [[(0, 0, 0), (1, 0, 0)]]
+        faces = [[[0, 1, 2], [2, 3, 0]]]
+        verts_copy = sv_deep_copy(verts)
+        faces_copy = sv_deep_copy(faces)
+        self.assertEqual(verts_copy, verts)
+        self.assertEqual(faces_copy, faces)
+        self.assertIsNot(verts_copy[0], verts[0])
+        self.assertIsNot(faces_copy[0][0], faces[0][0])
+        # empty and partly empty objects
+        for data in [[], [[]], [[(0, 0, 0)], []], [[], [(0, 0, 0)]], [[[]]]]:
+            with self.subTest(data=data):
+                data_copy = sv_deep_copy(data)
+                self.assertEqual(data_copy, data)
+                if data:
+                    self.assertIsNot(data_copy[0], data[0])
+
+    def test_deep_copy_mixed_tuples(self):
+        from sverchok.core.socket_data import sv_deep_copy
+        data = [(1, 2, 3), [4, 5, 6]]
+        data_copy = sv_deep_copy(data)
+        self.assertEqual(data_copy, data)
+        self.assertIsNot(data_copy[1], data[1])
+        data = [(0, 1), ([2, 3], [4, 5])]
+        data_copy = sv_deep_copy(data)
+        self.assertEqual(data_copy[1], [[2, 3], [4, 5]])
+        self.assertIsNot(data_copy[1][0], data[1][0])
@@ -0,0 +1,57 @@
+import sys
+import time
+from math import sin, cos, pi
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.sv_logging import sv_logger
+from sverchok.nodes.modifier_make.csg_booleanMK2 import boolean_py, boolean_np
+
+
+def uv_sphere(center, radius, n):
+    verts = [(center[0], center[1], center[2] + radius), (center[0], center[1], center[2] - radius)]
+    for i in range(1, n):
+        theta = pi * i / n
+        for j in range(2 * n):
+            phi = pi * j / n
+            verts.append((center[0] + radius * sin(theta) * cos(phi),
+                          center[1] + radius * sin(theta) * sin(phi),
+                          center[2] + radius * cos(theta)))
+    ring = lambda i, j: 2 + (i - 1) * 2 * n + j % (2 * n)
+    faces = [[0, ring(1, j), ring(1, j + 1)] for j in range(2 * n)]
+    for i in range(1, n - 1):
+        faces.extend([ring(i, j), ring(i + 1, j), ring(i + 1, j + 1), ring(i, j + 1)] for j in range(2 * n))
+    faces.extend([1, ring(n - 1, j + 1), ring(n - 1, j)] for j in range(2 * n))
+    return verts, faces
+
+
+class CSGBooleanTests(SverchokTestCase):
+    def test_same_as_python(self):
+        va, pa = uv_sphere((0, 0, 0), 1.0, 6)
+        vb, pb = uv_sphere((0.4, 0.3, 0.1), 0.9, 6)
+        for operation in ['ITX', 'JOIN', 'DIFF']:
+            with self.subTest(operation=operation):
+                expected = boolean_py(va, pa, vb, pb, operation)
+                result = boolean_np(va, pa, vb, pb, operation)
+                self.assertEqual(result, expected)
+
+    def test_empty(self):
+        va, pa = uv_sphere((0, 0, 0), 1.0, 4)
+        self.assertEqual(len(boolean_np(va, pa, [], [], 'JOIN')[1]), len(pa))
+        self.assertEqual(boolean_np([], [], [], [], 'JOIN'), [[], []])
+
+    def test_benchmark(self):
+        va, pa = uv_sphere((0, 0, 0), 1.0, 10)
+        vb, pb = uv_sphere((0.4, 0.3, 0.1), 0.9, 10)
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(10000)
+        try:
+            for operation in ['ITX', 'JOIN', 'DIFF']:
+                times = []
+                for boolean in [boolean_py, boolean_np]:
+                    start = time.perf_counter()
+                    boolean(va, pa, vb, pb, operation)
+                    times.append(time.perf_counter() - start)
+                sv_logger.info("CSG %s of %s faces: Python %.3fs, NumPy %.3fs",
+                               operation, len(pa) + len(pb), times[0], times[1])
+        finally:
+            sys.setrecursionlimit(recursion_limit)
@@ -0,0 +1,50 @@
+import threading
+from unittest.mock import patch
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.core.update_system import is_main_thread_node
+from sverchok.nodes.logic.evolver import Population
+
+
+class EvolverWorkersTest(SverchokTestCase):
+    def test_thread_safe_tree_uses_pool(self):
+        with self.temporary_node_tree("EvolverTree") as tree:
+            number = tree.nodes.new('SvNumberNode')
+            math_node = tree.nodes.new('SvScalarMathNodeMK4')
+            evolver = tree.nodes.new('SvEvolverNode')
+            tree.links.new(number.outputs[0], math_node.inputs[0])
+            tree.links.new(math_node.outputs[0], evolver.inputs[0])
+            math_node.current_op = 'ADD'
+            math_node.y_ = 1.0
+            evolver.population_n = 8
+
+            threads = []  # (node bl_idname, is main thread)
+            lock = threading.Lock()
+
+            def wrap(process):
+                def wrapper(node):
+                    with lock:
+                        threads.append((node.bl_idname, threading.current_thread() is threading.main_thread()))
+                    return process(node)
+                return wrapper
+
+            math_class = type(math_node)
+            number_class = type(number)
+            with patch.object(math_class, 'is_thread_safe', True), \
+                    patch.object(math_class, 'process', wrap(math_class.process)), \
+                    patch.object(number_class, 'process', wrap(number_class.process)):
+                is_main_thread_node.cache_clear()
+                population = Population('All', evolver, tree)
+                try:
+                    population.init_workers(2)
+                    self.assertIsNotNone(population.pool)
+                    population.evaluate_fitness_g()
+                finally:
+                    population.free_workers()
+                    is_main_thread_node.cache_clear()
+
+            for agent in population.population_g:
+                self.assertAlmostEqual(agent.fitness, agent.genes[0] + 1.0)
+            # gene nodes are updated in the main thread, next nodes in the pool
+            self.assertTrue(all(is_main for name, is_main in threads if name == 'SvNumberNode'))
+            self.assertTrue(any(not is_main for name, is_main in threads if name == 'SvScalarMathNodeMK4'))
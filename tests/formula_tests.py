@@ -0,0 +1,64 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.data_structure import list_match_func
+from sverchok.utils.modules.eval_formula import sv_compile, make_safe_env
+from sverchok.utils.script_importhelper import safe_names, safe_names_np
+from sverchok.nodes.script.formula_mk5 import broadcast_result, formula_func
+
+
+class BroadcastResultTests(SverchokTestCase):
+    def test_array(self):
+        result = broadcast_result(np.array([1.0, 2.0, 3.0]), 3)
+        self.assertEqual(result.tolist(), [1.0, 2.0, 3.0])
+
+    def test_scalar(self):
+        result = broadcast_result(5, 3)
+        self.assertEqual(result.tolist(), [5, 5, 5])
+
+    def test_vector(self):
+        x = np.array([1.0, 2.0, 3.0])
+        y = np.array([4.0, 5.0, 6.0])
+        result = broadcast_result((x, y, 0), 3)
+        self.assertEqual(result.shape, (3, 3))
+        self.assertEqual(result.tolist(), [[1, 4, 0], [2, 5, 0], [3, 6, 0]])
+
+    def test_vector_of_scalars(self):
+        result = broadcast_result((1, 2, 3), 2)
+        self.assertEqual(result.tolist(), [[1, 2, 3], [1, 2, 3]])
+
+
+class VectorizedFormulaTests(SverchokTestCase):
+    def evaluate(self, formulas, var_names, parameters, vectorize):
+        matching_f = list_match_func['REPEAT']
+        env = make_safe_env(safe_names_np if vectorize else safe_names)
+        constant = [[sv_compile(f) for f in formulas], False, var_names, ['As_is'] * len(var_names),
+                    False, env, vectorize]
+        return formula_func(parameters, constant, matching_f)
+
+    def test_vector_formula(self):
+        parameters = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+        expected = self.evaluate(["(x, y, 0)"], ['x', 'y'], parameters, False)
+        result = self.evaluate(["(x, y, 0)"], ['x', 'y'], parameters, True)
+        self.assertEqual(result, [list(v) for v in expected])
+
+    def test_same_as_serial(self):
+        parameters = [[0.0, 0.5, 1.0, 1.5], [2.0]]
+        formulas = ["sin(x) * y", "x ** 2 + 1", "pi"]
+        expected = self.evaluate(formulas, ['x', 'y'], parameters, False)
+        result = self.evaluate(formulas, ['x', 'y'], parameters, True)
+        self.assert_numpy_arrays_equal(np.array(result), np.array(expected), precision=8)
+
+    def test_empty_input(self):
+        for parameters in [[], [[], []]]:
+            with self.subTest(parameters=parameters):
+                var_names = ['x', 'y'][:len(parameters)]
+                expected = self.evaluate(["x + y" if var_names else "pi"], var_names, parameters, False)
+                result = self.evaluate(["x + y" if var_names else "pi"], var_names, parameters, True)
+                self.assertEqual(result, expected)
+                self.assertEqual(result, [])
+
+    def test_vector_components(self):
+        parameters = [[(1.0, 2.0, 3.0), (4.0, 5.0, 6.0)]]
+        result = self.evaluate(["x[:, 0] + x[:, 1]"], ['x'], parameters, True)
+        self.assertEqual(result, [3.0, 9.0])
@@ -0,0 +1,78 @@
+import os
+import tempfile
+
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.frame_cache import SvFrameCache
+
+
+class FrameCacheTests(SverchokTestCase):
+    def frame_data(self, frame):
+        return [np.full(1000, frame, dtype=np.float64)]
+
+    def test_memory_limit(self):
+        cache = SvFrameCache(max_size=20000)
+        for frame in range(5):
+            cache.set(frame, self.frame_data(frame))
+        self.assertEqual(sorted(cache.frames), [3, 4])
+        self.assertIsNone(cache.get(0))
+
+    def test_spill_to_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = SvFrameCache(max_size=20000, directory=directory)
+            for frame in range(5):
+                cache.set(frame, self.frame_data(frame))
+            self.assertEqual(len(cache), 5)
+            cache.preload([1])
+            for frame in range(5):
+                with self.subTest(frame=frame):
+                    self.assert_numpy_arrays_equal(cache.get(frame)[0], self.frame_data(frame)[0])
+            cache.clear()
+
+    def test_window(self):
+        cache = SvFrameCache()
+        for frame in range(10):
+            cache.set(frame, self.frame_data(frame))
+        cache.keep_window(3, 5)
+        self.assertEqual(sorted(cache.frames), [3, 4, 5])
+
+    def test_spilled_structure(self):
+        data = [[(1, 2.5), {'a': np.arange(3)}], [None, "text", np.float32(1.5), True]]
+        with tempfile.TemporaryDirectory() as directory:
+            cache = SvFrameCache(max_size=1, directory=directory)
+            cache.set(0, data)
+            cache.set(1, self.frame_data(1))
+            self.assertIn(0, cache.spilled)
+            with np.load(cache._path(0), allow_pickle=False) as file:
+                self.assertIn('structure', file)
+            result = cache.get(0)
+            self.assertEqual(result[0][0], (1, 2.5))
+            self.assert_numpy_arrays_equal(result[0][1]['a'], np.arange(3))
+            self.assertEqual(result[1][:2], [None, "text"])
+            self.assertEqual(result[1][2], np.float32(1.5))
+            self.assertIs(result[1][3], True)
+            cache.clear()
+
+    def test_objects_are_not_spilled(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = SvFrameCache(max_size=1, directory=directory)
+            cache.set(0, [object()])
+            cache.set(1, self.frame_data(1))
+            self.assertNotIn(0, cache)
+            self.assertEqual(os.listdir(directory), [])
+            cache.clear()
+
+    def test_move_to(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = SvFrameCache(max_size=20000, directory=os.path.join(directory, "old"))
+            for frame in range(5):
+                cache.set(frame, self.frame_data(frame))
+            cache.move_to(os.path.join(directory, "new"))
+            self.assertFalse(os.path.exists(os.path.join(directory, "old")))
+            self.assertEqual(len(cache), 5)
+            for frame in range(5):
+                with self.subTest(frame=frame):
+                    self.assert_numpy_arrays_equal(cache.get(frame)[0], self.frame_data(frame)[0])
+            cache.move_to(None)
+            self.assertEqual(len(cache.spilled), 0)
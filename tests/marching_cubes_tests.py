@@ -0,0 +1,33 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.marching_cubes import isosurface_np, isosurface_py
+
+
+class MarchingCubesTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        xs, ys, zs = np.meshgrid(np.linspace(-1, 1, 9),
+                                 np.linspace(-1, 1, 10),
+                                 np.linspace(-1, 1, 11),
+                                 indexing='ij')
+        self.data = xs*xs + ys*ys + zs*zs
+
+    def test_same_as_python(self):
+        expected_verts, expected_faces = isosurface_py(self.data, 0.5)
+        verts, faces = isosurface_np(self.data, 0.5)
+        self.assertEqual(faces, expected_faces)
+        self.assert_numpy_arrays_equal(verts, np.array(expected_verts), precision=8)
+
+    def test_slabs(self):
+        expected_verts, expected_faces = isosurface_np(self.data, 0.5)
+        for slab_size in [1, 2, 3]:
+            with self.subTest(slab_size = slab_size):
+                verts, faces = isosurface_np(self.data, 0.5, slab_size=slab_size)
+                self.assertEqual(faces, expected_faces)
+                self.assert_numpy_arrays_equal(verts, expected_verts, precision=8)
+
+    def test_empty(self):
+        verts, faces = isosurface_np(self.data, 10.0)
+        self.assertEqual(verts.shape, (0, 3))
+        self.assertEqual(faces, [])
@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+import numpy as np
+import bpy
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.nodes_mixins.generating_objects import SvMeshData
+import sverchok.utils.meshes as me
+
+
+class NpMeshTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        self.quad = me.to_mesh(np.array([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]), [(0, 1)], [(0, 1, 2, 3)])
+        self.tri = me.to_mesh(np.array([(0, 0, 1), (1, 0, 1), (1, 1, 1)]), np.array([[0, 1], [1, 2]]),
+                              np.array([[0, 1, 2]]))
+        self.tri.polygons['material'] = [5]
+
+    def test_csr_layout(self):
+        polygons = me.PolygonsCSR.from_polygons([[0, 1, 2, 3], [4, 5, 6], [0, 3, 7, 8, 9]])
+        self.assertEqual(polygons.loop_start.tolist(), [0, 4, 7])
+        self.assertEqual(polygons.loop_total.tolist(), [4, 3, 5])
+        self.assertEqual(polygons.tolist(), [[0, 1, 2, 3], [4, 5, 6], [0, 3, 7, 8, 9]])
+
+    def test_blender_types(self):
+        self.assertEqual(self.tri.vertices.data.dtype, np.float32)
+        self.assertEqual(self.tri.edges.data.dtype, np.int32)
+        self.assertEqual(self.tri.polygons.data.indices.dtype, np.int32)
+
+    def test_join(self):
+        mesh = me.join([self.quad, self.tri])
+        self.assertIsInstance(mesh, me.NpMesh)
+        self.assertEqual(len(mesh.vertices), 7)
+        self.assertEqual(mesh.edges.data.tolist(), [[0, 1], [4, 5], [5, 6]])
+        self.assertEqual(mesh.polygons.data.tolist(), [[0, 1, 2, 3], [4, 5, 6]])
+        self.assertEqual(mesh.polygons['material'].tolist(), [5, 5])
+
+    def test_join_same_as_python(self):
+        py_mesh = me.join([self.quad.cast(me.PyMesh), self.tri.cast(me.PyMesh)])
+        np_mesh = me.join([self.quad, self.tri])
+        self.assertEqual(np_mesh.vertices.data.tolist(), py_mesh.vertices.data)
+        self.assertEqual(np_mesh.edges.data.tolist(), py_mesh.edges.data)
+        self.assertEqual(np_mesh.polygons.data.tolist(), py_mesh.polygons.data)
+
+    def test_add_mesh(self):
+        self.quad.add_mesh(self.tri)
+        self.assertEqual(self.quad.polygons.data.tolist(), [[0, 1, 2, 3], [4, 5, 6]])
+        self.assertEqual(self.quad.edges.data.tolist(), [[0, 1], [4, 5], [5, 6]])
+        # given mesh is not changed
+        self.assertEqual(self.tri.polygons.data.tolist(), [[0, 1, 2]])
+
+
+class RegenerateNpMeshTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        self.mesh_data = SimpleNamespace(mesh=None)
+
+    def tearDown(self):
+        if self.mesh_data.mesh is not None:
+            bpy.data.meshes.remove(self.mesh_data.mesh)
+        super().tearDown()
+
+    def test_valid_mesh(self):
+        mesh = me.to_mesh(np.array([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (2, 0, 0)]), [],
+                          [(0, 1, 2, 3), (1, 4, 2)])
+        SvMeshData.regenerate_np_mesh(self.mesh_data, 'sv_test_mesh', mesh)
+        self.assertEqual([list(p.vertices) for p in self.mesh_data.mesh.polygons], [[0, 1, 2, 3], [1, 4, 2]])
+        self.assertEqual(len(self.mesh_data.mesh.edges), 6)
+
+    def test_invalid_polygons(self):
+        mesh = me.to_mesh(np.array([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]), [],
+                          [(0, 1, 2, 3), (0, 1), (0, 1, 1, 2), (0, 1, 2, 3)])
+        SvMeshData.regenerate_np_mesh(self.mesh_data, 'sv_test_mesh', mesh)
+        self.assertEqual([list(p.vertices) for p in self.mesh_data.mesh.polygons], [[0, 1, 2, 3]])
+        self.assertEqual(len(self.mesh_data.mesh.edges), 4)
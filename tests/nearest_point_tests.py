@@ -0,0 +1,78 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase, requires
+from sverchok.utils.curve.nurbs import SvNurbsCurve
+from sverchok.utils.curve import knotvector as sv_knotvector
+from sverchok.utils.surface.nurbs import SvNurbsSurface
+from sverchok.utils.manifolds import (
+        nearest_points_on_surface_batched, nearest_point_on_surface,
+        nearest_point_on_curve, NEWTON)
+from sverchok.dependencies import scipy
+
+
+class SurfaceProjectionTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        xs, ys = np.meshgrid(np.linspace(0, 3, 4), np.linspace(0, 3, 4), indexing='ij')
+        zs = np.array([[0, 1, 1, 0], [1, 2, 2, 1], [1, 2, 2, 1], [0, 1, 1, 0]], dtype=np.float64)
+        control_points = np.stack([xs, ys, zs], axis=2)
+        self.surface = SvNurbsSurface.build(SvNurbsSurface.NATIVE, 3, 3,
+                            [0, 0, 0, 0, 1, 1, 1, 1], [0, 0, 0, 0, 1, 1, 1, 1],
+                            control_points)
+        rng = np.random.default_rng(1)
+        self.points = rng.uniform([0.5, 0.5, 0.0], [2.5, 2.5, 2.0], size=(50, 3))
+
+    @requires(scipy)
+    def test_same_as_scipy(self):
+        expected_us, expected_vs, expected_points = nearest_point_on_surface(self.points, self.surface, init_samples=10)
+        result = nearest_points_on_surface_batched(self.points, self.surface, init_samples=10)
+        expected_distances = np.linalg.norm(np.array(expected_points) - self.points, axis=1)
+        distances = np.linalg.norm(result.points - self.points, axis=1)
+        self.assert_numpy_arrays_equal(distances, expected_distances, precision=5)
+        self.assertEqual(result.converged_count + result.fallback_count, len(self.points))
+
+    @requires(scipy)
+    def test_points_on_surface(self):
+        us = np.linspace(0.1, 0.9, 5)
+        vs = np.linspace(0.9, 0.1, 5)
+        points = self.surface.evaluate_array(us, vs)
+        result = nearest_points_on_surface_batched(points, self.surface, init_samples=10)
+        self.assert_numpy_arrays_equal(result.points, points, precision=6)
+        self.assert_numpy_arrays_equal(result.us, us, precision=5)
+        self.assert_numpy_arrays_equal(result.vs, vs, precision=5)
+
+
+class CurveProjectionTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        control_points = np.array([[0, 0, 0], [1, 2, 0], [2, -1, 1], [3, 1, 0], [4, 0, 0]], dtype=np.float64)
+        self.curve = SvNurbsCurve.build(SvNurbsCurve.NATIVE, 3,
+                        sv_knotvector.generate(3, len(control_points)),
+                        control_points)
+        rng = np.random.default_rng(1)
+        self.points = rng.uniform([0.5, -1.0, -1.0], [3.5, 1.0, 1.0], size=(50, 3))
+
+    @requires(scipy)
+    def test_same_as_dense_sampling(self):
+        result = nearest_point_on_curve(self.points, self.curve, samples=50, method=NEWTON)
+        distances = np.array([np.linalg.norm(p - src) for (t, p), src in zip(result, self.points)])
+        t_min, t_max = self.curve.get_u_bounds()
+        dense_points = self.curve.evaluate_array(np.linspace(t_min, t_max, 200000))
+        expected_distances = np.array([np.linalg.norm(dense_points - src, axis=1).min() for src in self.points])
+        self.assert_numpy_arrays_equal(distances, expected_distances, precision=6)
+
+    @requires(scipy)
+    def test_not_worse_than_brent(self):
+        # Brent's method can stop at a local minimum, so results may differ
+        expected = nearest_point_on_curve(self.points, self.curve, samples=50, method='Brent')
+        result = nearest_point_on_curve(self.points, self.curve, samples=50, method=NEWTON)
+        expected_distances = np.array([np.linalg.norm(p - src) for (t, p), src in zip(expected, self.points)])
+        distances = np.array([np.linalg.norm(p - src) for (t, p), src in zip(result, self.points)])
+        self.assertTrue(np.all(distances <= expected_distances + 1e-6))
+
+    @requires(scipy)
+    def test_points_on_curve(self):
+        ts = np.linspace(0.05, 0.95, 7)
+        points = self.curve.evaluate_array(ts)
+        result = nearest_point_on_curve(points, self.curve, samples=50, method=NEWTON, output_points=False)
+        self.assert_numpy_arrays_equal(np.array(result), ts, precision=5)
@@ -16,7 +16,7 @@ from sverchok.utils.surface.algorithms import SvCurveLerpSurface
 from sverchok.dependencies import geomdl
 
 if geomdl is not None:
-    from geomdl.helpers import basis_function_one, basis_function_ders_one
+    from geomdl.helpers import basis_function_one, basis_function_ders_one, basis_function_ders, find_span_linear
 
 #@unittest.skip
 class NurbsCurveTests(SverchokTestCase):
@@ -61,6 +61,23 @@ class NurbsCurveTests(SverchokTestCase):
 
         self.assert_numpy_arrays_equal(expected, d2s, precision=8)
 
+    @requires(geomdl)
+    def test_nonzero_derivatives(self):
+        "Test span-based basis functions evaluation against geomdl"
+        knotvector = [0, 0, 0, 0, 0.3, 0.5, 0.5, 0.7, 1, 1, 1, 1]
+        degree = 3
+        n_cpts = len(knotvector) - degree - 1
+        functions = SvNurbsBasisFunctions(np.array(knotvector))
+        spans, inside, ders = functions.nonzero_derivatives(degree, self.ts, 2)
+
+        expected_spans = [find_span_linear(degree, knotvector, n_cpts, t) for t in self.ts]
+        self.assertEqual(spans.tolist(), expected_spans)
+        # expected[j, k, r] is the k'th derivative of function N[span-p+r, p] at ts[j]
+        expected = np.array([basis_function_ders(degree, knotvector, span, t, 2)
+                             for span, t in zip(expected_spans, self.ts)])
+        for k in range(3):
+            self.assert_numpy_arrays_equal(ders[k], expected[:, k, :], precision=8)
+
     #@unittest.skip
     @requires(geomdl)
     def test_curve_eval(self):
@@ -246,6 +263,15 @@ class NurbsSurfaceTests(SverchokTestCase):
         vs2 = native_surface.evaluate_array(self.us, self.vs)
         self.assert_numpy_arrays_equal(vs1, vs2, precision=8, fail_fast=False)
 
+    def test_eval_grid(self):
+        weights = [[1,1,1,1], [1,2,3,1], [1,3,4,1], [1,4,5,1], [1,1,1,1]]
+        surface = SvNativeNurbsSurface(self.degree_u, self.degree_v, self.knotvector_u, self.knotvector_v, self.control_points, weights)
+        us = np.linspace(0.0, 1.0, num=3)
+        vs = np.linspace(0.0, 1.0, num=4)
+        grid = surface.evaluate_grid(us, vs)
+        expected = surface.evaluate_array(self.us, self.vs).reshape((4, 3, 3))
+        self.assert_numpy_arrays_equal(np.transpose(grid, axes=(1,0,2)), expected, precision=8)
+
     @requires(geomdl)
     #@unittest.skip
     def test_normal(self):
@@ -0,0 +1,119 @@
+import gc
+import weakref
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.core.socket_data import (get_output_socket_data, estimate_size,
+                                       socket_data_cache)
+from sverchok.core.update_system import UpdateTree
+from sverchok.core.output_cache import (NodeOutputCache, CACHE_HITS_KEY,
+                                        CACHE_MISSES_KEY, get_cache)
+
+
+class OutputCacheTest(SverchokTestCase):
+    @contextmanager
+    def cached_tree(self):
+        """Number -> Math -> Math, only Math nodes are cacheable"""
+        with self.temporary_node_tree("CachedTree") as tree:
+            number = tree.nodes.new('SvNumberNode')
+            math_node = tree.nodes.new('SvScalarMathNodeMK4')
+            next_node = tree.nodes.new('SvScalarMathNodeMK4')
+            tree.links.new(number.outputs[0], math_node.inputs[0])
+            tree.links.new(math_node.outputs[0], next_node.inputs[0])
+            number.float_ = 2.0
+            math_node.current_op = 'ADD'
+            math_node.y_ = 1.0
+            tree.sv_cache_outputs = True
+            with patch.object(type(math_node), 'is_output_cacheable', True):
+                try:
+                    UpdateTree.reset_tree(tree)
+                    self.update(tree)
+                    yield tree, number, math_node
+                finally:
+                    UpdateTree.reset_tree(tree)
+
+    def update(self, tree, outdated=None):
+        if outdated is not None:
+            UpdateTree.get(tree).add_outdated(outdated)
+        for _ in UpdateTree.main_update(tree, update_interface=False):
+            pass
+
+    def test_hit_and_miss(self):
+        with self.cached_tree() as (tree, number, math_node):
+            self.assertEqual(math_node.get(CACHE_MISSES_KEY), 1)
+            self.assertIsNone(math_node.get(CACHE_HITS_KEY))
+            self.assertIsNone(number.get(CACHE_MISSES_KEY))  # is not cacheable
+
+            # the same input data
+            self.update(tree, [number])
+            self.assertEqual(math_node.get(CACHE_MISSES_KEY), 1)
+            self.assertEqual(math_node.get(CACHE_HITS_KEY), 1)
+            self.assertEqual(get_output_socket_data(math_node, 'Out'), [[3.0]])
+
+            number.float_ = 5.0
+            self.update(tree, [number])
+            self.assertEqual(math_node.get(CACHE_MISSES_KEY), 2)
+            self.assertEqual(get_output_socket_data(math_node, 'Out'), [[6.0]])
+
+    def test_property_change(self):
+        with self.cached_tree() as (tree, number, math_node):
+            math_node.y_ = 2.0
+            self.update(tree, [math_node])
+            self.assertEqual(math_node.get(CACHE_MISSES_KEY), 2)
+            self.assertEqual(get_output_socket_data(math_node, 'Out'), [[4.0]])
+
+            # previous state is restored from the cache
+            math_node.y_ = 1.0
+            self.update(tree, [math_node])
+            self.assertEqual(math_node.get(CACHE_MISSES_KEY), 2)
+            self.assertEqual(math_node.get(CACHE_HITS_KEY), 1)
+            self.assertEqual(get_output_socket_data(math_node, 'Out'), [[3.0]])
+
+    def test_eviction(self):
+        with self.cached_tree() as (tree, number, math_node):
+            data = [np.zeros(1000)]
+            size = estimate_size(data)
+            cache = NodeOutputCache(int(size * 2.5))
+            for i in range(3):
+                math_node.outputs[0].sv_set(data)
+                cache.store(math_node, bytes([i]), [])
+            self.assertLessEqual(cache.size, cache.max_size)
+            # the least recently used entry is forgotten
+            self.assertFalse(cache.restore(math_node, bytes([0])))
+            self.assertTrue(cache.restore(math_node, bytes([1])))
+            self.assertTrue(cache.restore(math_node, bytes([2])))
+
+            # outputs bigger than the budget are not stored
+            cache.max_size = size // 2
+            cache.store(math_node, bytes([3]), [])
+            self.assertFalse(cache.restore(math_node, bytes([3])))
+
+    def test_evicted_data_is_released(self):
+        with self.cached_tree() as (tree, number, math_node):
+            next_node = math_node.outputs[0].links[0].to_node
+            expected = get_output_socket_data(next_node, 'Out')
+            data = [np.zeros(1000)]
+            ref = weakref.ref(data[0])
+            math_node.outputs[0].sv_set(data)
+            next_node.inputs[0].sv_set(data)
+            get_cache(tree).store(math_node, b'digest', [])
+            del data
+
+            UpdateTree.get(tree)._evict_data(0)
+            gc.collect()
+            # neither sockets nor the output cache refer to the data
+            self.assertIsNone(ref())
+            self.assertNotIn(math_node.outputs[0].socket_id, socket_data_cache)
+            self.assertNotIn(next_node.inputs[0].socket_id, socket_data_cache)
+
+            # the evicted node is recalculated for the next node
+            self.update(tree, [next_node])
+            self.assertEqual(get_output_socket_data(next_node, 'Out'), expected)
+
+    def test_disabled(self):
+        with self.cached_tree() as (tree, number, math_node):
+            tree.sv_cache_outputs = False
+            self.assertIsNone(get_cache(tree))
@@ -0,0 +1,64 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.points_in_mesh import inside_mesh_winding, inside_mesh_projection
+
+
+class PointsInMeshTests(SverchokTestCase):
+    cube_verts = [(-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1),
+                  (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1)]
+    cube_faces = [(0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7)]
+
+    # L-shaped prism, its caps are concave ngons
+    l_shape = [(0, 0), (2, 0), (2, 1), (1, 1), (1, 2), (0, 2)]
+    l_verts = [(x, y, 0) for x, y in l_shape] + [(x, y, 1) for x, y in l_shape]
+    l_faces = [(5, 4, 3, 2, 1, 0), (6, 7, 8, 9, 10, 11)] + [(i, (i + 1) % 6, (i + 1) % 6 + 6, i + 6) for i in range(6)]
+
+    @staticmethod
+    def in_l_shape(points):
+        x, y = points[:, 0], points[:, 1]
+        return (x > 0) & (y > 0) & (((x < 2) & (y < 1)) | ((x < 1) & (y < 2)))
+
+    def test_cube(self):
+        points = np.random.default_rng(1).uniform(-2, 2, size=(1000, 3))
+        expected = (abs(points) < 1).all(axis=1)
+        for direction in [(0, 0, 1), (0.3, 0.5, 0.8), (-1, 0, 0)]:
+            with self.subTest(direction=direction):
+                result = inside_mesh_winding(self.cube_verts, self.cube_faces, points, direction)
+                self.assert_numpy_arrays_equal(result, expected)
+
+    def test_rays_through_edges(self):
+        # rays along Z axis from these points go exactly through edges and vertices
+        grid = np.linspace(-1.5, 1.5, 13)
+        points = np.stack(np.meshgrid(grid, grid, grid), axis=-1).reshape(-1, 3)
+        points = points[(abs(abs(points) - 1) > 1e-6).all(axis=1)]
+        expected = (abs(points) < 1).all(axis=1)
+        result = inside_mesh_winding(self.cube_verts, self.cube_faces, points)
+        self.assert_numpy_arrays_equal(result, expected)
+
+    def test_flipped_normals(self):
+        points = np.random.default_rng(2).uniform(-2, 2, size=(1000, 3))
+        flipped = [face[::-1] for face in self.cube_faces]
+        self.assert_numpy_arrays_equal(
+                inside_mesh_winding(self.cube_verts, flipped, points),
+                inside_mesh_winding(self.cube_verts, self.cube_faces, points))
+
+    def test_concave_faces(self):
+        rng = np.random.default_rng(3)
+        points = np.column_stack([rng.uniform(-0.5, 2.5, size=(1000, 2)), rng.uniform(-0.5, 1.5, size=1000)])
+        expected = self.in_l_shape(points) & (points[:, 2] > 0) & (points[:, 2] < 1)
+        result = inside_mesh_winding(self.l_verts, self.l_faces, points, (0.2, 0.3, 1))
+        self.assert_numpy_arrays_equal(result, expected)
+
+    def test_projection(self):
+        rng = np.random.default_rng(4)
+        points = np.column_stack([rng.uniform(-0.5, 2.5, size=(1000, 2)), rng.uniform(-1, 1, size=1000)])
+        bottom = [self.l_faces[0]]
+        result = inside_mesh_projection(self.l_verts, bottom, points, (0, 0, 1))
+        self.assert_numpy_arrays_equal(result, self.in_l_shape(points))
+        result = inside_mesh_projection(self.l_verts, bottom, points, (0, 0, -1), max_distance=0.5)
+        self.assert_numpy_arrays_equal(result, self.in_l_shape(points) & (abs(points[:, 2]) < 0.5))
+
+    def test_empty(self):
+        self.assertEqual(len(inside_mesh_winding(self.cube_verts, [], [(0, 0, 0)])), 1)
+        self.assertEqual(len(inside_mesh_projection(self.cube_verts, self.cube_faces, np.zeros((0, 3)))), 0)
@@ -1,7 +1,11 @@
+import threading
+from contextlib import contextmanager
 from typing import Iterable
+from unittest.mock import patch
 
 from sverchok.utils.testing import SverchokTestCase
-from sverchok.core.update_system import SearchTree
+from sverchok.core.update_system import (SearchTree, UpdateTree, UPDATE_KEY,
+                                         ERROR_KEY, is_main_thread_node)
 
 
 class TreeCleaningTest(SverchokTestCase):
@@ -76,6 +80,83 @@ class TreeCleaningTest(SverchokTestCase):
         self.assertSetEqual(f_ns, t_ns, msg=msg)
 
 
+class ParallelWalkTest(SverchokTestCase):
+    @contextmanager
+    def parallel_tree(self, fail_node=None):
+        """Number -> (A, B) -> C, and Number -> D. Math nodes are marked as
+        thread safe, the Number node is not"""
+        with self.temporary_node_tree("ParallelTree") as tree:
+            tree.sv_threads = 4
+            number = tree.nodes.new('SvNumberNode')
+            number.name = 'Number'
+            math_nodes = dict()
+            for name in "ABCD":
+                math_nodes[name] = tree.nodes.new('SvScalarMathNodeMK4')
+                math_nodes[name].name = name
+            tree.links.new(number.outputs[0], math_nodes['A'].inputs[0])
+            tree.links.new(number.outputs[0], math_nodes['B'].inputs[0])
+            tree.links.new(number.outputs[0], math_nodes['D'].inputs[0])
+            tree.links.new(math_nodes['A'].outputs[0], math_nodes['C'].inputs[0])
+            tree.links.new(math_nodes['B'].outputs[0], math_nodes['C'].inputs[1])
+
+            calls = []  # (node name, is main thread)
+            lock = threading.Lock()
+
+            def wrap(process):
+                def wrapper(node):
+                    with lock:
+                        calls.append((node.name, threading.current_thread() is threading.main_thread()))
+                    if node.name == fail_node:
+                        raise RuntimeError("Test error")
+                    return process(node)
+                return wrapper
+
+            math_class = type(math_nodes['A'])
+            number_class = type(number)
+            with patch.object(math_class, 'is_thread_safe', True), \
+                    patch.object(math_class, 'process', wrap(math_class.process)), \
+                    patch.object(number_class, 'process', wrap(number_class.process)):
+                is_main_thread_node.cache_clear()
+                try:
+                    UpdateTree.reset_tree(tree)
+                    for _ in UpdateTree.main_update(tree, update_interface=False):
+                        pass
+                    yield tree, calls
+                finally:
+                    is_main_thread_node.cache_clear()
+                    UpdateTree.reset_tree(tree)
+
+    def test_order(self):
+        with self.parallel_tree() as (tree, calls):
+            names = [name for name, _ in calls]
+            self.assertCountEqual(names, ['Number', 'A', 'B', 'C', 'D'])
+            for before, after in [('Number', 'A'), ('Number', 'B'), ('Number', 'D'),
+                                  ('A', 'C'), ('B', 'C')]:
+                self.assertLess(names.index(before), names.index(after))
+            for node in tree.nodes:
+                self.assertTrue(node[UPDATE_KEY])
+                self.assertIsNone(node[ERROR_KEY])
+
+    def test_threads(self):
+        with self.parallel_tree() as (tree, calls):
+            in_main_thread = dict(calls)
+            # not thread safe nodes are executed in the main thread
+            self.assertTrue(in_main_thread['Number'])
+            self.assertFalse(any(in_main_thread[name] for name in "ABCD"))
+            # properties of sockets are changed in the main thread afterwards
+            self.assertEqual(tree.nodes['A'].outputs[0].objects_number, 1)
+
+    def test_error_in_thread(self):
+        with self.parallel_tree(fail_node='A') as (tree, calls):
+            names = [name for name, _ in calls]
+            self.assertNotIn('C', names)
+            self.assertIn("Test error", tree.nodes['A'][ERROR_KEY])
+            self.assertFalse(tree.nodes['A'][UPDATE_KEY])
+            self.assertFalse(tree.nodes['C'][UPDATE_KEY])
+            self.assertTrue(tree.nodes['B'][UPDATE_KEY])
+            self.assertTrue(tree.nodes['D'][UPDATE_KEY])
+
+
 def _to_names(nodes: Iterable) -> Iterable[str]:
     for n in nodes:
         yield n.name
@@ -0,0 +1,79 @@
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase, requires
+from sverchok.utils.voronoi import voronoi_bounded, FORTUNE, SCIPY
+from sverchok.dependencies import scipy
+
+
+def segments(verts, edges):
+    """Edges as sets of coordinates, which do not depend on vertex indexes"""
+    verts = np.round(np.array(verts), 6).tolist()
+    return {tuple(sorted([tuple(verts[i]), tuple(verts[j])])) for i, j in edges}
+
+
+def polygon_area(points):
+    xs, ys = points[:, 0], points[:, 1]
+    return 0.5 * abs(np.dot(xs, np.roll(ys, -1)) - np.dot(ys, np.roll(xs, -1)))
+
+
+def contains(points, point):
+    """Check that convex polygon contains the point"""
+    directions = np.roll(points, -1, axis=0) - points
+    rel = point - points
+    cross = directions[:, 0] * rel[:, 1] - directions[:, 1] * rel[:, 0]
+    return (cross >= -1e-9).all() or (cross <= 1e-9).all()
+
+
+class ScipyVoronoiTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(1)
+        self.sites = [(x, y, 0) for x, y in rng.uniform(-1, 1, size=(30, 2))]
+
+    @requires(scipy)
+    def test_same_edges_as_fortune(self):
+        for bound_mode in ['BOX', 'CIRCLE']:
+            for draw_bounds, draw_hangs in [(False, False), (False, True), (True, False), (True, True)]:
+                if bound_mode == 'BOX' and draw_bounds:
+                    # SciPy engine adds corners of the box to the bounding edges
+                    continue
+                with self.subTest(bound_mode=bound_mode, draw_bounds=draw_bounds, draw_hangs=draw_hangs):
+                    expected = voronoi_bounded(self.sites, bound_mode=bound_mode, clip=0.5, draw_bounds=draw_bounds,
+                                               draw_hangs=draw_hangs, engine=FORTUNE)
+                    result = voronoi_bounded(self.sites, bound_mode=bound_mode, clip=0.5, draw_bounds=draw_bounds,
+                                             draw_hangs=draw_hangs, engine=SCIPY)
+                    self.assertEqual(segments(*result[:2]), segments(*expected[:2]))
+
+    @requires(scipy)
+    def test_faces_contain_sites(self):
+        for bound_mode in ['BOX', 'CIRCLE']:
+            with self.subTest(bound_mode=bound_mode):
+                verts, _, faces = voronoi_bounded(self.sites, bound_mode=bound_mode, clip=0.5, draw_bounds=True,
+                                                  make_faces=True, ordered_faces=True, max_sides=30, engine=SCIPY)
+                verts = np.array(verts)[:, :2]
+                self.assertEqual(len(faces), len(self.sites))
+                for face, site in zip(faces, self.sites):
+                    self.assertTrue(contains(verts[face], np.array(site[:2])))
+
+    @requires(scipy)
+    def test_faces_area(self):
+        sites = np.array(self.sites)
+        clip = 0.5
+        verts, _, faces = voronoi_bounded(self.sites, bound_mode='BOX', clip=clip, draw_bounds=True,
+                                          make_faces=True, max_sides=30, engine=SCIPY)
+        verts = np.array(verts)[:, :2]
+        size = sites[:, :2].max(axis=0) - sites[:, :2].min(axis=0) + 2 * clip
+        area = sum(polygon_area(verts[face]) for face in faces)
+        self.assertAlmostEqual(area, size[0] * size[1], places=6)
+
+        verts, edges, faces = voronoi_bounded(self.sites, bound_mode='CIRCLE', clip=clip, draw_bounds=True,
+                                              make_faces=True, max_sides=30, engine=SCIPY)
+        verts = np.array(verts)[:, :2]
+        # the circle is approximated by the polygon of bounding vertices
+        center = sites[:, :2].mean(axis=0)
+        radius = np.linalg.norm(sites[:, :2] - center, axis=1).max() + clip
+        rel = verts - center
+        on_circle = np.abs(np.linalg.norm(rel, axis=1) - radius) < 1e-6
+        boundary = verts[on_circle][np.argsort(np.arctan2(rel[on_circle, 1], rel[on_circle, 0]))]
+        area = sum(polygon_area(verts[face]) for face in faces)
+        self.assertAlmostEqual(area, polygon_area(boundary), places=6)
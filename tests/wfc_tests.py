@@ -0,0 +1,71 @@
+import time
+
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok.utils.sv_logging import sv_logger
+from sverchok.utils.wfc_algorithm import WaveFunctionCollapse
+
+
+def sample_image():
+    image = np.zeros((8, 8, 4))
+    image[..., 3] = 1
+    image[2:6, 2:6, 0] = 1
+    image[3:5, :, 1] = 1
+    image[0, :, 2] = 1
+    image[5, 1, :3] = 1
+    return image
+
+
+def python_adjacencies(patterns, size):
+    # the way adjacencies were calculated before they were moved to NumPy
+    adjacencies = [tuple(set() for _ in range(4)) for _ in patterns]
+    for index1, pattern1 in enumerate(patterns):
+        for index2, pattern2 in enumerate(patterns):
+            columns1 = [n for i, n in enumerate(pattern1) if i % size != (size - 1)]
+            columns2 = [n for i, n in enumerate(pattern2) if i % size != 0]
+            if columns1 == columns2:
+                adjacencies[index1][0].add(index2)
+                adjacencies[index2][1].add(index1)
+            if pattern1[:size * size - size] == pattern2[size:]:
+                adjacencies[index1][2].add(index2)
+                adjacencies[index2][3].add(index1)
+    return adjacencies
+
+
+class WaveFunctionCollapseTests(SverchokTestCase):
+    def test_propagator(self):
+        wfc = WaveFunctionCollapse(sample_image(), 3, True, True)
+        expected = python_adjacencies(wfc.patterns, wfc.pattern_size)
+        for pattern_index, directions in enumerate(expected):
+            for direction, allowed in enumerate(directions):
+                with self.subTest(pattern=pattern_index, direction=direction):
+                    result = set(np.flatnonzero(wfc.propagator[direction, pattern_index]).tolist())
+                    self.assertEqual(result, allowed)
+                    mask = wfc.propagator_masks[direction][pattern_index]
+                    self.assertEqual(mask, sum(1 << i for i in allowed))
+
+    def test_solved_wave(self):
+        wfc = WaveFunctionCollapse(sample_image(), 3, True, True)
+        for tiling in [False, True]:
+            with self.subTest(tiling=tiling):
+                wfc.solve((12, 12), seed=1, tiling_output=tiling, max_number_contradiction_tries=10)
+                self.assertTrue(all(wfc.collapsed))
+                pattern_indices = wfc.solved_pattern_indices()
+                for cell, neighbors in enumerate(wfc.cell_neighbors):
+                    for direction, neighbor in enumerate(neighbors):
+                        if neighbor < 0:
+                            continue
+                        self.assertTrue(wfc.propagator[direction, pattern_indices[cell], pattern_indices[neighbor]])
+
+    def test_benchmark(self):
+        wfc = WaveFunctionCollapse(sample_image(), 3, True, True)
+        for size in [30, 60]:
+            start = time.perf_counter()
+            try:
+                wfc.solve((size, size), seed=1, max_number_contradiction_tries=1)
+                solved = True
+            except RuntimeError:
+                solved = False
+            sv_logger.info("WFC %sx%s with %s patterns: %.3fs (solved: %s)",
+                           size, size, wfc.number_of_unique_patterns, time.perf_counter() - start, solved)
@@ -23,6 +23,8 @@ from sverchok.utils import profile
 from sverchok.ui.development import displaying_sverchok_nodes
 from sverchok.utils.context_managers import sv_preferences
 from sverchok.utils.handle_blender_data import BlTrees
+from sverchok.core.output_cache import get_cache
+from sverchok.core.socket_data import node_data_size
 from sverchok.utils.sv_update_utils import SvPrintCommits, SverchokUpdateAddon, SverchokCheckForUpgradesSHA
 
 
@@ -70,6 +72,7 @@ class SV_PT_ActiveTreePanel(SverchokPanels, bpy.types.Panel):
         col.prop(ng, 'sv_scene_update', text="Scene", icon='SCENE_DATA')
         col.prop(ng, 'sv_process', text="Live update", toggle=True)
         col.prop(ng, "sv_draft", text="Draft mode", toggle=True)
+        col.prop(ng, "sv_threads")
 
 
 class SV_PT_TreeTimingsPanel(SverchokPanels, bpy.types.Panel):
@@ -90,6 +93,48 @@ class SV_PT_TreeTimingsPanel(SverchokPanels, bpy.types.Panel):
         row.prop(tree, 'show_time_mode', text="Update time", expand=True)
 
 
+class SV_PT_TreeMemoryPanel(SverchokPanels, bpy.types.Panel):
+    bl_idname = "SV_PT_TreeMemoryPanel"
+    bl_label = "Node memory"
+    bl_parent_id = 'SV_PT_ActiveTreePanel'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw_header(self, context):
+        tree = context.space_data.node_tree
+        row = self.layout.row()
+        row.prop(tree, 'sv_show_memory_nodes', text='')
+
+    def draw(self, context):
+        tree = context.space_data.node_tree
+        col = self.layout.column()
+        col.use_property_split = True
+        col.prop(tree, 'sv_memory_limit', text="Limit, MB")
+        size = sum(node_data_size(n) for n in tree.nodes)
+        col.label(text=f"Used: {size / 2**20:.1f} MB")
+
+
+class SV_PT_TreeOutputCachePanel(SverchokPanels, bpy.types.Panel):
+    bl_idname = "SV_PT_TreeOutputCachePanel"
+    bl_label = "Output cache"
+    bl_parent_id = 'SV_PT_ActiveTreePanel'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw_header(self, context):
+        tree = context.space_data.node_tree
+        row = self.layout.row()
+        row.prop(tree, 'sv_cache_outputs', text='')
+
+    def draw(self, context):
+        tree = context.space_data.node_tree
+        col = self.layout.column()
+        col.use_property_split = True
+        col.active = tree.sv_cache_outputs
+        col.prop(tree, 'sv_cache_size', text="Size, MB")
+        cache = get_cache(tree)
+        if cache is not None:
+            col.label(text=f"Used: {cache.size / 2**20:.1f} MB")
+
+
 class SV_PT_ExtrTreeUserInterfaceOptions(SverchokPanels, bpy.types.Panel):
     bl_idname = "SV_PT_ExtrTreeUserInterfaceOptions"
     bl_label = "Tree UI options"
@@ -334,6 +379,8 @@ sv_tools_classes = [
     SV_PT_ToolsMenu,
     SV_PT_ActiveTreePanel,
     SV_PT_TreeTimingsPanel,
+    SV_PT_TreeMemoryPanel,
+    SV_PT_TreeOutputCachePanel,
     SV_PT_ExtrTreeUserInterfaceOptions,
     SV_PT_ProfilingPanel,
     SV_PT_SverchokUtilsPanel,
@@ -28,3 +28,29 @@ def bvh_tree_from_polygons(vertices, polygons, all_triangles=False, epsilon=0.0,
     if isinstance(polygons, np.ndarray):
         polygons = polygons.tolist()
     return BVHTree.FromPolygons(vertices, polygons, all_triangles=all_triangles, epsilon=epsilon)
+
+def bvh_find_nearest_array(bvh, points):
+    """
+    Find nearest points on the BVH tree for an array of points.
+    It still calls bvh.find_nearest once for each point, but avoids
+    np.vectorize and mathutils arithmetic around the calls.
+
+    Args:
+        bvh: BVHTree.
+        points: np.array of shape (n, 3).
+
+    Returns:
+        a tuple (nearest, normals, idxs, distances) of np.arrays of shapes
+        (n, 3), (n, 3), (n,) and (n,).
+    """
+    find_nearest = bvh.find_nearest
+    points = np.asarray(points).reshape((-1, 3)).tolist()
+    found = [find_nearest(point) for point in points]
+    for point, (nearest, _, _, _) in zip(points, found):
+        if nearest is None:
+            raise Exception("No nearest point on mesh found for vertex %s" % point)
+    nearest = np.array([f[0].to_tuple() for f in found]).reshape((-1, 3))
+    normals = np.array([f[1].to_tuple() for f in found]).reshape((-1, 3))
+    idxs = np.array([f[2] for f in found], dtype=np.int64)
+    distances = np.array([f[3] for f in found])
+    return nearest, normals, idxs, distances
@@ -0,0 +1,420 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Array-backed implementation of CSG booleans. It uses the same BSP tree
+algorithm as utils/csg_core.py (by Evan Wallace), but polygons are stored as
+arrays of vertex indexes, all polygons of a BSP node are classified against
+a plane at once, and the tree is built and walked without recursion.
+"""
+
+import numpy as np
+
+EPSILON = 1e-5
+
+COPLANAR = 0
+FRONT = 1
+BACK = 2
+SPANNING = 3
+
+
+def _dot(a, b):
+    # the same order of operations as CSGVector.dot, so that the result
+    # is exactly the same as of csg_core
+    return a[..., 0] * b[..., 0] + a[..., 1] * b[..., 1] + a[..., 2] * b[..., 2]
+
+
+def _planes_from_points(a, b, c):
+    """Planes of polygons by their first three points, as CSGPlane.fromPoints.
+    Returns normals, distances and mask of non degenerated planes."""
+    ba = b - a
+    ca = c - a
+    normals = np.stack([ba[:, 1] * ca[:, 2] - ba[:, 2] * ca[:, 1],
+                        ba[:, 2] * ca[:, 0] - ba[:, 0] * ca[:, 2],
+                        ba[:, 0] * ca[:, 1] - ba[:, 1] * ca[:, 0]], axis=1)
+    lengths = np.sqrt(_dot(normals, normals))
+    valid = lengths > 0
+    normals[valid] /= lengths[valid][:, np.newaxis]
+    ws = _dot(normals, a)
+    return normals, ws, valid
+
+
+class _Points(object):
+    """Growable array of vertex positions"""
+    def __init__(self, points):
+        points = np.asarray(points, dtype=np.float64).reshape((-1, 3))
+        self.count = len(points)
+        self.data = np.empty((max(2 * self.count, 64), 3))
+        self.data[:self.count] = points
+
+    @property
+    def array(self):
+        return self.data[:self.count]
+
+    def add(self, points):
+        n = len(points)
+        if self.count + n > len(self.data):
+            data = np.empty((max(2 * len(self.data), self.count + n), 3))
+            data[:self.count] = self.array
+            self.data = data
+        self.data[self.count:self.count + n] = points
+        idxs = np.arange(self.count, self.count + n)
+        self.count += n
+        return idxs
+
+
+class _Polygons(object):
+    """
+    Convex polygons with their planes. Vertex indexes of all polygons are
+    stored in one array, `starts` keeps where each polygon begins. Each
+    polygon has an integer tag, which is kept by its fragments.
+    Instances are not changed after creation.
+    """
+    def __init__(self, loops, starts, normals, ws, tags):
+        self.loops = loops
+        self.starts = starts
+        self.normals = normals
+        self.ws = ws
+        self.tags = tags
+
+    @staticmethod
+    def empty():
+        return _Polygons(np.zeros((0,), dtype=np.int64), np.zeros((1,), dtype=np.int64),
+                         np.zeros((0, 3)), np.zeros((0,)), np.zeros((0,), dtype=np.int64))
+
+    @staticmethod
+    def from_faces(points, faces):
+        faces = [face for face in faces if len(face) >= 3]
+        if not faces:
+            return _Polygons.empty()
+        sizes = np.array([len(face) for face in faces], dtype=np.int64)
+        loops = np.concatenate([np.asarray(face, dtype=np.int64) for face in faces])
+        starts = np.concatenate([[0], np.cumsum(sizes)])
+        tags = np.zeros((len(faces),), dtype=np.int64)
+        return _Polygons.with_planes(points, loops, starts, tags)[0]
+
+    @staticmethod
+    def with_planes(points, loops, starts, tags):
+        """Polygons with planes calculated by their first vertexes and
+        indexes of the polygons which are kept. Polygons with degenerated
+        planes are skipped."""
+        firsts = starts[:-1]
+        normals, ws, valid = _planes_from_points(points[loops[firsts]],
+                                                 points[loops[firsts + 1]],
+                                                 points[loops[firsts + 2]])
+        polygons = _Polygons(loops, starts, normals, ws, tags)
+        valid = np.flatnonzero(valid)
+        if len(valid) < len(polygons):
+            polygons = polygons.take(valid)
+        return polygons, valid
+
+    @staticmethod
+    def concatenate(polygons_list):
+        polygons_list = [p for p in polygons_list if len(p)]
+        if not polygons_list:
+            return _Polygons.empty()
+        if len(polygons_list) == 1:
+            return polygons_list[0]
+        offsets = np.cumsum([0] + [len(p.loops) for p in polygons_list[:-1]])
+        starts = np.concatenate([[0]] + [p.starts[1:] + offset for p, offset in zip(polygons_list, offsets)])
+        return _Polygons(np.concatenate([p.loops for p in polygons_list]),
+                         starts,
+                         np.concatenate([p.normals for p in polygons_list]),
+                         np.concatenate([p.ws for p in polygons_list]),
+                         np.concatenate([p.tags for p in polygons_list]))
+
+    def __len__(self):
+        return len(self.ws)
+
+    @property
+    def sizes(self):
+        return self.starts[1:] - self.starts[:-1]
+
+    def loop_polygons(self):
+        """Index of polygon for each item of loops"""
+        return np.repeat(np.arange(len(self)), self.sizes)
+
+    def next_loops(self):
+        """Index of next vertex of the same polygon for each item of loops"""
+        polys = self.loop_polygons()
+        idxs = np.arange(1, len(self.loops) + 1)
+        last = idxs == self.starts[polys + 1]
+        idxs[last] = self.starts[polys[last]]
+        return idxs
+
+    def take_loops(self, idxs):
+        """Starts of selected polygons and positions of their vertexes in loops"""
+        sizes = self.sizes[idxs]
+        starts = np.concatenate([[0], np.cumsum(sizes)])
+        loop_idxs = np.arange(starts[-1]) - np.repeat(starts[:-1] - self.starts[idxs], sizes)
+        return starts, loop_idxs
+
+    def take(self, idxs):
+        starts, loop_idxs = self.take_loops(idxs)
+        return _Polygons(self.loops[loop_idxs], starts, self.normals[idxs], self.ws[idxs], self.tags[idxs])
+
+    def with_tag(self, tag):
+        return _Polygons(self.loops, self.starts, self.normals, self.ws, np.full(len(self), tag))
+
+    def flipped(self):
+        """Polygons with reversed order of vertexes and flipped planes"""
+        polys = self.loop_polygons()
+        idxs = self.starts[polys] + self.starts[polys + 1] - 1 - np.arange(len(self.loops))
+        return _Polygons(self.loops[idxs], self.starts, -self.normals, -self.ws, self.tags)
+
+
+def _merge(polygons, idxs, fragments, fragment_idxs):
+    """Polygons selected by idxs together with fragments of split polygons,
+    in order of polygons which they originate from."""
+    if not len(fragments):
+        return polygons.take(idxs)
+    merged = _Polygons.concatenate([polygons.take(idxs), fragments])
+    order = np.argsort(np.concatenate([idxs, fragment_idxs]), kind='stable')
+    return merged.take(order)
+
+
+def _split_spanning(points, normal, w, polygons, idxs, types):
+    """Splits polygons by the plane into front and back fragments, see
+    CSGPlane.splitPolygon. Returns fragments and indexes of polygons they
+    originate from, for both sides."""
+    spanning = polygons.take(idxs)
+    types = types[polygons.take_loops(idxs)[1]]
+    loops = spanning.loops
+    next_loops = spanning.next_loops()
+    crossing = (types | types[next_loops]) == SPANNING
+
+    pi = points.array[loops[crossing]]
+    pj = points.array[loops[next_loops][crossing]]
+    ts = (w - _dot(pi, normal)) / _dot(pj - pi, normal)
+    new_idxs = np.full(len(loops), -1, dtype=np.int64)
+    new_idxs[crossing] = points.add(pi + (pj - pi) * ts[:, np.newaxis])
+
+    # each vertex of a polygon is followed by the new vertex if its edge is split
+    items = np.stack([loops, new_idxs], axis=1)
+    items_polys = np.repeat(spanning.loop_polygons(), 2).reshape((-1, 2))
+    results = []
+    for keep in [types != BACK, types != FRONT]:
+        keep = np.stack([keep, crossing], axis=1)
+        sizes = np.bincount(items_polys[keep], minlength=len(spanning))
+        fragments = _Polygons(items[keep], np.concatenate([[0], np.cumsum(sizes)]),
+                              spanning.normals, spanning.ws, spanning.tags)
+        # fragments with less than 3 vertexes are dropped
+        good = np.flatnonzero(sizes >= 3)
+        fragments = fragments.take(good)
+        fragments, valid = _Polygons.with_planes(points.array, fragments.loops, fragments.starts, fragments.tags)
+        results.append((fragments, idxs[good[valid]]))
+    return results
+
+
+def _select(polygons, mask):
+    if mask.all():
+        return polygons
+    if not mask.any():
+        return _Polygons.empty()
+    return polygons.take(np.flatnonzero(mask))
+
+
+def _split(points, normal, w, polygons, coplanar_to_sides):
+    """
+    Classifies polygons by the plane, splitting spanning ones.
+    If coplanar_to_sides is True, coplanar polygons are put to front or back
+    depending on their orientation and (front, back) is returned, otherwise
+    (coplanar, front, back) is returned.
+    """
+    dists = _dot(points.array[polygons.loops], normal) - w
+    types = np.where(dists < -EPSILON, BACK, np.where(dists > EPSILON, FRONT, COPLANAR)).astype(np.int8)
+    poly_types = np.bitwise_or.reduceat(types, polygons.starts[:-1])
+
+    front_mask = poly_types == FRONT
+    back_mask = poly_types == BACK
+    coplanar_mask = poly_types == COPLANAR
+    if coplanar_to_sides and coplanar_mask.any():
+        facing = _dot(polygons.normals, normal) > 0
+        front_mask |= coplanar_mask & facing
+        back_mask |= coplanar_mask & ~facing
+
+    spanning_idxs = np.flatnonzero(poly_types == SPANNING)
+    if len(spanning_idxs):
+        (front_fragments, front_origins), (back_fragments, back_origins) = \
+            _split_spanning(points, normal, w, polygons, spanning_idxs, types)
+        front = _merge(polygons, np.flatnonzero(front_mask), front_fragments, front_origins)
+        back = _merge(polygons, np.flatnonzero(back_mask), back_fragments, back_origins)
+    else:
+        front = _select(polygons, front_mask)
+        back = _select(polygons, back_mask)
+
+    if coplanar_to_sides:
+        return front, back
+    return _select(polygons, coplanar_mask), front, back
+
+
+class _BSPTree(object):
+    """
+    BSP tree of polygons, see CSGNode. Nodes are referred by their indexes
+    in lists of node properties, -1 means there is no node. The root node
+    is always 0, it has no plane while the tree is empty. Polygons of all
+    nodes are stored together, their tags are indexes of their nodes, so
+    that the polygons of the whole tree can be clipped or flipped at once.
+    """
+    def __init__(self, points, polygons=None):
+        self.points = points
+        self.normals = [None]
+        self.ws = [None]
+        self.fronts = [-1]
+        self.backs = [-1]
+        self.polygons = _Polygons.empty()
+        if polygons is not None:
+            self.build(polygons)
+
+    def _new_node(self):
+        self.normals.append(None)
+        self.ws.append(None)
+        self.fronts.append(-1)
+        self.backs.append(-1)
+        return len(self.ws) - 1
+
+    def build(self, polygons):
+        node_polygons = [self.polygons]
+        stack = [(0, polygons)]
+        while stack:
+            node, polygons = stack.pop()
+            if not len(polygons):
+                continue
+            if self.normals[node] is None:
+                self.normals[node] = polygons.normals[0].copy()
+                self.ws[node] = polygons.ws[0]
+            coplanar, front, back = _split(self.points, self.normals[node], self.ws[node], polygons, False)
+            node_polygons.append(coplanar.with_tag(node))
+            if len(front):
+                if self.fronts[node] < 0:
+                    self.fronts[node] = self._new_node()
+                stack.append((self.fronts[node], front))
+            if len(back):
+                if self.backs[node] < 0:
+                    self.backs[node] = self._new_node()
+                stack.append((self.backs[node], back))
+        self.polygons = _Polygons.concatenate(node_polygons)
+
+    def invert(self):
+        """Convert solid space to empty space and empty space to solid space."""
+        self.polygons = self.polygons.flipped()
+        self.normals = [None if n is None else -n for n in self.normals]
+        self.ws = [None if w is None else -w for w in self.ws]
+        self.fronts, self.backs = self.backs, self.fronts
+
+    def clip_polygons(self, polygons):
+        """Remove all polygons that are inside this BSP tree."""
+        if self.normals[0] is None:
+            return polygons
+        results = []
+        stack = [(0, polygons)]
+        while stack:
+            node, polygons = stack.pop()
+            if not len(polygons):
+                continue
+            front, back = _split(self.points, self.normals[node], self.ws[node], polygons, True)
+            # back is pushed first so that results are in the same order as of CSGNode
+            if self.backs[node] >= 0:
+                stack.append((self.backs[node], back))
+            if self.fronts[node] >= 0:
+                stack.append((self.fronts[node], front))
+            else:
+                results.append(front)
+        return _Polygons.concatenate(results)
+
+    def clip_to(self, tree):
+        """Remove all polygons in this BSP tree that are inside the other tree."""
+        self.polygons = tree.clip_polygons(self.polygons)
+
+    def all_polygons(self):
+        """Polygons of nodes in the same order as CSGNode.allPolygons gives"""
+        ranks = np.empty((len(self.ws),), dtype=np.int64)
+        rank = 0
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            ranks[node] = rank
+            rank += 1
+            if self.backs[node] >= 0:
+                stack.append(self.backs[node])
+            if self.fronts[node] >= 0:
+                stack.append(self.fronts[node])
+        return self.polygons.take(np.argsort(ranks[self.polygons.tags], kind='stable'))
+
+
+class NpCSG(object):
+    """
+    Solid represented by its boundary polygons, with the same booleans API
+    as utils.csg_core.CSG.
+    """
+    def __init__(self, points, polygons):
+        self.points = points
+        self.polygons = polygons
+
+    @classmethod
+    def Obj_from_pydata(cls, verts, faces):
+        points = np.asarray(verts, dtype=np.float64).reshape((-1, 3))
+        return NpCSG(points, _Polygons.from_faces(points, faces))
+
+    def to_pydata(self):
+        """Vertices and faces of the solid. Vertices with the same position
+        are merged."""
+        polygons = self.polygons
+        if not len(polygons):
+            return [], []
+        # adding zero turns -0.0 into 0.0
+        positions = self.points[polygons.loops] + 0.0
+        _, firsts, inverse = np.unique(positions, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        # number vertices in order of their appearance in polygons
+        order = np.argsort(firsts)
+        new_idxs = np.empty_like(order)
+        new_idxs[order] = np.arange(len(order))
+        loops = new_idxs[inverse].tolist()
+        starts = polygons.starts.tolist()
+        faces = [loops[start:end] for start, end in zip(starts[:-1], starts[1:])]
+        return positions[np.sort(firsts)].tolist(), faces
+
+    def _trees(self, csg):
+        points = _Points(np.concatenate([self.points, csg.points]))
+        offset = len(self.points)
+        other = csg.polygons
+        other = _Polygons(other.loops + offset, other.starts, other.normals, other.ws, other.tags)
+        return points, _BSPTree(points, self.polygons), _BSPTree(points, other)
+
+    def union(self, csg):
+        points, a, b = self._trees(csg)
+        a.clip_to(b)
+        b.clip_to(a)
+        b.invert()
+        b.clip_to(a)
+        b.invert()
+        a.build(b.all_polygons())
+        return NpCSG(points.array, a.all_polygons())
+
+    def subtract(self, csg):
+        points, a, b = self._trees(csg)
+        a.invert()
+        a.clip_to(b)
+        b.clip_to(a)
+        b.invert()
+        b.clip_to(a)
+        b.invert()
+        a.build(b.all_polygons())
+        a.invert()
+        return NpCSG(points.array, a.all_polygons())
+
+    def intersect(self, csg):
+        points, a, b = self._trees(csg)
+        a.invert()
+        b.clip_to(a)
+        b.invert()
+        a.clip_to(b)
+        b.clip_to(a)
+        a.build(b.all_polygons())
+        a.invert()
+        return NpCSG(points.array, a.all_polygons())
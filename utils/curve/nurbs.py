@@ -1153,31 +1153,40 @@ class SvNativeNurbsCurve(SvNurbsCurve):
         else:
             return numerator / denominator
 
-    def fraction(self, deriv_order, ts):
-        n = len(ts)
+    def fractions(self, max_order, ts):
+        """
+        Calculate numerator and denominator of NURBS curve formula, together
+        with their derivatives up to max_order, at given parameter values.
+        Only p+1 nonzero basis functions are evaluated for each parameter.
+
+        Returns:
+            list of (numerator, denominator) tuples, one for each derivative
+            order from 0 to max_order; numerator has shape (n, 3), denominator
+            has shape (n, 1).
+        """
         p = self.degree
         k = len(self.control_points)
-        ns = np.array([self.basis.derivative(i, p, deriv_order)(ts) for i in range(k)]) # (k, n)
-        coeffs = ns * self.weights[np.newaxis].T # (k, n)
-        coeffs_t = coeffs[np.newaxis].T # (n, k, 1)
-        numerator = (coeffs_t * self.control_points) # (n, k, 3)
-        numerator = numerator.sum(axis=1) # (n, 3)
-        denominator = coeffs.sum(axis=0) # (n,)
+        spans, inside, ders = self.basis.nonzero_derivatives(p, ts, max_order) # ders: (max_order+1, n, p+1)
+        idxs = spans[np.newaxis].T - p + np.arange(p+1) # (n, p+1)
+        valid = (idxs >= 0) & (idxs < k)
+        idxs = np.clip(idxs, 0, k-1)
+        weights = np.where(valid, self.weights[idxs], 0.0) # (n, p+1)
+        control_points = self.control_points[idxs] # (n, p+1, 3)
 
-        return numerator, denominator[np.newaxis].T
+        result = []
+        for ns in ders:
+            coeffs = ns * weights # (n, p+1)
+            numerator = np.einsum('ij,ijk->ik', coeffs, control_points) # (n, 3)
+            denominator = coeffs.sum(axis=1) # (n,)
+            result.append((numerator, denominator[np.newaxis].T))
+        return result
 
-    def fraction_single(self, deriv_order, t):
-        p = self.degree
-        k = len(self.control_points)
-        ts = np.array([t])
-        ns = np.array([self.basis.derivative(i, p, deriv_order)(ts)[0] for i in range(k)]) # (k,)
-        coeffs = ns * self.weights # (k, )
-        coeffs_t = coeffs[np.newaxis].T
-        numerator = (coeffs_t * self.control_points) # (k, 3)
-        numerator = numerator.sum(axis=0) # (3,)
-        denominator = coeffs.sum(axis=0) # ()
+    def fraction(self, deriv_order, ts):
+        return self.fractions(deriv_order, ts)[deriv_order]
 
-        return numerator, denominator
+    def fraction_single(self, deriv_order, t):
+        numerator, denominator = self.fraction(deriv_order, np.array([t]))
+        return numerator[0], denominator[0,0]
 
     def evaluate_array(self, ts):
         if self.is_bezier() and not self.is_rational():
@@ -1196,6 +1205,18 @@ class SvNativeNurbsCurve(SvNurbsCurve):
         return self.tangent_array(np.array([t]))[0]
 
     def tangent_array(self, ts, tangent_delta=None):
+        return self.derivatives_array(1, ts)[0]
+
+    def second_derivative(self, t, tangent_delta=None):
+        return self.second_derivative_array(np.array([t]))[0]
+
+    def second_derivative_array(self, ts, tangent_delta=None):
+        return self.derivatives_array(2, ts)[1]
+
+    def third_derivative_array(self, ts, tangent_delta=None):
+        return self.derivatives_array(3, ts)[2]
+
+    def derivatives_array(self, n, ts, tangent_delta=None):
         # curve = numerator / denominator
         # ergo:
         # numerator = curve * denominator
@@ -1203,54 +1224,27 @@ class SvNativeNurbsCurve(SvNurbsCurve):
         # numerator' = curve' * denominator + curve * denominator'
         # ergo:
         # curve' = (numerator' - curve*denominator') / denominator
-        numerator, denominator = self.fraction(0, ts)
-        curve = numerator / denominator
-        numerator1, denominator1 = self.fraction(1, ts)
-        curve1 = (numerator1 - curve*denominator1) / denominator
-        return curve1
-
-    def second_derivative(self, t, tangent_delta=None):
-        return self.second_derivative_array(np.array([t]))[0]
-
-    def second_derivative_array(self, ts, tangent_delta=None):
+        #
         # numerator'' = (curve * denominator)'' =
         #  = curve'' * denominator + 2 * curve' * denominator' + curve * denominator''
-        numerator, denominator = self.fraction(0, ts)
-        curve = numerator / denominator
-        numerator1, denominator1 = self.fraction(1, ts)
-        curve1 = (numerator1 - curve*denominator1) / denominator
-        numerator2, denominator2 = self.fraction(2, ts)
-        curve2 = (numerator2 - 2*curve1*denominator1 - curve*denominator2) / denominator
-        return curve2
-
-    def third_derivative_array(self, ts, tangent_delta=None):
+        #
         # numerator''' = (curve * denominator)''' = 
         #  = curve''' * denominator + 3 * curve'' * denominator' + 3 * curve' * denominator'' + denominator'''
-        numerator, denominator = self.fraction(0, ts)
+        result = []
+        if n < 1:
+            return result
+        fractions = self.fractions(min(n, 3), ts)
+        numerator, denominator = fractions[0]
         curve = numerator / denominator
-        numerator1, denominator1 = self.fraction(1, ts)
+        numerator1, denominator1 = fractions[1]
         curve1 = (numerator1 - curve*denominator1) / denominator
-        numerator2, denominator2 = self.fraction(2, ts)
-        curve2 = (numerator2 - 2*curve1*denominator1 - curve*denominator2) / denominator
-        numerator3, denominator3 = self.fraction(3, ts)
-
-        curve3 = (numerator3 - 3*curve2*denominator1 - 3*curve1*denominator2 - curve*denominator3) / denominator
-        return curve3
-
-    def derivatives_array(self, n, ts, tangent_delta=None):
-        result = []
-        if n >= 1:
-            numerator, denominator = self.fraction(0, ts)
-            curve = numerator / denominator
-            numerator1, denominator1 = self.fraction(1, ts)
-            curve1 = (numerator1 - curve*denominator1) / denominator
-            result.append(curve1)
+        result.append(curve1)
         if n >= 2:
-            numerator2, denominator2 = self.fraction(2, ts)
+            numerator2, denominator2 = fractions[2]
             curve2 = (numerator2 - 2*curve1*denominator1 - curve*denominator2) / denominator
             result.append(curve2)
         if n >= 3:
-            numerator3, denominator3 = self.fraction(3, ts)
+            numerator3, denominator3 = fractions[3]
             curve3 = (numerator3 - 3*curve2*denominator1 - 3*curve1*denominator2 - curve*denominator3) / denominator
             result.append(curve3)
         return result
@@ -9,33 +9,11 @@ import random
 import numpy as np
 
 from sverchok.utils.sv_logging import sv_logger
-from sverchok.utils.kdtree import SvKdTree
+from sverchok.utils.spatial_hash import SvSpatialHash
 
 BATCH_SIZE = 50
 MAX_ITERATIONS = 1000
 
-def _check_min_distance(v_new, vs_old, min_r):
-    if not vs_old:
-        return True
-    kdt = SvKdTree.new(SvKdTree.BLENDER, vs_old)
-    nearest, idx, dist = kdt.query(v_new)
-    if dist is None:
-        return True
-    ok = (dist >= min_r)
-    #if not ok:
-    #    print(f"V {v_new} => {nearest}, {dist} >= {min_r}")
-    return ok
-
-def _check_min_radius(point, old_points, old_radiuses, min_r):
-    if not old_points:
-        return True
-    old_points = np.array(old_points)
-    old_radiuses = np.array(old_radiuses)
-    point = np.array(point)
-    distances = np.linalg.norm(old_points - point, axis=1)
-    ok = (old_radiuses + min_r < distances).all()
-    return ok
-
 def field_random_probe(field, bbox, count,
         threshold=0, proportional=False, field_min=None, field_max=None,
         min_r=0, min_r_field=None,
@@ -79,6 +57,8 @@ def field_random_probe(field, bbox, count,
     generated_verts = []
     generated_radiuses = []
     iterations = 0
+    # index of generated points, to check distances from candidates
+    index = None
     while done < count:
         iterations += 1
         if iterations > MAX_ITERATIONS:
@@ -126,17 +106,25 @@ def field_random_probe(field, bbox, count,
             ys = np.array([p[1] for p in candidates])
             zs = np.array([p[2] for p in candidates])
             min_rs = min_r_field.evaluate_grid(xs, ys, zs).tolist()
+            if index is None:
+                index = SvSpatialHash.for_spheres([], [], 2*max(min_rs, default=0))
+            batch_index = SvSpatialHash(index.cell_size)
             good_verts = []
             for candidate, min_r in zip(candidates, min_rs):
                 if random_radius:
                     min_r = random.uniform(0, min_r)
-                if _check_min_radius(candidate, generated_verts + good_verts, generated_radiuses + good_radiuses, min_r):
+                if index.is_free(candidate, min_r) and batch_index.is_free(candidate, min_r):
+                    batch_index.add(candidate, min_r)
                     good_verts.append(candidate)
                     good_radiuses.append(min_r)
         else: # min_r != 0
+            if index is None:
+                index = SvSpatialHash(min_r)
+            batch_index = SvSpatialHash(min_r)
             good_verts = []
             for candidate in candidates:
-                if _check_min_distance(candidate, generated_verts + good_verts, min_r):
+                if index.is_free(candidate, min_r) and batch_index.is_free(candidate, min_r):
+                    batch_index.add(candidate)
                     good_verts.append(candidate)
             good_radiuses = [1 for c in good_verts]
 
@@ -145,6 +133,11 @@ def field_random_probe(field, bbox, count,
             good_verts = [p[0] for p in pairs]
             good_radiuses = [p[1] for p in pairs]
 
+        if index is not None:
+            # in min_r mode returned radiuses are not radiuses of spheres
+            radiuses = good_radiuses if min_r_field is not None else [0 for v in good_verts]
+            for vert, radius in zip(good_verts, radiuses):
+                index.add(vert, radius)
         generated_verts.extend(good_verts)
         generated_radiuses.extend(good_radiuses)
         done += len(good_verts)
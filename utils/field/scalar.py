@@ -15,6 +15,7 @@ from mathutils import bvhtree
 from sverchok.utils.math import from_cylindrical, from_spherical, to_cylindrical, to_spherical, np_dot
 from sverchok.utils.geom import LineEquation, CircleEquation3D
 from sverchok.utils.kdtree import SvKdTree
+from sverchok.utils.bvh_tree import bvh_find_nearest_array
 
 ##################
 #                #
@@ -496,19 +497,10 @@ class SvBvhAttractorScalarField(SvScalarField):
             return self.falloff(np.array([value]))[0]
 
     def evaluate_grid(self, xs, ys, zs):
-        def find(v):
-            nearest, normal, idx, distance = self.bvh.find_nearest(v)
-            if nearest is None:
-                raise Exception("No nearest point on mesh found for vertex %s" % v)
-            if self.signed:
-                sign = (v - nearest).dot(normal)
-                sign = copysign(1, sign)
-            else:
-                sign = 1
-            return sign * distance
-
         points = np.stack((xs, ys, zs)).T
-        norms = np.vectorize(find, signature='(3)->()')(points)
+        nearest, normals, idxs, norms = bvh_find_nearest_array(self.bvh, points)
+        if self.signed:
+            norms = np.copysign(1, np_dot(points - nearest, normals)) * norms
         if self.falloff is not None:
             result = self.falloff(norms)
             return result
@@ -536,12 +528,8 @@ class SvBvhEdgesAttractorScalarField(SvScalarField):
             return self.falloff(np.array([distance]))[0]
 
     def evaluate_grid(self, xs, ys, zs):
-        def find(v):
-            nearest, normal, idx, distance = self.bvh.find_nearest(v)
-            return distance
-
         points = np.stack((xs, ys, zs)).T
-        norms = np.vectorize(find, signature='(3)->()')(points)
+        _, _, _, norms = bvh_find_nearest_array(self.bvh, points)
         if self.falloff is not None:
             result = self.falloff(norms)
             return result
@@ -16,6 +16,7 @@ from sverchok.utils.curve import SvCurveLengthSolver, SvNormalTrack, MathutilsRo
 from sverchok.utils.geom import LineEquation, CircleEquation3D
 from sverchok.utils.math import from_cylindrical, from_spherical, np_dot
 from sverchok.utils.kdtree import SvKdTree
+from sverchok.utils.bvh_tree import bvh_find_nearest_array
 from sverchok.utils.field.voronoi import SvVoronoiFieldData
 
 ##################
@@ -598,7 +599,7 @@ class SvBvhAttractorVectorField(SvVectorField):
         nearest, normal, idx, distance = self.bvh.find_nearest(vertex)
         if self.use_normal:
             if self.signed_normal:
-                sign = (v - nearest).dot(normal)
+                sign = (vertex - nearest).dot(normal)
                 sign = copysign(1, sign)
             else:
                 sign = 1
@@ -614,22 +615,16 @@ class SvBvhAttractorVectorField(SvVectorField):
                 return dv
 
     def evaluate_grid(self, xs, ys, zs):
-        def find(v):
-            nearest, normal, idx, distance = self.bvh.find_nearest(v)
-            if nearest is None:
-                raise Exception("No nearest point on mesh found for vertex %s" % v)
-            if self.use_normal:
-                if self.signed_normal:
-                    sign = (v - nearest).dot(normal)
-                    sign = copysign(1, sign)
-                else:
-                    sign = 1
-                return sign * np.array(normal)
-            else:
-                return np.array(nearest) - v
-
         points = np.stack((xs, ys, zs)).T
-        vectors = np.vectorize(find, signature='(3)->(3)')(points)
+        nearest, normals, idxs, distances = bvh_find_nearest_array(self.bvh, points)
+        if self.use_normal:
+            if self.signed_normal:
+                signs = np.copysign(1, np_dot(points - nearest, normals))
+                vectors = signs[:, np.newaxis] * normals
+            else:
+                vectors = normals
+        else:
+            vectors = nearest - points
         if self.falloff is not None:
             norms = np.linalg.norm(vectors, axis=1, keepdims=True)
             nonzero = (norms > 0)[:,0]
@@ -0,0 +1,238 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+import os
+import json
+import shutil
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import numpy as np
+from mathutils import Matrix, Vector, Quaternion
+
+from sverchok.core.socket_data import estimate_size
+from sverchok.utils.sv_logging import sv_logger
+
+# single worker is enough, loading of frames is limited by disk anyway
+_preload_executor = None
+
+
+def _get_executor():
+    global _preload_executor
+    if _preload_executor is None:
+        _preload_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sv_frame_cache')
+    return _preload_executor
+
+
+def _encode(data, arrays):
+    """Converts nested data into a JSON compatible structure. NumPy arrays
+    are appended to the `arrays` list and replaced by their indices."""
+    if data is None or isinstance(data, (bool, int, float, str)):
+        return data
+    if isinstance(data, list):
+        return [_encode(item, arrays) for item in data]
+    if isinstance(data, tuple):
+        return {'tuple': [_encode(item, arrays) for item in data]}
+    if isinstance(data, dict):
+        return {'dict': [[_encode(key, arrays), _encode(value, arrays)] for key, value in data.items()]}
+    if isinstance(data, (np.ndarray, np.generic)):
+        if data.dtype.hasobject:
+            raise TypeError("NumPy arrays of objects can't be written to disk")
+        arrays.append(np.asarray(data))
+        key = 'array' if isinstance(data, np.ndarray) else 'scalar'
+        return {key: len(arrays) - 1}
+    if isinstance(data, Matrix):
+        return {'matrix': [list(row) for row in data]}
+    if isinstance(data, Vector):
+        return {'vector': list(data)}
+    if isinstance(data, Quaternion):
+        return {'quaternion': list(data)}
+    raise TypeError(f"Objects of {type(data).__name__} type can't be written to disk")
+
+
+def _decode(data, arrays):
+    if isinstance(data, list):
+        return [_decode(item, arrays) for item in data]
+    if not isinstance(data, dict):
+        return data
+    (key, value), = data.items()
+    if key == 'tuple':
+        return tuple(_decode(item, arrays) for item in value)
+    if key == 'dict':
+        return {_decode(k, arrays): _decode(v, arrays) for k, v in value}
+    if key == 'array':
+        return arrays[f"array_{value}"]
+    if key == 'scalar':
+        return arrays[f"array_{value}"][()]
+    if key == 'matrix':
+        return Matrix(value)
+    if key == 'vector':
+        return Vector(value)
+    if key == 'quaternion':
+        return Quaternion(value)
+    raise ValueError(f"Unknown type of stored data: {key}")
+
+
+class SvFrameCache(object):
+    """
+    Storage of data per animation frame with limited memory consumption.
+
+    Frames are kept in memory in least recently used order. When total size
+    of stored frames exceeds the memory limit, least recently used frames
+    are either dropped or, if a directory is given, written to compressed
+    .npz files, from which they are read back on request. Frames which are
+    too far from the current one can be dropped with `keep_window`.
+    """
+    def __init__(self, max_size=0, directory=None):
+        """
+        Args:
+            max_size: maximum size of frames kept in memory in bytes,
+                0 means no limit.
+            directory: where to write frames which do not fit into memory,
+                None means such frames are forgotten.
+        """
+        self.max_size = max_size
+        self.directory = directory
+        self.frames = OrderedDict()  # frame -> data
+        self.sizes = dict()  # frame -> size of data in bytes
+        self.spilled = set()  # frames written to disk
+        self.loading = dict()  # frame -> future of data
+        self.size = 0
+
+    def __contains__(self, frame):
+        return frame in self.frames or frame in self.spilled
+
+    def __len__(self):
+        return len(self.frames) + len(self.spilled)
+
+    def set(self, frame, data):
+        self._discard(frame)
+        self.frames[frame] = data
+        self.sizes[frame] = estimate_size(data)
+        self.size += self.sizes[frame]
+        self._shrink(keep=frame)
+
+    def get(self, frame, default=None):
+        if frame in self.frames:
+            self.frames.move_to_end(frame)
+            return self.frames[frame]
+        if frame in self.spilled:
+            data = self._load(frame)
+            if data is not None:
+                self.set(frame, data)
+                return data
+        return default
+
+    def preload(self, frames):
+        """Starts reading of given frames from disk in a background thread
+        so that next `get` calls would not wait for the disk."""
+        for frame in frames:
+            if frame in self.spilled and frame not in self.loading:
+                self.loading[frame] = _get_executor().submit(self._read, self._path(frame))
+
+    def keep_window(self, start, end):
+        """Forgets all frames outside of the [start, end] range"""
+        for frame in [f for f in self.frames if not start <= f <= end]:
+            self._discard(frame)
+        for frame in [f for f in self.spilled if not start <= f <= end]:
+            self._discard(frame)
+
+    def clear(self):
+        for frame in list(self.frames) + list(self.spilled):
+            self._discard(frame)
+
+    def move_to(self, directory):
+        """Changes the directory for frames which do not fit into memory.
+        Frames already written to disk are moved to the new directory,
+        or forgotten if the new directory is None."""
+        if directory == self.directory:
+            return
+        if directory is None or self.directory is None:
+            for frame in list(self.spilled):
+                self._discard(frame)
+            self.directory = directory
+            return
+
+        # files should not be read while they are moved
+        for future in self.loading.values():
+            future.cancel()
+        wait(list(self.loading.values()))
+        self.loading.clear()
+
+        old_directory = self.directory
+        for frame in list(self.spilled):
+            old_path = self._path(frame)
+            try:
+                os.makedirs(directory, exist_ok=True)
+                shutil.move(old_path, os.path.join(directory, os.path.basename(old_path)))
+            except OSError as e:
+                sv_logger.warning(f"Frame {frame} can't be moved to {directory} and is forgotten: {e}")
+                self._discard(frame)
+        self.directory = directory
+        try:
+            os.rmdir(old_directory)
+        except OSError:
+            pass
+
+    def _shrink(self, keep=None):
+        if not self.max_size:
+            return
+        for frame in list(self.frames):
+            if self.size <= self.max_size:
+                break
+            if frame == keep:
+                continue
+            data = self.frames[frame]
+            self._discard(frame)
+            if self.directory is not None:
+                self._spill(frame, data)
+
+    def _discard(self, frame):
+        if frame in self.frames:
+            del self.frames[frame]
+            self.size -= self.sizes.pop(frame)
+        if frame in self.spilled:
+            self.spilled.discard(frame)
+            future = self.loading.pop(frame, None)
+            if future is not None:
+                future.cancel()
+            try:
+                os.remove(self._path(frame))
+            except OSError:
+                pass
+
+    def _path(self, frame):
+        return os.path.join(self.directory, f"frame_{frame}.npz")
+
+    def _spill(self, frame, data):
+        # Data is not pickled, so that loading of a file can't execute code:
+        # arrays are stored as they are and nesting of data is stored as JSON
+        arrays = []
+        try:
+            structure = json.dumps(_encode(data, arrays))
+            os.makedirs(self.directory, exist_ok=True)
+            np.savez_compressed(self._path(frame), structure=np.array(structure),
+                                **{f"array_{i}": array for i, array in enumerate(arrays)})
+        except Exception as e:
+            sv_logger.warning(f"Frame {frame} can't be written to disk and is forgotten: {e}")
+            return
+        self.spilled.add(frame)
+
+    @staticmethod
+    def _read(path):
+        with np.load(path, allow_pickle=False) as file:
+            return _decode(json.loads(str(file['structure'])), file)
+
+    def _load(self, frame):
+        future = self.loading.pop(frame, None)
+        try:
+            data = future.result() if future is not None else self._read(self._path(frame))
+        except Exception as e:
+            sv_logger.warning(f"Frame {frame} can't be read from disk: {e}")
+            data = None
+        self._discard(frame)
+        return data
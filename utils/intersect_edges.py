@@ -26,7 +26,6 @@ from mathutils.geometry import (
     intersect_line_line,
     intersect_line_line_2d)
 
-from sverchok.data_structure import cross_indices_np
 from sverchok.utils.cad_module_class import CAD_ops
 from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
 from sverchok.utils.math import np_dot
@@ -195,14 +194,98 @@ def intersect_edges_3d(verts_in, edges_in, s_epsilon):
     bm.free()
     return verts_out, edges_out
 
+def edges_lengths(np_verts, np_edges, dims=3):
+    '''Lengths of edges, taking into account only first dims coordinates'''
+    segments = np_verts[np_edges][:, :, :dims]
+    return np.linalg.norm(segments[:, 1] - segments[:, 0], axis=1)
+
+def edges_bbox_pairs(np_verts, np_edges, margins=0.0, dims=3, chunk_size=1000000):
+    '''
+    Broadphase of edges intersection: find all pairs of edges which
+    bounding boxes, expanded by margins, overlap. Uses sort and sweep along
+    the axis which gives the least number of candidate pairs, so for usual
+    edge nets it takes about O(n log n) instead of checking all n² pairs.
+
+    Args:
+        np_verts: np.array of shape (n, 3).
+        np_edges: np.array of shape (m, 2).
+        margins: float or np.array of shape (m,).
+        dims: number of coordinates taken into account (2 or 3).
+        chunk_size: maximum number of candidate pairs checked at once.
+
+    Returns:
+        np.array of shape (k, 2): pairs (i, j) of edges indices, i < j,
+        in lexicographical order.
+    '''
+    n = len(np_edges)
+    if n < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+    segments = np_verts[np_edges][:, :, :dims]
+    margins = np.broadcast_to(margins, (n,))[:, np.newaxis]
+    box_min = segments.min(axis=1) - margins
+    box_max = segments.max(axis=1) + margins
+
+    # for each box, the boxes which start (in sorted order) after it and
+    # before its end overlap with it along the axis
+    best = None
+    for axis in range(dims):
+        order = np.argsort(box_min[:, axis], kind='stable')
+        ends = np.searchsorted(box_min[order, axis], box_max[order, axis], side='right')
+        counts = np.maximum(ends - np.arange(1, n+1), 0)
+        total = counts.sum()
+        if best is None or total < best[0]:
+            best = (total, order, counts)
+    total, order, counts = best
+
+    offsets = np.cumsum(counts) - counts
+    pairs = []
+    # split boxes into ranges with up to chunk_size candidate pairs
+    bounds = np.searchsorted(offsets, np.arange(0, total, chunk_size), side='right') - 1
+    bounds = np.append(np.unique(bounds), n)
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        firsts = np.repeat(np.arange(start, end), counts[start:end])
+        seconds = firsts + 1 + np.arange(len(firsts)) - np.repeat(offsets[start:end] - offsets[start], counts[start:end])
+        i, j = order[firsts], order[seconds]
+        overlap = np.all((box_min[i] <= box_max[j]) & (box_min[j] <= box_max[i]), axis=1)
+        i, j = i[overlap], j[overlap]
+        pairs.append(np.stack((np.minimum(i, j), np.maximum(i, j)), axis=-1))
+
+    pairs = np.concatenate(pairs) if pairs else np.zeros((0, 2), dtype=np.int64)
+    return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+def split_edges(np_edges, i_ravel, all_coefs, new_idx):
+    '''
+    Split edges by intersection points.
+
+    Args:
+        np_edges: np.array of shape (m, 2).
+        i_ravel: indices of edges where intersection points are.
+        all_coefs: positions of intersection points along the edges.
+        new_idx: indices of intersection points vertices.
+
+    Returns:
+        np.array of new edges; edges are in the same order as original ones,
+        and parts of each edge go from its first vertex to the second.
+    '''
+    n = len(np_edges)
+    edge_idxs = np.concatenate([np.arange(n), i_ravel, np.arange(n)])
+    coefs = np.concatenate([np.full(n, -np.inf), all_coefs, np.full(n, np.inf)])
+    vert_idxs = np.concatenate([np_edges[:, 0], new_idx, np_edges[:, 1]])
+    order = np.lexsort((coefs, edge_idxs))
+    edge_idxs = edge_idxs[order]
+    vert_idxs = vert_idxs[order]
+    same_edge = edge_idxs[:-1] == edge_idxs[1:]
+    return np.stack((vert_idxs[:-1][same_edge], vert_idxs[1:][same_edge]), axis=-1)
+
 # adapted from
 # https://stackoverflow.com/a/18994296
 # distance point line https://stackoverflow.com/a/39840218
 def intersect_edges_3d_np(verts, edges, s_epsilon, only_touching=True):
-    '''Brute force Numpy implementation of edges intersections'''
-    indices = cross_indices_np(len(edges))
+    '''Numpy implementation of edges intersections'''
     np_verts = verts if isinstance(verts, np.ndarray) else np.array(verts)
     np_edges = edges if isinstance(edges, np.ndarray) else np.array(edges)
+    # closest points of intersecting edges can be at s_epsilon from the edges
+    indices = edges_bbox_pairs(np_verts, np_edges, 2 * s_epsilon)
     eds = np_edges[indices].reshape(-1, 4)
     mask = np.invert(np.any([eds[:, 0] == eds[:, 2],
                              eds[:, 0] == eds[:, 3],
@@ -256,19 +339,9 @@ def intersect_edges_3d_np(verts, edges, s_epsilon, only_touching=True):
     i_ravel = indices_m2.ravel()
     new_idx = np.repeat(np.arange(len(inters)) + len(np_verts), 2)
 
-    new_edges = []
-    for i in range(len(edges)):
-        intersect_mask = i_ravel == i
-        coef = all_coefs[intersect_mask]
-        n_i = new_idx[intersect_mask]
-        iid = np.argsort(coef)
-        n_i_sorted = n_i[iid]
-        new_eds = np.concatenate([[np_edges[i, 0]],
-                                  np.repeat(n_i_sorted, 2),
-                                  [np_edges[i, 1]]]).reshape(-1,2)
-        new_edges.append(new_eds)
+    new_edges = split_edges(np_edges, i_ravel, all_coefs, new_idx)
 
-    return np.concatenate([np_verts, inters]).tolist(), np.concatenate(new_edges).tolist()
+    return np.concatenate([np_verts, inters]).tolist(), new_edges.tolist()
 
 def edges_from_ed_inter_double_removal(ed_inter):
     '''create edges from intersections library'''
@@ -414,11 +487,10 @@ def perp_single(a):
     b[1] = a[0]
     return b
 
-def intersect_edges_2d_np(verts, edges, epsilon, only_touching=True):
-    '''Brute force Numpy implementation of edges intersections'''
-    indices = cross_indices_np(len(edges))
-    np_verts = verts if isinstance(verts, np.ndarray) else np.array(verts)
-    np_edges = edges if isinstance(edges, np.ndarray) else np.array(edges)
+def _intersect_edges_2d_pairs(np_verts, np_edges, indices, epsilon, only_touching):
+    '''Intersect pairs of edges with given indices.
+    Returns coefficients of intersection points along both edges, indices of
+    intersecting pairs and intersection points'''
     eds = np_edges[indices].reshape(-1, 4)
     mask = np.invert(np.any([eds[:, 0] == eds[:, 2],
                              eds[:, 0] == eds[:, 3],
@@ -437,124 +509,64 @@ def intersect_edges_2d_np(verts, edges, epsilon, only_touching=True):
     perp_direc_a = perp(direc_a)
     denom_a = np_dot(perp_direc_a, direc_b)
     num_a = np_dot(perp_direc_a, dp )
-    n_a = (num_a / denom_a.astype(float))
     perp_direc_b = perp(direc_b)
     denom_b = np_dot(perp_direc_b, direc_a)
     num_b = np_dot(perp_direc_b, -dp)
-    n_b = (num_b / denom_b.astype(float))
-    inter = n_a[:, np.newaxis] * direc_b + seg_v[:, 2]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # parallel edges give infinite or nan coefficients, which are not valid
+        n_a = (num_a / denom_a.astype(float))
+        n_b = (num_b / denom_b.astype(float))
+        inter = n_a[:, np.newaxis] * direc_b + seg_v[:, 2]
 
     if only_touching:
         valid_inter = np.all([n_a > -epsilon, n_a < 1+epsilon, n_b > -epsilon, n_b < 1+epsilon], axis=0)
     else:
         valid_inter = np.all([n_a > 0, n_a < 1, n_b > 0, n_b < 1], axis=0)
 
-    n_a_m = n_a[valid_inter]
-    n_b_m = n_b[valid_inter]
-    all_coefs = np.concatenate([[n_b_m], [n_a_m]], axis=0).T.ravel()
+    return n_a[valid_inter], n_b[valid_inter], indices_m[valid_inter], inter[valid_inter]
 
-    indices_m2 = indices_m[valid_inter]
-    i_ravel = indices_m2.ravel()
-
-    inters = inter[valid_inter]
-    new_idx = np.repeat(np.arange(len(inters)) + len(np_verts), 2)
-
-    new_edges = []
-    for i in range(len(edges)):
-        intersect_mask = i_ravel == i
-        coef = all_coefs[intersect_mask]
-        n_i = new_idx[intersect_mask]
-        iid = np.argsort(coef)
-        n_i_sorted = n_i[iid]
-        new_eds = np.concatenate([[np_edges[i, 0]],
-                                  np.repeat(n_i_sorted, 2),
-                                  [np_edges[i, 1]]]).reshape(-1, 2)
-        new_edges.append(new_eds)
-
-    return np.concatenate([np_verts, inters]).tolist(), np.concatenate(new_edges).tolist()
-
-def intersect_edges_2d_np_big(verts, edges, epsilon, only_touching=True):
-    '''Brute force Numpy implementation of edges intersections. Avoids to do to it all at once to prevent stack overflow'''
+def intersect_edges_2d_np(verts, edges, epsilon, only_touching=True):
+    '''Numpy implementation of edges intersections'''
     np_verts = verts if isinstance(verts, np.ndarray) else np.array(verts)
     np_edges = edges if isinstance(edges, np.ndarray) else np.array(edges)
-    n = len(edges)
-    n_as, n_bs, indices_m2s, inters_s = [], [], [], []
-    for i in range(n-1):
+    indices = edges_bbox_pairs(np_verts, np_edges, epsilon * edges_lengths(np_verts, np_edges, dims=2), dims=2)
 
-        np_j = np.arange(i+1, n, dtype=np.int32)
-        edgs_i = np_edges[i]
-        eds_j = np_edges[np_j]
-        mask = np.invert(np.any([edgs_i[np.newaxis, 0] == eds_j[:, 0],
-                                 edgs_i[np.newaxis, 0] == eds_j[:, 1],
-                                 edgs_i[np.newaxis, 1] == eds_j[:, 0],
-                                 edgs_i[np.newaxis, 1] == eds_j[:, 1]],
-                                axis=0))
-        eds_j2 = eds_j[mask]
-        indices_j_m = np_j[mask]
-        seg_j = np_verts[eds_j2]
-        direc_b = seg_j[:, 1] - seg_j[:, 0]
-
-
-        np_i = np.full(len(indices_j_m), i, dtype=np.int32)
-        indices_m = np.stack((np_i, indices_j_m), axis=-1)
-
-        seg_a = np_verts[edgs_i]
-        direc_a = seg_a[1, :]- seg_a[0, :]
-        perp_direc_a = perp_single(direc_a)
+    n_a_m, n_b_m, indices_m2, inters = _intersect_edges_2d_pairs(np_verts, np_edges, indices, epsilon, only_touching)
+    all_coefs = np.concatenate([[n_b_m], [n_a_m]], axis=0).T.ravel()
+    i_ravel = indices_m2.ravel()
 
-        dp = seg_a[np.newaxis, 0, :] - seg_j[:, 0]
+    new_idx = np.repeat(np.arange(len(inters)) + len(np_verts), 2)
 
-        denom_a = np_dot(perp_direc_a[np.newaxis, :], direc_b)
-        perp_direc_b = perp(direc_b)
-        denom_b = np_dot(perp_direc_b, direc_a[np.newaxis, :])
-        parallel_mask = np.all([denom_a != 0, denom_b != 0], axis=0)
+    new_edges = split_edges(np_edges, i_ravel, all_coefs, new_idx)
 
-        dp = dp[parallel_mask]
-        denom_a = denom_a[parallel_mask]
-        direc_b = direc_b[parallel_mask]
-        num_a = np_dot(perp_direc_a[np.newaxis, :], dp)
+    return np.concatenate([np_verts, inters]).tolist(), new_edges.tolist()
 
-        n_a = (num_a / denom_a.astype(float))
-        perp_direc_b = perp_direc_b[parallel_mask]
-        denom_b = denom_b[parallel_mask]
-        num_b = np_dot(perp_direc_b, -dp)
-        n_b = (num_b / denom_b.astype(float))
-        inter = n_a[:, np.newaxis] * direc_b + seg_j[parallel_mask, 0]
-        if only_touching:
-            valid_inter = np.all([n_a > -epsilon, n_a < 1+epsilon, n_b > -epsilon, n_b < 1+epsilon], axis=0)
-        else:
-            valid_inter = np.all([n_a > 0, n_a < 1, n_b > 0, n_b < 1], axis=0)
-        n_a_m = n_a[valid_inter]
-        n_b_m = n_b[valid_inter]
-        indices_m2 = indices_m[parallel_mask][valid_inter]
-        inters = inter[valid_inter]
+def intersect_edges_2d_np_big(verts, edges, epsilon, only_touching=True, chunk_size=100000):
+    '''Numpy implementation of edges intersections. Candidate pairs of edges are processed by chunks to limit used memory'''
+    np_verts = verts if isinstance(verts, np.ndarray) else np.array(verts)
+    np_edges = edges if isinstance(edges, np.ndarray) else np.array(edges)
+    indices = edges_bbox_pairs(np_verts, np_edges, epsilon * edges_lengths(np_verts, np_edges, dims=2), dims=2)
+    n_as, n_bs, indices_m2s, inters_s = [], [], [], []
+    for start in range(0, len(indices), chunk_size):
+        n_a_m, n_b_m, indices_m2, inters = _intersect_edges_2d_pairs(np_verts, np_edges, indices[start:start+chunk_size],
+                                                                     epsilon, only_touching)
         n_as.append(n_a_m)
         n_bs.append(n_b_m)
         indices_m2s.append(indices_m2)
         inters_s.append(inters)
 
-    c_n_as = np.concatenate(n_as)
-    c_n_bs = np.concatenate(n_bs)
-    c_indices_m2s = np.concatenate(indices_m2s)
-    c_inters_s = np.concatenate(inters_s)
+    c_n_as = np.concatenate(n_as) if n_as else np.zeros((0,))
+    c_n_bs = np.concatenate(n_bs) if n_bs else np.zeros((0,))
+    c_indices_m2s = np.concatenate(indices_m2s) if indices_m2s else np.zeros((0, 2), dtype=np.int64)
+    c_inters_s = np.concatenate(inters_s) if inters_s else np.zeros((0, np_verts.shape[1]))
     all_coefs = np.concatenate([[c_n_bs], [c_n_as]], axis=0).T.ravel()
     i_ravel = c_indices_m2s.ravel()
 
     new_idx = np.repeat(np.arange(len(c_inters_s)) + len(np_verts), 2)
 
-    new_edges = []
-    for i in range(len(edges)):
-        intersect_mask = i_ravel == i
-        coef = all_coefs[intersect_mask]
-        n_i = new_idx[intersect_mask]
-        iid = np.argsort(coef)
-        n_i_sorted = n_i[iid]
-        new_eds = np.concatenate([[np_edges[i, 0]],
-                                  np.repeat(n_i_sorted, 2),
-                                  [np_edges[i, 1]]]).reshape(-1, 2)
-        new_edges.append(new_eds)
-
-    return np.concatenate([np_verts, c_inters_s]).tolist(), np.concatenate(new_edges).tolist()
+    new_edges = split_edges(np_edges, i_ravel, all_coefs, new_idx)
+
+    return np.concatenate([np_verts, c_inters_s]).tolist(), new_edges.tolist()
 
 
 def remove_doubles_from_edgenet(verts_in, edges_in, distance):
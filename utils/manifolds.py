@@ -5,6 +5,7 @@ from mathutils import kdtree
 from mathutils.bvhtree import BVHTree
 
 from sverchok.utils.curve import SvIsoUvCurve
+from sverchok.utils.surface.core import SvSurface
 from sverchok.utils.curve.nurbs import SvNurbsCurve
 from sverchok.utils.sv_logging import sv_logger, get_logger
 from sverchok.utils.geom import PlaneEquation, LineEquation, locate_linear
@@ -15,11 +16,14 @@ from mathutils.geometry import intersect_plane_plane, intersect_line_plane, norm
 
 if scipy is not None:
     from scipy.optimize import root_scalar, root, minimize_scalar, minimize
+    from scipy.spatial import cKDTree
 
 SKIP = 'skip'
 FAIL = 'fail'
 RETURN_NONE = 'none'
 
+NEWTON = 'NEWTON'
+
 class CurveProjectionResult(object):
     def __init__(self, us, points, source):
         self.us = us
@@ -96,10 +100,154 @@ def ortho_project_curve(src_point, curve, subdomain = None, init_samples=10, on_
     result = CurveProjectionResult(us, points, src_point)
     return result
 
+def _nearest_polyline_segments(points, src_points, chunk_size=2**20):
+    """
+    For each of source points, find the nearest segment of a polyline.
+    Returns indexes of segments and parameters (0 to 1) of the nearest points
+    on these segments.
+    """
+    p0 = points[:-1]
+    segments = points[1:] - p0
+    segment_lens = (segments * segments).sum(axis=1)
+    segment_lens[segment_lens == 0] = 1.0
+
+    n = len(src_points)
+    idxs = np.empty(n, dtype=np.int64)
+    ss = np.empty(n)
+    step = max(1, chunk_size // len(segments))
+    for start in range(0, n, step):
+        src = src_points[start : start + step]
+        rel = src[:, np.newaxis, :] - p0[np.newaxis, :, :]
+        s = np.clip((rel * segments).sum(axis=2) / segment_lens, 0.0, 1.0)
+        dist = rel - s[:, :, np.newaxis] * segments
+        best = (dist * dist).sum(axis=2).argmin(axis=1)
+        idxs[start : start + step] = best
+        ss[start : start + step] = s[np.arange(len(src)), best]
+    return idxs, ss
+
+def _refine_curve_parameters(curve, src_points, ts, maxiter=50, tolerance=1e-6):
+    """
+    Damped Newton iterations minimizing the distance from curve points to
+    source points, performed for all points at once.
+    Returns refined parameters and mask of points where iterations converged.
+    """
+    t_min, t_max = curve.get_u_bounds()
+    is_closed = curve.is_closed()
+    h1 = 1e-6 * (t_max - t_min)
+    h2 = 1e-4 * (t_max - t_min)
+
+    def fit(t):
+        if is_closed:
+            return t_min + np.mod(t - t_min, t_max - t_min)
+        return np.clip(t, t_min, t_max)
+
+    ts = np.array(ts, dtype=np.float64)
+    n = len(ts)
+    damping = np.ones(n)
+    converged = np.zeros(n, dtype=bool)
+    active = np.arange(n)
+
+    for i in range(maxiter):
+        if not len(active):
+            break
+        t = ts[active]
+        src = src_points[active]
+        points = curve.evaluate_array(t)
+        tangents = curve.tangent_array(t, tangent_delta=h1)
+        second = curve.second_derivative_array(t, tangent_delta=h2)
+        dist = points - src
+        f = (dist * dist).sum(axis=1)
+
+        # derivatives of squared distance / 2
+        g = (dist * tangents).sum(axis=1)
+        tangent_lens = (tangents * tangents).sum(axis=1)
+        h = tangent_lens + (dist * second).sum(axis=1)
+        h = np.where(h > 0, h, tangent_lens)
+        h[h == 0] = 1.0
+
+        stationary = np.abs(g) <= tolerance * np.sqrt(tangent_lens)
+        if not is_closed:
+            stationary |= ((t <= t_min) & (g > 0)) | ((t >= t_max) & (g < 0))
+
+        a_damping = damping[active]
+        new_t = fit(t - a_damping * g / h)
+        new_points = curve.evaluate_array(new_t)
+        new_dist = new_points - src
+        accepted = (new_dist * new_dist).sum(axis=1) <= f
+        moved = np.linalg.norm(new_points - points, axis=1)
+
+        ts[active[accepted]] = new_t[accepted]
+        damping[active[accepted]] = np.minimum(a_damping[accepted] * 2.0, 1.0)
+        damping[active[~accepted]] *= 0.5
+
+        # derivatives are not exact, so near the minimum steps can be
+        # rejected because of calculation errors; such tiny steps mean that
+        # the minimum is found, unless they are tiny because of big damping
+        done = stationary | ((moved < tolerance) & (a_damping >= 0.1))
+        converged[active[done]] = True
+        active = active[~done]
+
+    return ts, converged
+
+def nearest_point_on_curve_newton(src_points, curve, samples=50, precise=True, output_points=True, maxiter=50, tolerance=1e-6, logger=None):
+    """
+    Find nearest points on any curve for many source points at once.
+    At the first step, the curve is sampled into a polyline, and for each
+    source point the nearest segment of it is found. Then the parameter is
+    refined by Newton iterations using evaluate_array(), tangent_array() and
+    second_derivative_array(), for all points simultaneously. Points where the
+    iterations did not converge are refined by scipy's minimize_scalar.
+
+    Output is the same as of nearest_point_on_curve.
+    """
+    if logger is None:
+        logger = get_logger()
+
+    t_min, t_max = curve.get_u_bounds()
+    src_points = np.asarray(src_points, dtype=np.float64).reshape(-1, 3)
+    if not len(src_points):
+        return []
+
+    us = np.linspace(t_min, t_max, num=samples)
+    points = curve.evaluate_array(us)
+    segment_idxs, segment_ts = _nearest_polyline_segments(points, src_points)
+    ts = us[segment_idxs] + segment_ts * (us[segment_idxs + 1] - us[segment_idxs])
+
+    if precise:
+        ts, converged = _refine_curve_parameters(curve, src_points, ts, maxiter=maxiter, tolerance=tolerance)
+        not_converged = np.flatnonzero(~converged)
+        logger.debug("Nearest points on curve: %s of %s points converged, %s refined by scipy",
+                        len(ts) - len(not_converged), len(ts), len(not_converged))
+        for i in not_converged:
+            src_point = src_points[i]
+
+            def goal(t):
+                dv = curve.evaluate(t) - src_point
+                return np.linalg.norm(dv)
+
+            segment_i = segment_idxs[i]
+            bounds = (us[max(segment_i - 1, 0)], us[min(segment_i + 2, samples - 1)])
+            result = minimize_scalar(goal, bounds = bounds, method = 'Bounded')
+            if not result.success:
+                raise Exception("Can't find the nearest point for {}: {}".format(src_point, result.message))
+            if goal(result.x) < goal(ts[i]):
+                ts[i] = result.x
+
+    if output_points:
+        result_points = curve.evaluate_array(ts)
+        return list(zip(ts.tolist(), result_points))
+    else:
+        return ts.tolist()
+
 def nearest_point_on_curve(src_points, curve, samples=10, precise=True, method='Brent', output_points=True, logger=None):
     """
     Find nearest point on any curve.
     """
+    if method == NEWTON:
+        return nearest_point_on_curve_newton(src_points, curve,
+                    samples = samples, precise = precise,
+                    output_points = output_points, logger = logger)
+
     if logger is None:
         logger = get_logger()
 
@@ -663,6 +811,42 @@ def ortho_project_surface(src_point, surface, init_samples=10, maxiter=30, toler
 
     return u, v, point
 
+def ortho_project_surface_array(src_points, surface, init_samples=10, maxiter=30, tolerance=1e-4):
+    """
+    Find orthogonal projections of many points to surface at once.
+    All points are projected by vectorized Newton iterations (see
+    `nearest_points_on_surface_batched`); `ortho_project_surface` is used only
+    for points, for which the found point is not an orthogonal projection (for
+    example, the nearest point is on the surface boundary).
+    dependencies: scipy
+
+    output: tuple (us, vs, points, result), where result is SurfaceProjectionResult
+        with convergence statistics.
+    """
+    src_points = np.asarray(src_points, dtype=np.float64).reshape(-1, 3)
+    result = nearest_points_on_surface_batched(src_points, surface,
+                init_samples = init_samples, maxiter = maxiter,
+                tolerance = tolerance * 1e-2)
+
+    u_max, v_max = surface.get_u_max(), surface.get_v_max()
+    hu = _surface_step(1e-6 * (u_max - surface.get_u_min()), result.us, u_max)
+    hv = _surface_step(1e-6 * (v_max - surface.get_v_min()), result.vs, v_max)
+    points, du, dv = _surface_first_derivatives(surface, result.us, result.vs, hu, hv)
+    dist = points - src_points
+    ortho_u = np.abs((dist * du).sum(axis=1)) <= tolerance * np.linalg.norm(du, axis=1)
+    ortho_v = np.abs((dist * dv).sum(axis=1)) <= tolerance * np.linalg.norm(dv, axis=1)
+
+    for i in np.flatnonzero(~(ortho_u & ortho_v)):
+        u, v, point = ortho_project_surface(src_points[i], surface,
+                        init_samples=init_samples, maxiter=maxiter, tolerance=tolerance)
+        result.us[i], result.vs[i] = u, v
+        result.points[i] = point
+        if result.converged[i]:
+            result.converged[i] = False
+            result.fallback_count += 1
+
+    return result.us, result.vs, result.points, result
+
 class RaycastResult(object):
     def __init__(self):
         self.init_us = None
@@ -918,6 +1102,212 @@ def intersect_curve_surface(curve, surface, init_samples=10, raycast_samples=10,
 
     return result
 
+class SurfaceProjectionResult(object):
+    """
+    Result of projection of many points onto the surface.
+    Besides found parameters and points, it keeps convergence statistics:
+    * converged: mask of points for which Newton iterations have converged
+    * iterations: number of performed Newton iterations
+    * fallback_count: number of points which were found by per-point scipy
+      minimization, because Newton iterations did not converge for them.
+    """
+    def __init__(self, us, vs, points):
+        self.us = us
+        self.vs = vs
+        self.points = points
+        self.converged = np.ones(len(us), dtype=bool)
+        self.iterations = 0
+        self.fallback_count = 0
+
+    @property
+    def converged_count(self):
+        return int(self.converged.sum())
+
+    def __repr__(self):
+        return "<Projection of {} points: {} converged in {} iterations, {} by fallback>".format(
+                len(self.us), self.converged_count, self.iterations, self.fallback_count)
+
+def _surface_step(h, values, max_value):
+    # finite difference steps which do not leave the surface domain
+    return np.where(values + h <= max_value, h, -h)
+
+def _surface_first_derivatives(surface, us, vs, hu, hv):
+    if type(surface).derivatives_data_array is not SvSurface.derivatives_data_array:
+        # the surface knows how to calculate derivatives exactly
+        data = surface.derivatives_data_array(us, vs)
+        return data.points, data.du, data.dv
+    points = surface.evaluate_array(us, vs)
+    du = (surface.evaluate_array(us + hu, vs) - points) / hu[:,np.newaxis]
+    dv = (surface.evaluate_array(us, vs + hv) - points) / hv[:,np.newaxis]
+    return points, du, dv
+
+def _surface_derivatives(surface, us, vs, u_max, v_max, h1, h2):
+    hu1 = _surface_step(h1[0], us, u_max)
+    hv1 = _surface_step(h1[1], vs, v_max)
+    hu2 = _surface_step(h2[0], us, u_max)
+    hv2 = _surface_step(h2[1], vs, v_max)
+    points, du, dv = _surface_first_derivatives(surface, us, vs, hu1, hv1)
+    _, du_u, dv_u = _surface_first_derivatives(surface, us + hu2, vs, hu1, hv1)
+    _, du_v, dv_v = _surface_first_derivatives(surface, us, vs + hv2, hu1, hv1)
+    duu = (du_u - du) / hu2[:,np.newaxis]
+    dvv = (dv_v - dv) / hv2[:,np.newaxis]
+    duv = 0.5 * ((dv_u - dv) / hu2[:,np.newaxis] + (du_v - du) / hv2[:,np.newaxis])
+    return points, du, dv, duu, duv, dvv
+
+def project_to_surface_newton(points_from, surface, init_us, init_vs, maxiter=50, tolerance=1e-6):
+    """
+    Find the nearest points on the surface for many source points at once,
+    by damped Newton iterations, which are performed for all points
+    simultaneously with `surface.evaluate_array`. Parameters are kept within
+    surface domain. Points, for which iterations did not converge, are marked
+    in `converged` mask of the result, their parameters are the best found.
+
+    inputs:
+        * points_from: np.array of shape (n, 3)
+        * surface: SvSurface
+        * init_us, init_vs: initial guesses, np.arrays of shape (n,)
+        * maxiter: maximum number of iterations
+        * tolerance: iterations stop when a point moves less than this distance
+
+    output: SurfaceProjectionResult.
+    """
+    points_from = np.asarray(points_from, dtype=np.float64)
+    n = len(points_from)
+    u_min, u_max = surface.get_u_min(), surface.get_u_max()
+    v_min, v_max = surface.get_v_min(), surface.get_v_max()
+    u_size, v_size = u_max - u_min, v_max - v_min
+    h1 = (1e-6 * u_size, 1e-6 * v_size)
+    h2 = (1e-4 * u_size, 1e-4 * v_size)
+
+    us = np.clip(np.array(init_us, dtype=np.float64), u_min, u_max)
+    vs = np.clip(np.array(init_vs, dtype=np.float64), v_min, v_max)
+    points = surface.evaluate_array(us, vs) if n else np.empty((0, 3))
+    damping = np.full(n, 1e-3)
+    converged = np.zeros(n, dtype=bool)
+    active = np.arange(n)
+
+    iteration = 0
+    while len(active) and iteration < maxiter:
+        iteration += 1
+        a_us, a_vs = us[active], vs[active]
+        src = points_from[active]
+        pts, du, dv, duu, duv, dvv = _surface_derivatives(surface, a_us, a_vs, u_max, v_max, h1, h2)
+        dist = pts - src
+        f = (dist * dist).sum(axis=1)
+
+        # gradient and hessian of squared distance / 2
+        g_u = (dist * du).sum(axis=1)
+        g_v = (dist * dv).sum(axis=1)
+        uu = (du * du).sum(axis=1)
+        uv = (du * dv).sum(axis=1)
+        vv = (dv * dv).sum(axis=1)
+        h_uu = uu + (dist * duu).sum(axis=1)
+        h_uv = uv + (dist * duv).sum(axis=1)
+        h_vv = vv + (dist * dvv).sum(axis=1)
+        # far from the surface Newton hessian can be indefinite,
+        # Gauss-Newton one is used there
+        indefinite = (h_uu <= 0) | (h_uu * h_vv - h_uv * h_uv <= 0)
+        h_uu = np.where(indefinite, uu, h_uu)
+        h_uv = np.where(indefinite, uv, h_uv)
+        h_vv = np.where(indefinite, vv, h_vv)
+
+        # the point is stationary if the distance vector is orthogonal to
+        # the surface, or the surface boundary does not allow to move further
+        len_u = np.sqrt(uu)
+        len_v = np.sqrt(vv)
+        bound_u = ((a_us <= u_min) & (g_u > 0)) | ((a_us >= u_max) & (g_u < 0))
+        bound_v = ((a_vs <= v_min) & (g_v > 0)) | ((a_vs >= v_max) & (g_v < 0))
+        stationary_u = bound_u | (np.abs(g_u) < tolerance * len_u)
+        stationary_v = bound_v | (np.abs(g_v) < tolerance * len_v)
+        stationary = stationary_u & stationary_v
+
+        a_damping = damping[active]
+        mu = a_damping * (uu + vv)
+        h_uu = h_uu + mu
+        h_vv = h_vv + mu
+        det = h_uu * h_vv - h_uv * h_uv
+        det = np.where(det == 0, 1e-30, det)
+        step_u = -(h_vv * g_u - h_uv * g_v) / det
+        step_v = -(h_uu * g_v - h_uv * g_u) / det
+        # along the boundary only the other parameter can change
+        step_u = np.where(bound_v, -g_u / h_uu, step_u)
+        step_v = np.where(bound_u, -g_v / h_vv, step_v)
+        step_u[bound_u] = 0
+        step_v[bound_v] = 0
+
+        new_us = np.clip(a_us + step_u, u_min, u_max)
+        new_vs = np.clip(a_vs + step_v, v_min, v_max)
+        new_pts = surface.evaluate_array(new_us, new_vs)
+        new_dist = new_pts - src
+        new_f = (new_dist * new_dist).sum(axis=1)
+
+        accepted = new_f <= f
+        moved = np.linalg.norm(new_pts - pts, axis=1)
+        idx = active[accepted]
+        us[idx] = new_us[accepted]
+        vs[idx] = new_vs[accepted]
+        points[idx] = new_pts[accepted]
+        damping[idx] *= 0.3
+        damping[active[~accepted]] *= 4.0
+
+        # with big damping small steps do not mean that the minimum is found
+        done = stationary | (accepted & (moved < tolerance) & (a_damping < 1.0))
+        converged[active[done]] = True
+        active = active[~done]
+
+    result = SurfaceProjectionResult(us, vs, points)
+    result.converged = converged
+    result.iterations = iteration
+    return result
+
+def nearest_points_on_surface_batched(points_from, surface, init_samples=50, maxiter=50, tolerance=1e-6, fallback_method='L-BFGS-B'):
+    """
+    Find the nearest points on the surface for many source points at once.
+    Initial guesses are taken from nearest points of the grid of
+    init_samples x init_samples surface points, then all points are refined by
+    `project_to_surface_newton`. Only for points where Newton iterations did not
+    converge, scipy minimization with fallback_method is used.
+
+    dependencies: scipy
+    output: SurfaceProjectionResult.
+    """
+    points_from = np.asarray(points_from, dtype=np.float64).reshape(-1, 3)
+
+    u_min, u_max = surface.get_u_min(), surface.get_u_max()
+    v_min, v_max = surface.get_v_min(), surface.get_v_max()
+    us = np.linspace(u_min, u_max, num=init_samples)
+    vs = np.linspace(v_min, v_max, num=init_samples)
+    us, vs = np.meshgrid(us, vs)
+    us = us.flatten()
+    vs = vs.flatten()
+    grid_points = surface.evaluate_array(us, vs)
+    _, nearest_idx = cKDTree(grid_points).query(points_from)
+
+    result = project_to_surface_newton(points_from, surface,
+                us[nearest_idx], vs[nearest_idx],
+                maxiter = maxiter, tolerance = tolerance)
+
+    for i in np.flatnonzero(~result.converged):
+        src_point = points_from[i]
+
+        def goal(p):
+            dv = surface.evaluate(p[0], p[1]) - src_point
+            return (dv * dv).sum(axis=0)
+
+        x0 = np.array([result.us[i], result.vs[i]])
+        solution = minimize(goal, x0 = x0,
+                        bounds = [(u_min, u_max), (v_min, v_max)],
+                        method = fallback_method)
+        if not solution.success:
+            raise Exception("Can't find the nearest point for {}: {}".format(src_point, solution.message))
+        if goal(solution.x) < goal(x0):
+            result.us[i], result.vs[i] = solution.x
+            result.points[i] = surface.evaluate(*solution.x)
+        result.fallback_count += 1
+
+    sv_logger.debug("Nearest points on surface: %s", result)
+    return result
+
 def nearest_point_on_surface(points_from, surface, init_samples=50, precise=True, method='L-BFGS-B', sequential=False, output_points=True):
 
     u_min = surface.get_u_min()
@@ -956,6 +1346,13 @@ def nearest_point_on_surface(points_from, surface, init_samples=50, precise=True
             return (dv * dv).sum(axis=0)
         return distance
 
+    if precise and method == NEWTON:
+        result = nearest_points_on_surface_batched(points_from, surface, init_samples=init_samples)
+        if output_points:
+            return result.us.tolist(), result.vs.tolist(), result.points.tolist()
+        else:
+            return result.us.tolist(), result.vs.tolist()
+
     init_us, init_vs, init_points = init_guess()
     result_us = []
     result_vs = []
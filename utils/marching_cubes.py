@@ -1,5 +1,5 @@
 """
-Pure Python implementation of marching cubes algorithm
+NumPy implementation of marching cubes algorithm
 Adapted from https://github.com/mutantbob/blender-marching-cubes/blob/master/marching-cube.py
 """
 """
@@ -457,7 +457,199 @@ def cornerloop(x,y,z):
         for cy,cx in zip((0,y,y,0),(0,0,x,x)):
              yield cx,cy,cz
 
-def isosurface_np(data, isolevel):
+edgetable_np = np.array(edgetable, dtype=np.int32)
+tritable_np = np.array(tritable, dtype=np.int32)
+# Number of triangle corner entries in each row of tritable.
+tricount_np = (tritable_np >= 0).sum(axis=1)
+
+# Offsets of cube corners 0..7 relative to (x1, y1, z1), see the picture above.
+CORNER_OFFSETS = np.array([
+        (0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0),
+        (0, 0, 1), (0, 1, 1), (1, 1, 1), (1, 0, 1)
+    ], dtype=np.int64)
+
+# Cube edges 0..11 as pairs of corner indices, in the same orientation
+# as they are passed to vertexinterp by Polygoniser.polygonise.
+EDGE_CORNERS = np.array([
+        (0, 1), (1, 2), (2, 3), (3, 0),
+        (4, 5), (5, 6), (6, 7), (7, 4),
+        (0, 4), (1, 5), (2, 6), (3, 7)
+    ], dtype=np.int64)
+
+def _edge_geometry():
+    c1 = CORNER_OFFSETS[EDGE_CORNERS[:,0]]
+    c2 = CORNER_OFFSETS[EDGE_CORNERS[:,1]]
+    # Lower end of each edge, grid axis the edge goes along,
+    # and whether polygonise() walks the edge from higher to lower end.
+    lower = np.minimum(c1, c2)
+    axis = np.argmax(c1 != c2, axis=1)
+    reverse = (c1 > c2).any(axis=1)
+    return lower, axis, reverse
+
+EDGE_LOWER, EDGE_AXIS, EDGE_REVERSE = _edge_geometry()
+
+def _interpolate_edges(data, isolevel, keys, reverse):
+    """
+    Vectorized version of vertexinterp() for a set of grid edges.
+
+    Edges are identified by integer keys, as produced by _edge_keys().
+    """
+    sx, sy, sz = data.shape
+    axis = keys % 3
+    lin = keys // 3
+    x = lin % sx
+    y = (lin // sx) % sy
+    z = lin // (sx * sy)
+
+    p1 = np.stack((x, y, z), axis=1)
+    p2 = p1.copy()
+    p2[np.arange(len(keys)), axis] += 1
+    p1[reverse], p2[reverse] = p2[reverse], p1[reverse]
+
+    v1 = data[p1[:,0], p1[:,1], p1[:,2]]
+    v2 = data[p2[:,0], p2[:,1], p2[:,2]]
+
+    p1 = p1.astype(np.float64)
+    p2 = p2.astype(np.float64)
+    dv = v2 - v1
+    near_v1 = abs(isolevel - v1) < 0.00001
+    near_v2 = abs(isolevel - v2) < 0.00001
+    degenerate = abs(dv) < 0.00001
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mu = np.where(degenerate, 0.0, (isolevel - v1) / np.where(degenerate, 1.0, dv))
+    mu[near_v2] = 1.0
+    mu[near_v1] = 0.0
+    return p1 + mu[:,np.newaxis] * (p2 - p1)
+
+def _edge_keys(shape, xs, ys, zs):
+    """
+    Integer keys of all 12 edges of the cubes with given lower corners.
+    Each grid edge gets the same key regardless of which cube it is seen from.
+    Returns an array of shape (n, 12).
+    """
+    sx, sy, sz = shape
+    lower = EDGE_LOWER[np.newaxis,:,:]
+    ex = xs[:,np.newaxis] + lower[:,:,0]
+    ey = ys[:,np.newaxis] + lower[:,:,1]
+    ez = zs[:,np.newaxis] + lower[:,:,2]
+    return ((ez * sy + ey) * sx + ex) * 3 + EDGE_AXIS[np.newaxis,:]
+
+def iter_isosurface_slabs(data, isolevel, slab_size=None):
+    """
+    Vectorized table-driven marching cubes.
+
+    The grid is processed in slabs of `slab_size` cube layers along Z, so that
+    the amount of temporary memory is bounded by the size of one slab.
+    If `slab_size` is None or 0, the whole grid is processed at once.
+
+    Yields (new_vertices, new_faces) pairs for each slab: new_vertices is an
+    array of shape (n, 3) with vertices that first appear in this slab;
+    new_faces is an int array of shape (m, 3), with indices referring to the
+    concatenation of all vertices yielded so far.
+
+    Vertices and triangles are produced in exactly the same order as the
+    cube-by-cube Polygoniser would produce them.
+    """
+    data = np.asarray(data)
+    sx, sy, sz = data.shape
+    n_layers = sz - 1
+    if sx < 2 or sy < 2 or n_layers < 1:
+        return
+    if not slab_size:
+        slab_size = n_layers
+
+    n_verts = 0
+    # Edge keys and vertex indices on the top plane of previous slab;
+    # these are shared with the bottom plane of the next slab.
+    carry_keys = np.empty((0,), dtype=np.int64)
+    carry_idxs = np.empty((0,), dtype=np.int64)
+
+    for z0 in range(0, n_layers, slab_size):
+        z1 = min(z0 + slab_size, n_layers)
+        below = data[:,:,z0:z1+1] < isolevel
+        cubeindex = np.zeros((sx-1, sy-1, z1-z0), dtype=np.int32)
+        for bit, (dx, dy, dz) in enumerate(CORNER_OFFSETS):
+            corner = below[dx : sx-1+dx, dy : sy-1+dy, dz : z1-z0+dz]
+            cubeindex |= corner.astype(np.int32) << bit
+
+        # Polygoniser walks the cubes in Z, Y, X order.
+        cubeindex = cubeindex.transpose((2, 1, 0)).ravel()
+        active = np.flatnonzero(edgetable_np[cubeindex])
+        if len(active) == 0:
+            carry_keys = np.empty((0,), dtype=np.int64)
+            carry_idxs = np.empty((0,), dtype=np.int64)
+            continue
+        cubeindex = cubeindex[active]
+
+        xs = active % (sx-1)
+        ys = (active // (sx-1)) % (sy-1)
+        zs = active // ((sx-1) * (sy-1)) + z0
+
+        keys = _edge_keys(data.shape, xs, ys, zs)
+        used = ((edgetable_np[cubeindex][:,np.newaxis] >> np.arange(12)) & 1).astype(bool)
+        used_keys = keys[used]
+        used_edges = np.broadcast_to(np.arange(12), used.shape)[used]
+
+        unique_keys, first_seen, inverse = np.unique(used_keys, return_index=True, return_inverse=True)
+        # Vertices shared with the previous slab already have indices.
+        pos = np.searchsorted(carry_keys, unique_keys)
+        pos = np.minimum(pos, len(carry_keys) - 1) if len(carry_keys) else pos
+        known = (carry_keys[pos] == unique_keys) if len(carry_keys) else np.zeros(len(unique_keys), dtype=bool)
+
+        unique_idxs = np.empty(len(unique_keys), dtype=np.int64)
+        unique_idxs[known] = carry_idxs[pos[known]]
+        new = np.flatnonzero(~known)
+        # Number new vertices in order of first appearance.
+        new = new[np.argsort(first_seen[new], kind='stable')]
+        unique_idxs[new] = np.arange(n_verts, n_verts + len(new))
+
+        new_verts = _interpolate_edges(data, isolevel,
+                        unique_keys[new],
+                        EDGE_REVERSE[used_edges[first_seen[new]]])
+        n_verts += len(new)
+
+        vert_idxs = np.full(used.shape, -1, dtype=np.int64)
+        vert_idxs[used] = unique_idxs[inverse.ravel()]
+
+        triangles = tritable_np[cubeindex]
+        corners = triangles >= 0
+        faces = np.take_along_axis(vert_idxs, np.where(corners, triangles, 0), axis=1)
+        faces = faces[corners].reshape((-1, 3))
+
+        top = (unique_keys // 3) // (sx * sy) == z1
+        carry_keys = unique_keys[top]
+        carry_idxs = unique_idxs[top]
+
+        yield new_verts, faces
+
+def isosurface_np(data, isolevel, slab_size=None):
+    """
+    Build the isosurface of a scalar field sampled on a regular grid.
+
+    Args:
+        data: 3D array of scalar values, indexed as data[x, y, z].
+        isolevel: value of the isosurface.
+        slab_size: if provided, the grid is processed in slabs of this many
+            cube layers along Z, to limit memory consumption on large grids.
+
+    Returns:
+        a tuple (vertices, faces): vertices is a numpy array of shape (n, 3),
+        in grid index coordinates; faces is a list of triangles.
+    """
+    verts = []
+    faces = []
+    for new_verts, new_faces in iter_isosurface_slabs(data, isolevel, slab_size):
+        verts.append(new_verts)
+        faces.append(new_faces)
+    if not verts:
+        return np.empty((0, 3)), []
+    return np.concatenate(verts), np.concatenate(faces).tolist()
+
+def isosurface_py(data, isolevel):
+    """
+    Cube-by-cube pure Python implementation of isosurface_np.
+    It is much slower; it is kept for reference.
+    """
     triangles = []
     z_a = 0
     z_plane_a = data[:,:,z_a]
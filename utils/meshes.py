@@ -28,7 +28,7 @@ import numpy as np
 
 from mathutils import Matrix, Vector
 
-from sverchok.data_structure import fixed_iter
+from sverchok.data_structure import fixed_iter, numpy_full_list
 from sverchok.utils.modules.matrix_utils import matrix_apply_np
 
 
@@ -52,6 +52,9 @@ def join(meshes: List[Mesh], return_type: Type[Mesh] = None) -> Mesh:
     if return_type is None:
         return_type = type(meshes[0])
 
+    if return_type == NpMesh:
+        return NpMesh.join([m.cast(NpMesh) for m in meshes])
+
     out_mesh = return_type([], [], [])
     added_vertices = 0
     for mesh in meshes:
@@ -68,18 +71,11 @@ def join(meshes: List[Mesh], return_type: Type[Mesh] = None) -> Mesh:
                 out_data.extend(data or [])
                 out_elem[attr] = out_data
 
-        if return_type == NpMesh:
-            pass
-        else:
-            out_mesh.vertices.data.extend(mesh.vertices.data)
-
+        out_mesh.vertices.data.extend(mesh.vertices.data)
         out_mesh.edges.data.extend([i + added_vertices for i in e] for e in mesh.edges)
         out_mesh.polygons.data.extend([i + added_vertices for i in p] for p in mesh.polygons)
         added_vertices += len(mesh.vertices)
 
-    if return_type == NpMesh:
-        out_mesh.vertices.data = np.concatenate([m.vertices.data for m in meshes])
-
     return out_mesh
 
 
@@ -170,37 +166,59 @@ class PyMesh(Mesh):
 class NpMesh(Mesh):
     """
     Numpy mesh data structure
-    For keeping balance between simplicity and efficiency only vertices has numpy format
+    Vertices are (n, 3) float32 array, edges are (n, 2) int32 array
+    and polygons are kept in the same layout as in Blender meshes, see PolygonsCSR
+    Data types match Blender mesh properties, so they can be passed to foreach_set without copying
     """
-    def __init__(self, vertices: Iterable, edges: List[PyEdge] = None, polygons: List[PyPolygon] = None):
-        # array is copied only if dtype does not match
-        self._vertices = MeshElements(np.asarray(vertices, dtype=np.float32))
-        self._edges = MeshElements(edges or [])
-        self._polygons = MeshElements(polygons or [])
+    def __init__(self, vertices: Iterable, edges: Union[List[PyEdge], np.ndarray] = None,
+                 polygons: Union[List[PyPolygon], np.ndarray, PolygonsCSR] = None):
+        # arrays are copied only if dtype does not match
+        self._vertices = MeshElements(np.asarray(vertices, dtype=np.float32).reshape(-1, 3))
+        self._edges = MeshElements(np.asarray(edges if edges is not None else [], dtype=np.int32).reshape(-1, 2))
+        self._polygons = MeshElements(PolygonsCSR.from_polygons(polygons))
+
+    @classmethod
+    def join(cls, meshes: List[NpMesh]) -> NpMesh:
+        """Join all meshes at once, indexes of all meshes are shifted with one operation per element type"""
+        vertices_number = np.cumsum([0] + [len(m.vertices) for m in meshes[:-1]]).tolist()
+        edges = [m.edges.data + offset for m, offset in zip(meshes, vertices_number)]
+        polygons = [m.polygons.data.shifted(offset) for m, offset in zip(meshes, vertices_number)]
+
+        out_mesh = cls(np.concatenate([m.vertices.data for m in meshes]),
+                       np.concatenate(edges) if edges else None,
+                       PolygonsCSR.concatenate(polygons))
+        out_mesh.vertices.join_attributes([m.vertices for m in meshes])
+        out_mesh.edges.join_attributes([m.edges for m in meshes])
+        out_mesh.polygons.join_attributes([m.polygons for m in meshes])
+        return out_mesh
 
     @convert_mesh_type
     def add_mesh(self, mesh: NpMesh) -> NpMesh:
-        """To join many meshes - reduce(lambda m1, m2: m1.add_mesh(m2), [mesh, mesh, mesh, mesh])"""
+        """To join many meshes use `join` function, it is faster"""
         self_vertices_number = len(self.vertices)
         self.vertices.join_data(mesh.vertices)
-        mesh.edges.data = [(edge[0] + self_vertices_number, edge[1] + self_vertices_number) for edge in mesh.edges]
-        self.edges.join_data(mesh.edges)
-        mesh.polygons.data = [[i + self_vertices_number for i in face] for face in mesh.polygons]
-        self.polygons.join_data(mesh.polygons)
+        edges = MeshElements(mesh.edges.data + self_vertices_number)
+        edges.copy_attributes(mesh.edges)
+        self.edges.join_data(edges)
+        polygons = MeshElements(mesh.polygons.data.shifted(self_vertices_number))
+        polygons.copy_attributes(mesh.polygons)
+        self.polygons.join_data(polygons)
         return self
 
     def apply_matrix(self, matrix) -> NpMesh:
         """It will generate new vertices with given matrix applied"""
-        self.vertices.data = matrix_apply_np(self.vertices.data, matrix)
+        self.vertices.data = matrix_apply_np(self.vertices.data, matrix).astype(np.float32, copy=False)
         return self
 
     def cast(self, mesh_type: Type[Mesh]) -> Mesh:
         """Convert itself into other mesh types"""
         if mesh_type == PyMesh:
-            cast_mesh = PyMesh(self.vertices.data.tolist(), self.edges.data, self.polygons.data)
-            cast_mesh.vertices.copy_attributes(self.vertices)
-            cast_mesh.edges.copy_attributes(self.edges)
-            cast_mesh.polygons.copy_attributes(self.polygons)
+            cast_mesh = PyMesh(self.vertices.data.tolist(), self.edges.data.tolist(), self.polygons.data.tolist())
+            for elements, np_elements in zip([cast_mesh.vertices, cast_mesh.edges, cast_mesh.polygons],
+                                             [self.vertices, self.edges, self.polygons]):
+                for attr in np_elements.attributes:
+                    data = np_elements[attr]
+                    elements[attr] = data.tolist() if isinstance(data, np.ndarray) else data
             return cast_mesh
         elif mesh_type == NpMesh:
             return self
@@ -208,6 +226,61 @@ class NpMesh(Mesh):
             raise TypeError(f'"{type(self).__name__}" type can not be converted to {mesh_type.__name__}')
 
 
+class PolygonsCSR:
+    """
+    Polygons in the same layout as in Blender meshes:
+    indexes of vertices of all polygons are kept in one flat array,
+    polygon is defined by position of its first index in the array (loop_start)
+    and by number of its vertices (loop_total)
+    """
+    def __init__(self, loop_start: np.ndarray, loop_total: np.ndarray, indices: np.ndarray):
+        self.loop_start = loop_start
+        self.loop_total = loop_total
+        self.indices = indices
+
+    @classmethod
+    def from_polygons(cls, polygons: Union[List[PyPolygon], np.ndarray, PolygonsCSR, None]) -> PolygonsCSR:
+        """Polygons can be given as list of lists, array of polygons with equal number of sides or CSR"""
+        if isinstance(polygons, PolygonsCSR):
+            return polygons
+        if polygons is None or len(polygons) == 0:
+            return cls(np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32))
+        if isinstance(polygons, np.ndarray) and polygons.ndim == 2:
+            polygons_number, sides = polygons.shape
+            loop_total = np.full(polygons_number, sides, dtype=np.int32)
+            indices = polygons.astype(np.int32, copy=False).ravel()
+        else:
+            loop_total = np.fromiter(map(len, polygons), dtype=np.int32, count=len(polygons))
+            indices = np.fromiter(chain.from_iterable(polygons), dtype=np.int32, count=loop_total.sum())
+        loop_start = np.cumsum(loop_total, dtype=np.int32) - loop_total
+        return cls(loop_start, loop_total, indices)
+
+    @classmethod
+    def concatenate(cls, polygons: List[PolygonsCSR]) -> PolygonsCSR:
+        """Polygons should already refer to vertices of joined mesh, see `shifted` method"""
+        if not polygons:
+            return cls.from_polygons(None)
+        loops_number = np.cumsum([0] + [len(p.indices) for p in polygons[:-1]]).tolist()
+        return cls(np.concatenate([p.loop_start + offset for p, offset in zip(polygons, loops_number)]),
+                   np.concatenate([p.loop_total for p in polygons]),
+                   np.concatenate([p.indices for p in polygons]))
+
+    def shifted(self, offset: int) -> PolygonsCSR:
+        """New polygons with vertex indexes shifted by the offset, loop arrays are shared"""
+        return PolygonsCSR(self.loop_start, self.loop_total, self.indices + offset)
+
+    def tolist(self) -> List[PyPolygon]:
+        if not len(self):
+            return []
+        return [p.tolist() for p in np.split(self.indices, self.loop_start[1:])]
+
+    def __len__(self):
+        return len(self.loop_total)
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+
 class MeshElements(Collection):
     """
     Class for data of mesh elements such as vertices, edges, polygons
@@ -233,7 +306,11 @@ class MeshElements(Collection):
         Merging two elements data into first
         Also attributes are merged
         """
-        if self._attrs or other._attrs:
+        if isinstance(self.data, (np.ndarray, PolygonsCSR)):
+            joined = MeshElements([])
+            joined.join_attributes([self, other])
+            self._attrs = joined._attrs
+        elif self._attrs or other._attrs:
             for key in self._attrs.keys() | other._attrs.keys():
                 self._attrs[key] = list(chain(fixed_iter(self._attrs.get(key), len(self.data)),
                                               fixed_iter(other._attrs.get(key), len(other.data))))
@@ -241,9 +318,29 @@ class MeshElements(Collection):
             self.data = self.data + other.data
         elif isinstance(self.data, np.ndarray):
             self.data = np.concatenate([self.data, other.data])
+        elif isinstance(self.data, PolygonsCSR):
+            self.data = PolygonsCSR.concatenate([self.data, other.data])
         else:
             raise TypeError(f'Type "{type(self.data).__name__}" of "data" attribute does not supported')
 
+    def join_attributes(self, elements: List[MeshElements]):
+        """
+        Set attributes as joined attributes of given elements, which data should be already joined
+        Attributes are converted into arrays, missing values are filled by nearest given values
+        """
+        for key in set().union(*(e.attributes for e in elements)):
+            parts = [numpy_full_list(e[key], len(e)) if len(e) and key in e.attributes and len(e[key]) else None
+                     for e in elements]
+            fill = next((p[:1] for p in parts if p is not None), None)
+            if fill is None:
+                continue
+            for i, (part, e) in enumerate(zip(parts, elements)):
+                if part is None:
+                    parts[i] = np.repeat(fill, len(e), axis=0)
+                elif len(part):
+                    fill = part[-1:]
+            self._attrs[key] = np.concatenate(parts)
+
     def copy_attributes(self, other: MeshElements):
         """Copy attributes from given other mesh elements"""
         self._attrs.update(other._attrs)
@@ -266,7 +363,7 @@ class MeshElements(Collection):
         return item in self.data
 
     def __bool__(self):
-        return bool(self.data)
+        return len(self.data) > 0
 
     def __getitem__(self, item):
         return self._attrs[item]
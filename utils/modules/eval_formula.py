@@ -116,24 +116,35 @@ def sv_compile(string):
         root = ast.parse(string, mode='eval')
         return compile(root, "<expression>", 'eval')
     except SyntaxError as e:
-        logging.exception(e)
+        sv_logging.sv_logger.exception(e)
         raise Exception("Invalid expression syntax: " + str(e))
 
+def make_safe_env(allowed_names = None):
+    """
+    Make environment for evaluation of expressions, which allows only
+    functions known to be "safe" to be used. The environment can be reused
+    to evaluate compiled expressions many times with different values of
+    variables, by updating variables in it.
+    """
+    if allowed_names is None:
+        allowed_names = safe_names
+    env = dict()
+    env.update(allowed_names)
+    env["__builtins__"] = {}
+    return env
+
 def safe_eval_compiled(compiled, variables, allowed_names = None):
     """
     Evaluate expression, allowing only functions known to be "safe"
     to be used.
     """
-    if allowed_names is None:
-        allowed_names = safe_names
     try:
-        env = dict()
-        env.update(allowed_names)
+        env = make_safe_env(allowed_names)
         env.update(variables)
         env["__builtins__"] = {}
         return eval(compiled, env)
     except SyntaxError as e:
-        sv_logging.exception(e)
+        sv_logging.sv_logger.exception(e)
         raise Exception("Invalid expression syntax: " + str(e))
 
 # It could be safer...
@@ -150,6 +161,6 @@ def safe_eval(string, variables):
         root = ast.parse(string, mode='eval')
         return eval(compile(root, "<expression>", 'eval'), env)
     except SyntaxError as e:
-        logging.exception(e)
+        sv_logging.sv_logger.exception(e)
         raise Exception("Invalid expression syntax: " + str(e))
 
@@ -251,6 +251,52 @@ class SvMeshData(bpy.types.PropertyGroup):
 
         self.mesh.update()
 
+    def regenerate_np_mesh(self, mesh_name: str, np_mesh, matrix: Matrix = None, make_changes_test=True):
+        """
+        The same as regenerate_mesh but for meshes of NpMesh type (see sverchok.utils.meshes)
+        Arrays of the mesh are passed to the mesh data block with foreach_set
+        without creating any Python lists
+        """
+        if not self.mesh:
+            self.mesh = bpy.data.meshes.new(name=mesh_name)
+
+        verts = np_mesh.vertices.data
+        edges = np_mesh.edges.data
+        polygons = np_mesh.polygons.data
+
+        if self.mesh.is_editmode:
+            self.regenerate_mesh(mesh_name, verts, edges.tolist(), polygons.tolist(), matrix, make_changes_test)
+            return
+
+        if not make_changes_test or self.is_np_topology_changed(np_mesh):
+            for indices in [edges, polygons.indices]:
+                if len(indices) and (indices.min() < 0 or indices.max() >= len(verts)):
+                    raise IndexError("Mesh elements refer to nonexistent vertices")
+            mesh = self.mesh
+            mesh.clear_geometry()
+            mesh.vertices.add(len(verts))
+            mesh.vertices.foreach_set('co', verts.ravel())
+            mesh.edges.add(len(edges))
+            mesh.edges.foreach_set('vertices', edges.ravel())
+            mesh.loops.add(len(polygons.indices))
+            mesh.loops.foreach_set('vertex_index', polygons.indices)
+            mesh.polygons.add(len(polygons))
+            mesh.polygons.foreach_set('loop_start', polygons.loop_start)
+            if bpy.app.version < (3, 6):
+                # since 3.6 size of polygons is derived from loop_start and it is read only
+                mesh.polygons.foreach_set('loop_total', polygons.loop_total)
+            # Sverchok edges can exclude edges of polygons
+            mesh.update(calc_edges=True)
+            # unlike bmesh, foreach_set accepts polygons with less than 3 or
+            # repeated vertices and duplicated polygons, which crash Blender later
+            mesh.validate(clean_customdata=False)
+        else:
+            self.update_vertices(verts)
+
+        if matrix:
+            self.mesh.transform(matrix)
+        self.mesh.update()
+
     def set_smooth(self, is_smooth_mesh):
         """Make mesh smooth or flat"""
         if is_smooth_mesh:
@@ -276,12 +322,28 @@ class SvMeshData(bpy.types.PropertyGroup):
             are_polygons_changed = any([list(p.vertices) != f for _, p, f in zip(range(5), self.mesh.polygons, faces)])
             return number_is_changed or are_polygons_changed
 
+    def is_np_topology_changed(self, np_mesh) -> bool:
+        """
+        The same as is_topology_changed but for NpMesh
+        All indexes of polygons are compared, which is still fast for arrays
+        """
+        polygons = np_mesh.polygons.data
+        if len(self.mesh.vertices) != len(np_mesh.vertices):
+            return True
+        if not len(polygons):
+            return len(self.mesh.edges) != len(np_mesh.edges)
+        if len(self.mesh.polygons) != len(polygons) or len(self.mesh.loops) != len(polygons.indices):
+            return True
+        vertex_index = np.empty(len(self.mesh.loops), dtype=np.int32)
+        self.mesh.loops.foreach_get('vertex_index', vertex_index)
+        return not np.array_equal(vertex_index, polygons.indices)
+
     def update_vertices(self, verts: Union[list, np.ndarray]):
         """
         Just update position of mesh vertices, order and number of given vertices should be the same as mesh
         numpy array with float32 type will be 10 times faster than any other input data
         """
-        verts = np.array(verts, dtype=np.float32)  # todo will be this fast if it is already array float 32?
+        verts = np.asarray(verts, dtype=np.float32)  # no copy for float32 arrays
         self.mesh.vertices.foreach_set('co', np.ravel(verts))
 
     def copy(self) -> bpy.types.Mesh:
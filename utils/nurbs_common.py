@@ -6,7 +6,8 @@
 # License-Filename: LICENSE
 
 import numpy as np
-from math import sqrt
+from math import sqrt, factorial
+from functools import lru_cache
 
 from sverchok.utils.math import binomial
 from sverchok.utils.curve import knotvector as sv_knotvector
@@ -182,127 +183,137 @@ def from_homogenous(control_points):
     else:
         raise Exception(f"control_points have ndim={control_points.ndim}, supported are only 2 and 3")
 
+class SvNurbsBasisTable(object):
+    """
+    Precomputed data of all nonzero basis functions of degree p for
+    a knotvector. On each non-empty knot span, each of p+1 basis functions,
+    which are nonzero on it, is a polynomial of degree p. The table keeps
+    coefficients of these polynomials (and of their derivatives) in terms of
+    local parameter x = (t - u[s]) / (u[s+1] - u[s]).
+
+    Tables are shared between all curves and surfaces with the same
+    knotvector and degree, see SvNurbsBasisFunctions.table().
+    """
+    def __init__(self, knotvector, degree, coefficients):
+        u = knotvector
+        p = degree
+        self.knotvector = u
+        self.degree = p
+        self.first_span = u.searchsorted(u[0], side='right') - 1
+        self.last_span = u.searchsorted(u[-1], side='left') - 1
+        self.starts = u[:-1]
+        lengths = u[1:] - u[:-1]
+        inv_lengths = np.zeros_like(lengths)
+        nonempty = lengths > 0
+        inv_lengths[nonempty] = 1.0 / lengths[nonempty]
+        self.inv_lengths = inv_lengths
+        # derivatives[k]: array of shape (p+1-k, n_spans, p+1);
+        # derivatives[k][j, s, r] is coefficient at x^j of k'th derivative
+        # of basis function N[s-p+r, p] on span s.
+        self.derivatives = []
+        for k in range(p+1):
+            falling = np.array([factorial(j+k) / factorial(j) for j in range(p+1-k)])
+            scale = inv_lengths[:, np.newaxis, np.newaxis] ** k
+            coeffs = coefficients[:, :, k:] * falling * scale
+            self.derivatives.append(np.ascontiguousarray(np.transpose(coeffs, axes=(2, 0, 1))))
+
+    @property
+    def nbytes(self):
+        return sum(c.nbytes for c in self.derivatives) + self.starts.nbytes + self.inv_lengths.nbytes
+
+    def evaluate(self, ts, spans, n):
+        """
+        Values of nonzero basis functions and their derivatives up to order n.
+        Returns an array of shape (n+1, len(ts), p+1).
+        """
+        p = self.degree
+        xs = (ts - self.starts[spans]) * self.inv_lengths[spans]
+        xs = xs[:, np.newaxis]
+        ders = np.zeros((n+1, len(ts), p+1))
+        # Horner's scheme
+        for k in range(min(n, p)+1):
+            coeffs = self.derivatives[k]
+            values = ders[k]
+            np.take(coeffs[-1], spans, axis=0, out=values)
+            for j in range(len(coeffs)-2, -1, -1):
+                values *= xs
+                values += np.take(coeffs[j], spans, axis=0)
+        return ders
+
+
+@lru_cache(maxsize=256)
+def _get_basis_table(knotvector_bytes, degree):
+    u = np.frombuffer(knotvector_bytes, dtype=np.float64)
+    p = degree
+    basis = SvNurbsBasisFunctions(u)
+    # Taylor series of basis functions at the start of each non-empty span
+    spans = np.flatnonzero(u[1:] > u[:-1])
+    ders = basis._calc_nonzero_derivatives(p, u[spans], spans, p)
+    lengths = u[spans+1] - u[spans]
+    coefficients = np.zeros((len(u)-1, p+1, p+1))
+    for k in range(p+1):
+        coefficients[spans, :, k] = ders[k].T * (lengths ** k / factorial(k))[:, np.newaxis]
+    return SvNurbsBasisTable(u, p, coefficients)
+
+
 class SvNurbsBasisFunctions(object):
+    """
+    B-Spline basis functions for a knotvector.
+
+    Values are calculated by means of SvNurbsBasisTable; tables are cached
+    in a bounded LRU cache and are shared between all instances which have
+    the same knotvector. This relies on knotvectors not being changed in
+    place.
+    """
     def __init__(self, knotvector):
         self.knotvector = np.array(knotvector)
-        self._cache = dict()
+        self._tables = dict()
+
+    def table(self, p):
+        """
+        Get precomputed table of basis functions of degree p.
+        """
+        table = self._tables.get(p)
+        if table is None:
+            u = np.ascontiguousarray(self.knotvector, dtype=np.float64)
+            table = self._tables[p] = _get_basis_table(u.tobytes(), p)
+        return table
 
     def function(self, i, p, reset_cache=True):
-        if reset_cache:
-            self._cache = dict()
-        def calc(us):
-            value = self._cache.get((i,p, 0))
-            if value is not None:
-                return value
-
-            u = self.knotvector
-            if p <= 0:
-                if i < 0 or i >= len(u):
-
-                    value = np.zeros_like(us)
-                    self._cache[(i,p,0)] = value
-                    return value
-                        
-                else:
-
-                    if i+1 >= len(u):
-                        u_next = u[-1]
-                        is_last = True
-                    else:
-                        u_next = u[i+1]
-                        is_last = u_next >= u[-1]
-                    if is_last:
-                        c2 = us <= u_next
-                    else:
-                        c2 = us < u_next
-                    condition = np.logical_and(u[i] <= us, c2)
-                    value = np.where(condition, 1.0, 0.0)
-                    self._cache[(i,p,0)] = value
-                    return value
-
-            else:
-                denom1 = (u[i+p] - u[i])
-                denom2 = (u[i+p+1] - u[i+1])
-
-                if denom1 != 0:
-                    n1 = self.function(i, p-1, reset_cache=False)(us)
-                if denom2 != 0:
-                    n2 = self.function(i+1, p-1, reset_cache=False)(us)
-
-                if denom1 == 0 and denom2 == 0:
-                    value = np.zeros_like(us)
-                    self._cache[(i,p,0)] = value
-                    return value
-                elif denom1 == 0 and denom2 != 0:
-                    c2 = (u[i+p+1] - us) / denom2
-                    value = c2 * n2
-                    self._cache[(i,p,0)] = value
-                    return value
-                elif denom1 != 0 and denom2 == 0:
-                    c1 = (us - u[i]) / denom1
-                    value = c1 * n1
-                    self._cache[(i,p,0)] = value
-                    return value
-                else: # denom1 != 0 and denom2 != 0
-                    c1 = (us - u[i]) / denom1
-                    c2 = (u[i+p+1] - us) / denom2
-                    value = c1 * n1 + c2 * n2
-                    self._cache[(i,p,0)] = value
-                    return value
-        return calc
+        """
+        Returns a function which calculates values of i'th basis function of
+        degree p. reset_cache parameter is kept for compatibility only.
+        """
+        return self.derivative(i, p, 0)
 
     def derivative(self, i, p, k, reset_cache=True):
-        if reset_cache:
-            self._cache = dict()
-
-        if k == 0:
-            return self.function(i, p, reset_cache=False)
-
+        """
+        Returns a function which calculates values of k'th derivative of i'th
+        basis function of degree p. reset_cache parameter is kept for
+        compatibility only.
+        """
         def calc(us):
-            value = self._cache.get((i, p, k))
-            if value is not None:
-                return value
-            
-            n1 = self.derivative(i, p-1, k-1, reset_cache=False)(us)
-            n2 = self.derivative(i+1, p-1, k-1, reset_cache=False)(us)
-            u = self.knotvector
-
-            denom1 = u[i+p] - u[i]
-            denom2 = u[i+p+1] - u[i+1]
-
-            if denom1 == 0:
-                s1 = np.zeros_like(us)
-            else:
-                s1 = n1 / denom1
-
-            if denom2 == 0:
-                s2 = np.zeros_like(us)
-            else:
-                s2 = n2 / denom2
-
-            value = p*(s1 - s2)
-            self._cache[(i,p,k)] = value
-            return value
-        
+            us = np.asarray(us, dtype=np.float64)
+            ts = us.flatten()
+            spans, _, ders = self.nonzero_derivatives(p, ts, k)
+            rs = i - spans + p
+            good = (rs >= 0) & (rs <= p)
+            values = np.zeros_like(ts)
+            values[good] = ders[k, good, rs[good]]
+            return values.reshape(us.shape)
         return calc
 
     def fraction(self, i, p, weights, reset_cache=True):
-
-        if reset_cache:
-            self._cache = dict()
         n = len(weights)
 
         def calc(us):
-            numerator = self.function(i,p, reset_cache=reset_cache)(us) * weights[i]
-            ds = [self.function(j,p, reset_cache=False)(us) * weights[j] for j in range(n)]
+            numerator = self.function(i,p)(us) * weights[i]
+            ds = [self.function(j,p)(us) * weights[j] for j in range(n)]
             denominator = sum(ds)
             return nurbs_divide_flat(numerator, denominator)
-
         return calc
 
     def weighted_derivative(self, i, p, k, weights, reset_cache=True):
-        if reset_cache:
-            self._cache = dict()
         n = len(weights)
 
         def calc(us):
@@ -313,6 +324,109 @@ class SvNurbsBasisFunctions(object):
         
         return calc
 
+    def find_span(self, ts):
+        """
+        Find knot spans for an array of parameter values.
+
+        Returns:
+            a tuple (spans, inside):
+            * spans: array of indices s, such that u[s] <= t < u[s+1]
+              (the last non-empty span is closed from the right; parameters
+              outside of the knotvector range get the nearest non-empty span);
+            * inside: boolean mask of parameters which lie within
+              the knotvector range. All basis functions are zero outside it.
+        """
+        u = self.knotvector
+        ts = np.asarray(ts)
+        spans = u.searchsorted(ts, side='right') - 1
+        first_span = u.searchsorted(u[0], side='right') - 1
+        last_span = u.searchsorted(u[-1], side='left') - 1
+        spans = np.clip(spans, first_span, last_span)
+        inside = (ts >= u[0]) & (ts <= u[-1])
+        return spans, inside
+
+    def nonzero_derivatives(self, p, ts, n=0):
+        """
+        Calculate values of basis functions of degree p, which are nonzero at
+        given parameter values, together with their derivatives up to order n.
+        Polynomial coefficients of basis functions are taken from the table,
+        so evaluation cost is O(len(ts) * p^2 * n), and does not depend on the
+        number of control points.
+
+        Returns:
+            a tuple (spans, inside, ders):
+            * spans, inside: as returned by find_span();
+            * ders: array of shape (n+1, len(ts), p+1). ders[k, j, r] is
+              the k'th derivative of basis function N[spans[j]-p+r, p] at ts[j].
+        """
+        ts = np.asarray(ts, dtype=np.float64)
+        spans, inside = self.find_span(ts)
+        ders = self.table(p).evaluate(ts, spans, n)
+        ders[:, ~inside, :] = 0.0
+        return spans, inside, ders
+
+    def _calc_nonzero_derivatives(self, p, ts, spans, n):
+        """
+        Vectorized version of algorithm A2.3 from "The NURBS Book".
+        It is used to fill tables of basis functions.
+        Returns an array of shape (n+1, p+1, len(ts)).
+        """
+        n_ts = len(ts)
+
+        # Pad the knotvector, so that the algorithm can address p knots
+        # before the first one and after the last one. Values of basis
+        # functions with valid indexes do not depend on these knots.
+        u = self.knotvector
+        knots = np.concatenate(([u[0]]*p, u, [u[-1]]*p))
+        padded = spans + p
+
+        left = np.zeros((p+1, n_ts))
+        right = np.zeros((p+1, n_ts))
+        # ndu[j, r] for j <= r: basis functions values;
+        # for j > r: knot differences.
+        ndu = np.zeros((p+1, p+1, n_ts))
+        ndu[0, 0] = 1.0
+        for j in range(1, p+1):
+            left[j] = ts - knots[padded + 1 - j]
+            right[j] = knots[padded + j] - ts
+            saved = 0.0
+            for r in range(j):
+                ndu[j, r] = right[r+1] + left[j-r]
+                temp = ndu[r, j-1] / ndu[j, r]
+                ndu[r, j] = saved + right[r+1] * temp
+                saved = left[j-r] * temp
+            ndu[j, j] = saved
+
+        ders = np.zeros((n+1, p+1, n_ts))
+        ders[0] = ndu[:, p]
+        for r in range(p+1):
+            a = np.zeros((2, p+1, n_ts))
+            a[0, 0] = 1.0
+            s1, s2 = 0, 1
+            for k in range(1, min(n, p)+1):
+                d = np.zeros((n_ts,))
+                rk = r - k
+                pk = p - k
+                if r >= k:
+                    a[s2, 0] = a[s1, 0] / ndu[pk+1, rk]
+                    d += a[s2, 0] * ndu[rk, pk]
+                j1 = 1 if rk >= -1 else -rk
+                j2 = k-1 if r-1 <= pk else p-r
+                for j in range(j1, j2+1):
+                    a[s2, j] = (a[s1, j] - a[s1, j-1]) / ndu[pk+1, rk+j]
+                    d += a[s2, j] * ndu[rk+j, pk]
+                if r <= pk:
+                    a[s2, k] = -a[s1, k-1] / ndu[pk+1, r]
+                    d += a[s2, k] * ndu[r, pk]
+                ders[k, r] = d
+                s1, s2 = s2, s1
+
+        c = p
+        for k in range(1, min(n, p)+1):
+            ders[k] *= c
+            c *= (p - k)
+
+        return ders
 
 class CantInsertKnotException(Exception):
     pass
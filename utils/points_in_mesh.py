@@ -0,0 +1,230 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Vectorized classification of points against a mesh.
+
+All functions look at the mesh along a direction: coordinates are rotated so
+that the direction becomes Z axis, and points are tested against triangles
+projected to XY plane. The test uses exact "top-left" rule, so a point lying
+on an edge or a vertex shared by several triangles is covered by exactly one
+of them, and results do not depend on random choices.
+"""
+
+import numpy as np
+
+
+def _triangulate(faces):
+    """Fan triangulation. Returns triangles and index of face of each triangle"""
+    tris = [(f[0], f[i], f[i + 1]) for f in faces for i in range(1, len(f) - 1)]
+    face_idx = [n for n, f in enumerate(faces) for i in range(1, len(f) - 1)]
+    return np.array(tris, dtype=np.int64).reshape(-1, 3), np.array(face_idx, dtype=np.int64)
+
+
+def _basis(direction):
+    """Rows of the matrix are orthonormal vectors, the last one is the direction"""
+    z = np.asarray(direction, dtype=np.float64)
+    z = z / np.linalg.norm(z)
+    helper = np.array([1.0, 0.0, 0.0]) if abs(z[0]) < 0.9 else np.array([0.0, 1.0, 0.0])
+    x = np.cross(helper, z)
+    x /= np.linalg.norm(x)
+    y = np.cross(z, x)
+    return np.array([x, y, z])
+
+
+class _TriangleGrid:
+    """Uniform grid over XY projection of triangles, cells store indexes of
+    triangles which bounding boxes touch the cells"""
+    def __init__(self, verts, tris):
+        xy = verts[tris][:, :, :2]
+        lo = xy.min(axis=1)
+        hi = xy.max(axis=1)
+        self.bb_min = lo.min(axis=0)
+        self.bb_max = hi.max(axis=0)
+        self.res = res = max(1, int(np.sqrt(len(tris))))
+        size = self.bb_max - self.bb_min
+        self.cell_size = np.where(size > 0, size / res, 1.0)
+
+        i0 = self._cell_coords(lo)
+        i1 = self._cell_coords(hi)
+        nx = i1[:, 0] - i0[:, 0] + 1
+        ny = i1[:, 1] - i0[:, 1] + 1
+        counts = nx * ny
+        tri_idx = np.repeat(np.arange(len(tris)), counts)
+        local = np.arange(len(tri_idx)) - np.repeat(np.cumsum(counts) - counts, counts)
+        nx = np.repeat(nx, counts)
+        cells = (np.repeat(i0[:, 1], counts) + local // nx) * res + np.repeat(i0[:, 0], counts) + local % nx
+
+        order = np.argsort(cells, kind='stable')
+        self.tris = tri_idx[order]
+        self.counts = np.bincount(cells, minlength=res * res)
+        self.starts = np.cumsum(self.counts) - self.counts
+
+    def _cell_coords(self, xy):
+        ij = np.floor((xy - self.bb_min) / self.cell_size).astype(np.int64)
+        return np.clip(ij, 0, self.res - 1)
+
+    def cells(self, xy):
+        """Cell index of each point, -1 for points outside of the grid"""
+        ij = self._cell_coords(xy)
+        cells = ij[:, 1] * self.res + ij[:, 0]
+        outside = ((xy < self.bb_min) | (xy > self.bb_max)).any(axis=1)
+        cells[outside] = -1
+        return cells
+
+    def pairs(self, cells):
+        """Indexes of points and of triangles which can cover them"""
+        counts = np.where(cells >= 0, self.counts[np.maximum(cells, 0)], 0)
+        point_idx = np.repeat(np.arange(len(cells)), counts)
+        offsets = np.arange(len(point_idx)) - np.repeat(np.cumsum(counts) - counts, counts)
+        starts = np.repeat(self.starts[np.maximum(cells, 0)], counts)
+        return point_idx, self.tris[starts + offsets]
+
+
+class _ProjectedMesh:
+    """Triangles of the mesh projected along given direction"""
+    def __init__(self, verts, tris, direction):
+        self.verts = verts @ _basis(direction).T
+        self.tris = tris
+        v = self.verts[tris]
+        area = (v[:, 1, 0] - v[:, 0, 0]) * (v[:, 2, 1] - v[:, 0, 1]) \
+             - (v[:, 1, 1] - v[:, 0, 1]) * (v[:, 2, 0] - v[:, 0, 0])
+        self.orientation = np.sign(area).astype(np.int64)
+
+        # edges which include points lying on them, in counterclockwise orientation
+        d = (np.roll(v, -1, axis=1) - v)[:, :, :2] * self.orientation[:, np.newaxis, np.newaxis]
+        self.top_left = (d[:, :, 1] < 0) | ((d[:, :, 1] == 0) & (d[:, :, 0] < 0))
+
+        valid = self.orientation != 0
+        self.grid = _TriangleGrid(self.verts, tris[valid]) if valid.any() else None
+        self.valid_idx = np.flatnonzero(valid)
+
+    def _edge_functions(self, points, tri_idx):
+        # each edge function is calculated from the vertex with lower index,
+        # so that triangles sharing an edge get exactly opposite values
+        tris = self.tris[tri_idx]
+        result = []
+        for k in range(3):
+            a_idx = tris[:, k]
+            b_idx = tris[:, (k + 1) % 3]
+            lo = np.minimum(a_idx, b_idx)
+            hi = np.maximum(a_idx, b_idx)
+            a = self.verts[lo]
+            b = self.verts[hi]
+            e = (b[:, 0] - a[:, 0]) * (points[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (points[:, 0] - a[:, 0])
+            result.append(np.where(a_idx < b_idx, e, -e))
+        return result
+
+    def covering(self, points, chunk_size=2**21):
+        """
+        Yields chunks of (point indexes, triangle indexes, orientation, heights)
+        for pairs of points and triangles covering them in XY projection.
+        Heights are Z coordinates of triangles over the points.
+        """
+        if self.grid is None:
+            return
+        cells = self.grid.cells(points[:, :2])
+        # split points so that each chunk gives about chunk_size candidate pairs
+        n_pairs = np.cumsum(np.where(cells >= 0, self.grid.counts[np.maximum(cells, 0)], 0))
+        ends = np.searchsorted(n_pairs, np.arange(1, n_pairs[-1] // chunk_size + 1) * chunk_size)
+        ends = np.unique(np.append(np.maximum(ends, 1), len(points)))
+        for start, end in zip(np.append(0, ends[:-1]), ends):
+            point_idx, tri_idx = self.grid.pairs(cells[start:end])
+            point_idx += start
+            tri_idx = self.valid_idx[tri_idx]
+
+            p = points[point_idx]
+            orientation = self.orientation[tri_idx]
+            e = [e_k * orientation for e_k in self._edge_functions(p, tri_idx)]
+            top_left = self.top_left[tri_idx]
+            covered = np.ones(len(p), dtype=bool)
+            for k in range(3):
+                covered &= (e[k] > 0) | ((e[k] == 0) & top_left[:, k])
+            point_idx, tri_idx, orientation = point_idx[covered], tri_idx[covered], orientation[covered]
+            e0, e1, e2 = e[0][covered], e[1][covered], e[2][covered]
+
+            # barycentric interpolation, edge k is opposite to vertex k+2
+            z = self.verts[self.tris[tri_idx]][:, :, 2]
+            heights = (e0 * z[:, 2] + e1 * z[:, 0] + e2 * z[:, 1]) / (e0 + e1 + e2)
+            yield point_idx, tri_idx, orientation, heights
+
+
+def inside_mesh_winding(verts, faces, points, direction=(0.0, 0.0, 1.0)):
+    """
+    Check which points are inside of the closed mesh.
+
+    The ray from each point along the direction is traced, and crossings of
+    faces are counted: +1 for faces with normals looking along the ray, -1
+    for opposite faces. The point is inside if the sum (winding number) is not
+    zero. Unlike crossing parity, this works correctly with concave faces,
+    which are triangulated into overlapping triangles. Faces must be oriented
+    consistently, though it does not matter whether normals look outside.
+
+    Args:
+        verts: vertices of the mesh, list or np.array of shape (m, 3).
+        faces: faces of the mesh.
+        points: points to check, list or np.array of shape (n, 3).
+        direction: direction of the rays.
+
+    Returns:
+        np.array of shape (n,) with bool values.
+    """
+    verts = np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    tris, _ = _triangulate(faces)
+    winding = np.zeros(len(points), dtype=np.int64)
+    if not len(tris) or not len(points):
+        return winding != 0
+
+    mesh = _ProjectedMesh(verts, tris, direction)
+    points = points @ _basis(direction).T
+    for point_idx, _, orientation, heights in mesh.covering(points):
+        ahead = heights > points[point_idx, 2]
+        winding += np.bincount(point_idx[ahead], weights=orientation[ahead], minlength=len(points)).astype(np.int64)
+    return winding != 0
+
+
+def inside_mesh_projection(verts, faces, points, direction=(0.0, 0.0, 1.0), max_distance=None):
+    """
+    Check which points lie on faces of the mesh when looking along the
+    direction, i.e. which points can be projected to the mesh along the
+    direction (in any of two senses). If max_distance is given, only
+    projections not farther than this distance are taken into account.
+
+    Args:
+        verts: vertices of the mesh, list or np.array of shape (m, 3).
+        faces: faces of the mesh.
+        points: points to check, list or np.array of shape (n, 3).
+        direction: direction of the projection.
+        max_distance: maximum valid distance of the projection.
+
+    Returns:
+        np.array of shape (n,) with bool values.
+    """
+    verts = np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    tris, tri_faces = _triangulate(faces)
+    inside = np.zeros(len(points), dtype=bool)
+    if not len(tris) or not len(points):
+        return inside
+
+    mesh = _ProjectedMesh(verts, tris, direction)
+    points = points @ _basis(direction).T
+    n_faces = len(faces)
+    for point_idx, tri_idx, orientation, heights in mesh.covering(points):
+        distances = np.abs(heights - points[point_idx, 2])
+        # triangles of a concave face can overlap, so the point is on the face
+        # if the sum of orientations of triangles covering it is not zero
+        keys, key_idx = np.unique(point_idx * n_faces + tri_faces[tri_idx], return_inverse=True)
+        key_idx = key_idx.ravel()
+        on_face = np.bincount(key_idx, weights=orientation, minlength=len(keys)) != 0
+        if max_distance is not None:
+            nearest = np.full(len(keys), np.inf)
+            np.minimum.at(nearest, key_idx, distances)
+            on_face &= nearest < max_distance
+        inside[keys[on_face] // n_faces] = True
+    return inside
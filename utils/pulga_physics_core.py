@@ -7,6 +7,12 @@
 
 import numpy as np
 
+from sverchok.dependencies import scipy
+
+if scipy is not None:
+    from scipy.spatial import cKDTree
+
+
 def cross_indices3(n):
     '''create crossed indices'''
 
@@ -70,15 +76,51 @@ def expand_pols_numpy(p, len_max):
     return new_pols
 
 
+class VerletList():
+    '''Pairs of particles which can touch each other: the ones closer than
+    sum of maximum radiuses plus a skin distance. The list is rebuilt only
+    when some particle moved more than half of the skin since last build,
+    or particles became bigger than it was expected'''
+    def __init__(self, max_rad=None):
+        # upper limit of radiuses of growing particles
+        self.max_rad = max_rad
+        self.indexes = None
+        self.ref_verts = None
+        self.radius = 0.0
+        self.skin = 0.0
+
+    def update(self, verts, rads):
+        '''get pairs of particles which can touch each other'''
+        radius = np.amax(rads)
+        if self.max_rad is not None:
+            radius = max(radius, self.max_rad)
+        if self.indexes is not None and len(verts) == len(self.ref_verts) and radius <= self.radius:
+            moved = np.linalg.norm(verts - self.ref_verts, axis=1)
+            if 2 * np.amax(moved) <= self.skin:
+                return self.indexes
+
+        self.radius = radius
+        self.skin = radius
+        kd_tree = cKDTree(verts)
+        self.indexes = kd_tree.query_pairs(r=2*radius + self.skin, output_type='ndarray')
+        self.ref_verts = verts.copy()
+        return self.indexes
+
+
 def self_react(params):
     '''behaviors between particles: collide, attract and fit'''
     ps, collision, sum_rad, gates, att_params, fit_params = params
     use_collide, use_attract, use_grow = gates
-    indexes = ps.params['indexes']
-    if use_grow:
+    verlet = ps.params.get('verlet')
+    if verlet is not None:
+        indexes = verlet.update(ps.verts, ps.rads)
         sum_rad = ps.rads[indexes[:, 0]] + ps.rads[indexes[:, 1]]
-        if use_attract:
-            att_params[2] = ps.mass[indexes[:, 0]] * ps.mass[indexes[:, 1]]
+    else:
+        indexes = ps.params['indexes']
+        if use_grow:
+            sum_rad = ps.rads[indexes[:, 0]] + ps.rads[indexes[:, 1]]
+            if use_attract:
+                att_params[2] = ps.mass[indexes[:, 0]] * ps.mass[indexes[:, 1]]
     dif_v = ps.verts[indexes[:, 0], :] - ps.verts[indexes[:, 1], :]
     dist = np.linalg.norm(dif_v, axis=1)
     mask = sum_rad > dist
@@ -88,24 +130,21 @@ def self_react(params):
     some_attractions = use_attract and(len(index_inter) < len(indexes))
 
     if some_collisions or some_attractions:
-        result = np.zeros((ps.v_len, ps.v_len, 3), dtype=np.float64)
         dist_cor = np.clip(dist, 1e-6, 1e4)
         normal_v = dif_v/dist_cor[:, np.newaxis]
 
         if some_collisions:
-            self_collision_force(result, dist, sum_rad, index_inter, mask, normal_v, collision)
+            self_collision_force(ps.r, dist, sum_rad, index_inter, mask, normal_v, collision)
         if some_attractions:
             antimask = np.invert(mask)
-            attract_force(result, dist_cor, antimask, indexes, normal_v, att_params)
-
-        ps.r += np.sum(result, axis=1)
+            attract_force(ps.r, dist_cor, antimask, indexes, normal_v, att_params)
 
     if use_grow:
         fit_force(ps, index_inter, fit_params)
         ps.mass = ps.density * np.power(ps.rads, 3)
 
 
-def self_collision_force(result, dist, sum_rad, index_inter, mask, normal_v, self_collision):
+def self_collision_force(resultant, dist, sum_rad, index_inter, mask, normal_v, self_collision):
     '''apply collision forces between particles'''
 
     id0 = index_inter[:, 0]
@@ -117,11 +156,11 @@ def self_collision_force(result, dist, sum_rad, index_inter, mask, normal_v, sel
     sf = self_collision[:, np.newaxis]
     len0, len1 = [sf[id1], sf[id0]] if variable_coll else [sf, sf]
 
-    result[id0, id1, :] = -no * le * len0
-    result[id1, id0, :] = no * le * len1
+    np.add.at(resultant, id0, -no * le * len0)
+    np.add.at(resultant, id1, no * le * len1)
 
 
-def attract_force(result, dist, mask, index, norm_v, att_params):
+def attract_force(resultant, dist, mask, index, norm_v, att_params):
     '''apply attractions between particles'''
     attract, att_decay, mass_product = att_params
 
@@ -137,8 +176,8 @@ def attract_force(result, dist, mask, index, norm_v, att_params):
     att = attract
     len0, len1 = [att[id1], att[id0]] if variable_att else [att, att]
 
-    result[id0, id1, :] = - direction * len0
-    result[id1, id0, :] = direction * len1
+    np.add.at(resultant, id0, - direction * len0)
+    np.add.at(resultant, id1, direction * len1)
 
 
 def fit_force(ps, index_inter, fit_params):
@@ -172,8 +211,14 @@ def self_react_setup(ps, dicti, forces_composite):
     if not use_self_react:
         return
 
-    ps.params['indexes'] = cross_indices3(ps.v_len)
-    sum_rad = ps.rads[ps.params['indexes'][:, 0]] + ps.rads[ps.params['indexes'][:, 1]]
+    if not use_attract and scipy is not None:
+        # collisions and fitting only happen between touching particles
+        ps.params['verlet'] = VerletList(np.amax(max_rad) if use_grow else None)
+        sum_rad = None
+    else:
+        ps.params['verlet'] = None
+        ps.params['indexes'] = cross_indices3(ps.v_len)
+        sum_rad = ps.rads[ps.params['indexes'][:, 0]] + ps.rads[ps.params['indexes'][:, 1]]
 
     att_params = att_setup(use_attract, ps, np_attract, att_decay)
     fit_params = fit_setup(use_grow, np_grow, min_rad, max_rad)
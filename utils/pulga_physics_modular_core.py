@@ -5,6 +5,9 @@
 # SPDX-License-Identifier: GPL3
 # License-Filename: LICENSE
 
+from collections import defaultdict
+from time import perf_counter
+
 import numpy as np
 from mathutils.bvhtree import BVHTree
 from sverchok.utils.modules.vector_math_utils import angle_between, unit_vector
@@ -16,6 +19,7 @@ from sverchok.utils.surface.freecad import is_solid_face_surface
 from sverchok.dependencies import scipy
 from sverchok.utils.sv_mesh_utils import polygons_to_edges_np
 from sverchok.utils.modules.edge_utils import adjacent_faces_number
+from sverchok.utils.sv_logging import sv_logger
 
 def np_dot(u, v, axis=1):
     return np.sum(u * v, axis=axis)
@@ -714,6 +718,8 @@ class SvAttractionForce():
             self.f_magnitude = self.magnitude
         else:
             self.f_magnitude = numpy_fit_long_repeat([self.magnitude], ps.v_len)[0]
+        if self.use_kdtree:
+            self.neighbours = NeighbourPairs(ps.neighbours_skin)
 
     def add_brute_force(self, ps):
         relations = ps.relations
@@ -736,15 +742,11 @@ class SvAttractionForce():
         np.add.at(ps.force_resultant, id1, direction * len1)
 
     def add_kdt(self, ps):
-        relations = ps.relations
-        indexes = relations.kd_tree.query_pairs(r=self.max_distance, output_type='ndarray')
+        indexes, dif_v, dist = self.neighbours.update(ps, self.max_distance)
         if len(indexes) > 0:
 
             id0 = indexes[:, 0]
             id1 = indexes[:, 1]
-            dif_v = ps.verts[id0, :] - ps.verts[id1, :]
-
-            dist = np.linalg.norm(dif_v, axis=1)
             if self.stop_on_collide:
                 collide_mask = dist > ps.mass[id0] * ps.mass[id1]
                 dist_cor = np.clip(dist[collide_mask], 1e-6, 1e4)
@@ -796,6 +798,8 @@ class SvAlignForce():
             self.f_strength = self.strength
         else:
             self.f_strength = numpy_fit_long_repeat([self.strength], ps.v_len)[0]
+        if self.use_kdtree:
+            self.neighbours = NeighbourPairs(ps.neighbours_skin)
 
 
 
@@ -820,11 +824,8 @@ class SvAlignForce():
 
     def add_kdt(self, ps):
 
-        relations = ps.relations
-        indexes = relations.kd_tree.query_pairs(r=self.max_distance, output_type='ndarray')
+        indexes, dif_v, dist = self.neighbours.update(ps, self.max_distance)
         if len(indexes) > 0:
-            dif_v = ps.verts[indexes[:, 0], :] - ps.verts[indexes[:, 1], :]
-            dist = np.linalg.norm(dif_v, axis=1)
             dist_cor = np.clip(dist, 1e-6, 1e4)
             id0 = indexes[:, 0]
             id1 = indexes[:, 1]
@@ -1385,13 +1386,53 @@ def limit_speed(np_vel, max_vel):
     np_vel[vel_exceded] = np_vel[vel_exceded] / vel_mag[vel_exceded, np.newaxis] * max_vel
 
 
+class NeighbourPairs():
+    '''Verlet neighbour list: stores the pairs of vertices nearer than the
+    search distance plus a skin. The KDTree is queried again only when some
+    vertex moved more than half of the skin since the last query
+    or when the search distance grew beyond the skin'''
+    def __init__(self, skin=0.0):
+        # skin is relative to the search distance, 0 = query every time
+        self.skin = skin
+        self.pairs = None
+        self.ref_verts = None
+        self.reach = 0.0
+
+    def needs_rebuild(self, verts, distance):
+        if self.pairs is None or self.skin <= 0 or len(verts) != len(self.ref_verts):
+            return True
+        max_disp = np.sqrt(np.amax(np.sum((verts - self.ref_verts)**2, axis=1)))
+        return distance + 2 * max_disp > self.reach
+
+    def update(self, ps, distance):
+        '''returns pairs of vertices nearer than distance,
+        their vector differences and their distances'''
+        verts = ps.verts
+        if self.needs_rebuild(verts, distance):
+            self.reach = distance * (1 + self.skin)
+            kd_tree = ps.kd_tree()
+            self.pairs = kd_tree.query_pairs(r=self.reach, output_type='ndarray')
+            self.ref_verts = np.array(kd_tree.data)
+        pairs = self.pairs
+        dif_v = verts[pairs[:, 0], :] - verts[pairs[:, 1], :]
+        dist = np.sqrt(np.einsum('ij,ij->i', dif_v, dif_v))
+        if self.skin > 0:
+            mask = dist <= distance
+            return pairs[mask], dif_v[mask], dist[mask]
+        return pairs, dif_v, dist
+
+
 class PulgaSystem():
     '''Store states'''
     verts, rads, vel, density = [[], [], [], []]
     v_len = []
     params = {}
-    def __init__(self, init_params):
+    def __init__(self, init_params, neighbours_skin=0.0, timings=False):
         self.main_setup(init_params)
+        self.neighbours_skin = neighbours_skin
+        self.timings = defaultdict(float) if timings else None
+        self._kd_tree = None
+        self._kd_tree_iteration = -1
         self.mass = self.density * np.power(self.rads, 3)
         self.random_v = []
         self.force_resultant = np.zeros((self.v_len, 3), dtype=np.float64)
@@ -1422,7 +1463,16 @@ class PulgaSystem():
                 self.size_change = True
 
 
+    def kd_tree(self):
+        '''KDTree of the current vertices, built once per iteration and only if requested'''
+        if self._kd_tree_iteration != self.iteration:
+            self._kd_tree = scipy.spatial.cKDTree(self.verts)
+            self._kd_tree_iteration = self.iteration
+        return self._kd_tree
+
     def relations_setup(self):
+        if 'kd_collisions' in self.relations.needed:
+            self.relations.kd_neighbours = NeighbourPairs(self.neighbours_skin)
         if 'indexes' in self.relations.needed:
             self.relations.indexes = cross_indices3(self.v_len)
         if 'cross_matrix' in self.relations.needed:
@@ -1436,15 +1486,13 @@ class PulgaSystem():
     def relations_update(self):
         if 'max_radius' in self.relations.needed:
             self.relations.max_radius = np.amax(self.rads)
-        if 'kd_tree' in self.relations.needed:
-            self.relations.kd_tree = scipy.spatial.cKDTree(self.verts)
         if 'kd_collisions' in self.relations.needed:
-            indexes = self.relations.kd_tree.query_pairs(r=self.relations.max_radius*2, output_type='ndarray')
+            indexes, dif_v, dist = self.relations.kd_neighbours.update(self, self.relations.max_radius*2)
             self.relations.kd_indexes = indexes
             if len(indexes) > 0:
-                self.relations.kd_dif_v = self.verts[indexes[:, 0], :] - self.verts[indexes[:, 1], :]
+                self.relations.kd_dif_v = dif_v
                 self.relations.kd_sum_rad = self.rads[indexes[:, 0]] + self.rads[indexes[:, 1]]
-                self.relations.kd_dist = np.linalg.norm(self.relations.kd_dif_v, axis=1)
+                self.relations.kd_dist = dist
                 self.relations.kd_mask = self.relations.kd_dist < self.relations.kd_sum_rad
         if self.size_change:
             if 'sum_rad' in self.relations.needed:
@@ -1550,15 +1598,37 @@ class PulgaSystem():
             self.relations_setup()
 
     def iterate(self):
+        '''one step of the simulation, if timings are on the time spent
+        by every force is accumulated'''
+        timings = self.timings
+        if timings is not None:
+            start = perf_counter()
         if self.aware:
             self.relations_update()
         if self.pinned:
             self.params['unpinned'][:] = True
-        for force in self.forces:
-
-            force.add(self)
+        if timings is None:
+            for force in self.forces:
+                force.add(self)
+        else:
+            timings['Relations'] += perf_counter() - start
+            for index, force in enumerate(self.forces):
+                start = perf_counter()
+                force.add(self)
+                # forces of the same type are timed separately
+                timings[f"{index}. {type(force).__name__}"] += perf_counter() - start
+            start = perf_counter()
         self.iteration += 1
         self.apply_forces()
+        if timings is not None:
+            timings['Apply Forces'] += perf_counter() - start
+
+    def timings_report(self):
+        '''text table of the accumulated timings, slowest first'''
+        total = sum(self.timings.values()) or 1.0
+        lines = [f"{name}: {seconds:.4f} s ({seconds / total:.0%})"
+                 for name, seconds in sorted(self.timings.items(), key=lambda item: -item[1])]
+        return "\n".join(lines)
 
 
 def local_dict(dictionaries, name):
@@ -1569,7 +1639,9 @@ def local_dict(dictionaries, name):
 def pulga_system_init(parameters, gates, out_lists, cache):
     '''the main function of the engine'''
 
-    ps = PulgaSystem(parameters)
+    ps = PulgaSystem(parameters,
+                     neighbours_skin=gates.get("neighbours_skin", 0.0),
+                     timings=gates.get("timings", False))
 
     iterations = parameters[1]
     iterations_max = max(iterations)
@@ -1582,6 +1654,9 @@ def pulga_system_init(parameters, gates, out_lists, cache):
 
     iterate(iterations_max, out_params)
 
+    if ps.timings is not None:
+        sv_logger.info("Pulga Physics timings for %s iterations:\n%s", iterations_max, ps.timings_report())
+
     return ps.verts, ps.rads, ps.vel, ps.params["Pins Reactions"][np.invert(ps.params['unpinned'])]
 
 
@@ -6,8 +6,6 @@
 # License-Filename: LICENSE
 
 import numpy as np
-from collections import defaultdict
-from math import sqrt
 
 import bmesh
 import mathutils
@@ -127,161 +125,172 @@ def lloyd_relax(vertices, faces, iterations, mask=None, method=NORMAL, skip_boun
 
     return vertices
 
+class _FacesTopology(object):
+    """
+    Polygons of a mesh as flat arrays of loops (face corners), for
+    vectorized calculation of face and vertex properties.
+    """
+    def __init__(self, faces, n_verts):
+        self.n_verts = n_verts
+        self.n_faces = len(faces)
+        sizes = np.array([len(face) for face in faces], dtype=np.int64)
+        self.sizes = sizes
+        if self.n_faces:
+            self.loop_verts = np.concatenate([np.asarray(face, dtype=np.int64) for face in faces])
+        else:
+            self.loop_verts = np.zeros((0,), dtype=np.int64)
+        self.loop_faces = np.repeat(np.arange(self.n_faces), sizes)
+        starts = np.cumsum(sizes) - sizes
+        loop_idxs = np.arange(len(self.loop_verts))
+        local_idxs = loop_idxs - starts[self.loop_faces]
+        self.next_loops = starts[self.loop_faces] + (local_idxs + 1) % sizes[self.loop_faces]
+        self.prev_loops = starts[self.loop_faces] + (local_idxs - 1) % sizes[self.loop_faces]
+
+    def boundary_verts(self):
+        """Mask of vertices which lie on edges used by exactly one face,
+        like BMVert.is_boundary"""
+        is_boundary = np.zeros((self.n_verts,), dtype=bool)
+        if not len(self.loop_verts):
+            return is_boundary
+        edges = np.stack([self.loop_verts, self.loop_verts[self.next_loops]], axis=1)
+        edges.sort(axis=1)
+        edges, counts = np.unique(edges, axis=0, return_counts=True)
+        is_boundary[edges[counts == 1].ravel()] = True
+        return is_boundary
+
+    def face_sums(self, loop_values):
+        return _scatter_sum(self.loop_faces, loop_values, self.n_faces)
+
+    def face_centers(self, verts):
+        return self.face_sums(verts[self.loop_verts]) / self.sizes[:, np.newaxis]
+
+    def face_normals_and_areas(self, verts):
+        """Newell's method, the same as BM_face_calc_normal / calc_area"""
+        cos = verts[self.loop_verts]
+        crosses = np.cross(cos, cos[self.next_loops])
+        normals = self.face_sums(crosses)
+        lens = np.linalg.norm(normals, axis=1)
+        nonzero = lens > 0
+        normals[nonzero] /= lens[nonzero][:, np.newaxis]
+        return normals, lens / 2.0
+
+    def vertex_normals(self, verts):
+        """Angle-weighted average of face normals, as BMesh calculates it"""
+        face_normals, _ = self.face_normals_and_areas(verts)
+        cos = verts[self.loop_verts]
+        to_prev = cos[self.prev_loops] - cos
+        to_next = cos[self.next_loops] - cos
+        lens = np.linalg.norm(to_prev, axis=1) * np.linalg.norm(to_next, axis=1)
+        dots = (to_prev * to_next).sum(axis=1)
+        cosines = np.divide(dots, lens, out=np.ones_like(dots), where=lens > 0)
+        angles = np.arccos(np.clip(cosines, -1.0, 1.0))
+        normals = _scatter_sum(self.loop_verts, face_normals[self.loop_faces] * angles[:, np.newaxis], self.n_verts)
+        lens = np.linalg.norm(normals, axis=1)
+        nonzero = lens > 0
+        normals[nonzero] /= lens[nonzero][:, np.newaxis]
+        return normals
+
+def _scatter_sum(idxs, values, n):
+    """Sums rows of values with equal indexes; result has n rows"""
+    return np.stack([np.bincount(idxs, weights=values[:, i], minlength=n) for i in range(values.shape[1])], axis=1)
+
+def _movable_verts(n_verts, mask, skip_boundary, topology):
+    movable = np.ones((n_verts,), dtype=bool)
+    if mask is not None:
+        movable &= np.asarray(repeat_last_for_length(mask, n_verts), dtype=bool)
+    if skip_boundary:
+        movable &= ~topology.boundary_verts()
+    return movable
+
+def _target_value(values, target):
+    if target == MINIMUM:
+        return values.min()
+    elif target == MAXIMUM:
+        return values.max()
+    elif target == AVERAGE:
+        return values.mean()
+    else:
+        raise Exception("Unsupported target type")
+
+def _preserve_shape(verts, target_verts, method, topology, bvh):
+    if method == NONE:
+        return target_verts
+    elif method == NORMAL:
+        normals = topology.vertex_normals(verts)
+        dvs = target_verts - verts
+        dvs -= (dvs * normals).sum(axis=1)[:, np.newaxis] * normals
+        return verts + dvs
+    elif method == BVH:
+        return np.array([tuple(bvh.find_nearest(vert)[0]) for vert in target_verts])
+    else:
+        raise Exception("Unsupported shape preservation method")
+
+def _mask_axes_np(src_verts, dst_verts, axes):
+    if axes == {0,1,2}:
+        return dst_verts
+    result = src_verts.copy()
+    for i in axes:
+        result[:,i] = dst_verts[:,i]
+    return result
+
 def edges_relax(vertices, edges, faces, iterations, k, mask=None, method=NONE, target=AVERAGE, skip_boundary=True, use_axes={0,1,2}):
     """
     supported shape preservation methods: NONE, NORMAL, BVH
     """
+    if not edges or not edges[0]:
+        edges = polygons_to_edges([faces], unique_edges=True)[0]
+    edges = np.array(edges, dtype=np.int64).reshape((-1, 2))
+    verts = np.array(vertices, dtype=np.float64)
+    n_verts = len(verts)
 
-    def do_iteration(bvh, bm, verts):
-        verts = np.asarray(verts)
-        v1s = verts[edges[:,0]]
-        v2s = verts[edges[:,1]]
-        edge_vecs = v2s - v1s
+    topology = _FacesTopology(faces, n_verts)
+    movable = _movable_verts(n_verts, mask, skip_boundary, topology)
+    edge_idxs = edges.T.ravel()
+    counts = np.bincount(edge_idxs, minlength=n_verts)
+    counts = np.maximum(counts, 1)[:, np.newaxis]
+    bvh = BVHTree.FromPolygons(vertices, faces) if method == BVH else None
+
+    for i in range(iterations):
+        edge_vecs = verts[edges[:,1]] - verts[edges[:,0]]
         edge_lens = np.linalg.norm(edge_vecs, axis=1)
+        target_len = _target_value(edge_lens, target)
 
-        if target == MINIMUM:
-            target_len = np.min(edge_lens)
-        elif target == MAXIMUM:
-            target_len = np.max(edge_lens)
-        elif target == AVERAGE:
-            target_len = np.mean(edge_lens)
-        else:
-            raise Exception("Unsupported target edge length type")
-
-        forces = defaultdict(lambda: np.zeros((3,)))
-        counts = defaultdict(int)
-        for edge_idx, (v1_idx, v2_idx) in enumerate(edges):
-            edge_vec = edge_vecs[edge_idx]
-            edge_len = edge_lens[edge_idx]
-            d_len = (edge_len - target_len)/2.0
-            dv1 =   d_len * edge_vec
-            dv2 = - d_len * edge_vec
-            forces[v1_idx] += dv1
-            forces[v2_idx] += dv2
-            counts[v1_idx] += 1
-            counts[v2_idx] += 1
-        
-        target_verts = verts.copy()
-        for v_idx in range(len(verts)):
-            if skip_boundary and bm.verts[v_idx].is_boundary:
-                continue
-            if mask is not None and not mask[v_idx]:
-                continue
-            count = counts[v_idx]
-            if count:
-                forces[v_idx] /= count
-            target_verts[v_idx] += k*forces[v_idx]
-
-        if method == NONE:
-            verts_out = target_verts.tolist()
-        elif method == NORMAL:
-            verts_out = []
-            for bm_vert in bm.verts:
-                normal = bm_vert.normal
-                dv = mathutils.Vector(target_verts[bm_vert.index]) - bm_vert.co
-                dv = dv - dv.project(normal)
-                new_vert = tuple(bm_vert.co + dv)
-                verts_out.append(new_vert)
-        elif method == BVH:
-            verts_out = []
-            for vert in target_verts:
-                new_vert, normal, idx, dist = bvh.find_nearest(vert)
-                verts_out.append(tuple(new_vert))
-        else:
-            raise Exception("Unsupported shape preservation method")
-        
-        return map_mask_axes(verts, verts_out, use_axes)
+        dvs = ((edge_lens - target_len) / 2.0)[:, np.newaxis] * edge_vecs
+        forces = _scatter_sum(edge_idxs, np.concatenate([dvs, -dvs]), n_verts) / counts
 
-    if not edges or not edges[0]:
-        edges = polygons_to_edges([faces], unique_edges=True)[0]
-    edges = np.array(edges)
-    if mask is not None:
-        mask = repeat_last_for_length(mask, len(vertices))
-    bvh = BVHTree.FromPolygons(vertices, faces)
-    for i in range(iterations):
-        bm = bmesh_from_pydata(vertices, edges, faces, normal_update=True)
-        vertices = do_iteration(bvh, bm, vertices)
-        bm.free()
+        target_verts = verts.copy()
+        target_verts[movable] += k * forces[movable]
+        new_verts = _preserve_shape(verts, target_verts, method, topology, bvh)
+        verts = _mask_axes_np(verts, new_verts, use_axes)
 
-    return vertices
+    return verts.tolist()
 
 def faces_relax(vertices, edges, faces, iterations, k, mask=None, method=NONE, target=AVERAGE, skip_boundary=True, use_axes={0,1,2}):
     """
     supported shape preservation methods: NONE, NORMAL, BVH
     """
+    verts = np.array(vertices, dtype=np.float64)
+    n_verts = len(verts)
 
-    def do_iteration(bvh, bm):
-        areas = np.array([face.calc_area() for face in bm.faces])
-        vert_cos = np.array([tuple(vert.co) for vert in bm.verts])
-        if target == MINIMUM:
-            target_area = areas.min()
-        elif target == MAXIMUM:
-            target_area = areas.max()
-        elif target == AVERAGE:
-            target_area = areas.mean()
-        else:
-            raise Exception("Unsupported target face area type")
-
-        forces = defaultdict(lambda: np.zeros((3,)))
-        counts = defaultdict(int)
-        for bm_face in bm.faces:
-            face_vert_idxs = [vert.index for vert in bm_face.verts]
-            face_verts = vert_cos[face_vert_idxs]
-            mean = face_verts.mean(axis=0)
-            face_verts_0 = face_verts - mean
-            src_area = areas[bm_face.index]
-            scale = sqrt(target_area / src_area)
-            dvs = (scale - 1) * face_verts_0
-            for vert_idx, dv in zip(face_vert_idxs, dvs):
-                forces[vert_idx] += dv
-                counts[vert_idx] += 1
-        
-        target_verts = vert_cos.copy()
-        for bm_vert in bm.verts:
-            idx = bm_vert.index
-            if skip_boundary and bm_vert.is_boundary:
-                continue
-            if mask is not None and not mask[idx]:
-                continue
-            count = counts[idx]
-            if count:
-                forces[idx] /= count
-            force = forces[idx]
-            target_verts[idx] += k*force
-
-        if method == NONE:
-            verts_out = target_verts.tolist()
-        elif method == NORMAL:
-            verts_out = []
-            for bm_vert in bm.verts:
-                idx = bm_vert.index
-                dv = mathutils.Vector(target_verts[idx]) - bm_vert.co
-                normal = bm_vert.normal
-                dv = dv - dv.project(normal)
-                new_vert = tuple(bm_vert.co + dv)
-                verts_out.append(new_vert)
-
-        elif method == BVH:
-            verts_out = []
-            for bm_vert in bm.verts:
-                new_vert, normal, idx, dist = bvh.find_nearest(bm_vert.co)
-                verts_out.append(tuple(new_vert))
-
-        else:
-            raise Exception("Unsupported shape preservation method")
+    topology = _FacesTopology(faces, n_verts)
+    movable = _movable_verts(n_verts, mask, skip_boundary, topology)
+    counts = np.bincount(topology.loop_verts, minlength=n_verts)
+    counts = np.maximum(counts, 1)[:, np.newaxis]
+    bvh = BVHTree.FromPolygons(vertices, faces) if method == BVH else None
 
-        return map_mask_axes(vert_cos, verts_out, use_axes)
-
-    if mask is not None:
-        mask = repeat_last_for_length(mask, len(vertices))
-    if not edges or not edges[0]:
-        edges = polygons_to_edges([faces], unique_edges=True)[0]
-
-    bvh = BVHTree.FromPolygons(vertices, faces)
     for i in range(iterations):
-        bm = bmesh_from_pydata(vertices, edges, faces, normal_update=True)
-        vertices = do_iteration(bvh, bm)
-        bm.free()
+        _, areas = topology.face_normals_and_areas(verts)
+        target_area = _target_value(areas, target)
+        scales = np.sqrt(np.divide(target_area, areas, out=np.ones_like(areas), where=areas > 0))
 
-    return vertices
+        centers = topology.face_centers(verts)
+        loop_faces = topology.loop_faces
+        dvs = (scales - 1)[loop_faces][:, np.newaxis] * (verts[topology.loop_verts] - centers[loop_faces])
+        forces = _scatter_sum(topology.loop_verts, dvs, n_verts) / counts
+
+        target_verts = verts.copy()
+        target_verts[movable] += k * forces[movable]
+        new_verts = _preserve_shape(verts, target_verts, method, topology, bvh)
+        verts = _mask_axes_np(verts, new_verts, use_axes)
 
+    return verts.tolist()
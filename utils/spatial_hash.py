@@ -0,0 +1,88 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+from collections import defaultdict
+from math import floor, ceil
+
+
+class SvSpatialHash(object):
+    """
+    Incremental spatial index of spheres (points with radiuses), based on a
+    uniform background grid. Unlike KDTree, it does not have to be rebuilt
+    after each inserted point, so it is suitable for dart-throwing
+    (Poisson disk) samplers, which check each candidate point against all
+    previously accepted ones.
+    """
+    def __init__(self, cell_size):
+        """
+        Args:
+            cell_size: size of grid cells. Queries are fastest when it is
+                comparable to typical distance being checked.
+        """
+        if cell_size <= 0:
+            raise ValueError("Cell size must be positive")
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        self.max_radius = 0.0
+        self.count = 0
+
+    @staticmethod
+    def for_spheres(centers, radiuses, distance=0):
+        """
+        Create an index for checks of typical distance and put given
+        spheres into it.
+        """
+        cell_size = max(distance, 2 * max(radiuses, default=0)) or 1.0
+        index = SvSpatialHash(cell_size)
+        for center, radius in zip(centers, radiuses):
+            index.add(center, radius)
+        return index
+
+    def _cell(self, point):
+        size = self.cell_size
+        return floor(point[0] / size), floor(point[1] / size), floor(point[2] / size)
+
+    def add(self, point, radius=0.0):
+        x, y, z = point
+        self.cells[self._cell(point)].append((x, y, z, radius))
+        self.max_radius = max(self.max_radius, radius)
+        self.count += 1
+
+    def _nearby(self, point, distance):
+        n = ceil(distance / self.cell_size)
+        if (2*n + 1)**3 > len(self.cells):
+            # it is cheaper to look through all non-empty cells
+            for items in self.cells.values():
+                yield from items
+            return
+        ci, cj, ck = self._cell(point)
+        cells = self.cells
+        for i in range(ci - n, ci + n + 1):
+            for j in range(cj - n, cj + n + 1):
+                for k in range(ck - n, ck + n + 1):
+                    items = cells.get((i, j, k))
+                    if items:
+                        yield from items
+
+    def is_free(self, point, radius=0.0):
+        """
+        Check that the sphere with given center and radius does not
+        intersect any of stored spheres, i.e. the distance from the point to
+        each stored point is not less than sum of radiuses.
+        For radius = 0 and points stored with zero radiuses this means that
+        there are no stored points nearer than radius.
+        """
+        reach = radius + self.max_radius
+        if reach <= 0 or not self.count:
+            return True
+        x, y, z = point
+        for x1, y1, z1, r1 in self._nearby(point, reach):
+            dx, dy, dz = x - x1, y - y1, z - z1
+            r = radius + r1
+            if dx*dx + dy*dy + dz*dz < r*r:
+                return False
+        return True
@@ -39,10 +39,8 @@ def surface_to_meshdata(surface, resolution_u, resolution_v):
     v_min, v_max = surface.get_v_bounds()
     us = np.linspace(u_min, u_max, num=resolution_u)
     vs = np.linspace(v_min, v_max, num=resolution_v)
-    us, vs = np.meshgrid(us, vs)
-    us = us.flatten()
-    vs = vs.flatten()
-    points = surface.evaluate_array(us, vs).tolist()
+    points = surface.evaluate_grid(us, vs)
+    points = np.transpose(points, axes=(1,0,2)).reshape((-1, 3)).tolist()
     edges = make_quad_edges(resolution_u, resolution_v)
     faces = make_quad_faces(resolution_u, resolution_v)
     return points, edges, faces
@@ -109,10 +107,8 @@ class SurfaceData(object):
         v_min, v_max = surface.get_v_bounds()
         us = np.linspace(u_min, u_max, num=resolution_u)
         vs = np.linspace(v_min, v_max, num=resolution_v)
-        us, vs = np.meshgrid(us, vs)
-        us = us.flatten()
-        vs = vs.flatten()
-        self.points = surface.evaluate_array(us, vs)#.tolist()
+        points = surface.evaluate_grid(us, vs)
+        self.points = np.transpose(points, axes=(1,0,2)).reshape((-1, 3))
         self.points_list = self.points.reshape((resolution_u*resolution_v, 3)).tolist()
 
         if hasattr(surface, 'get_control_points'):
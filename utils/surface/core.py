@@ -25,6 +25,17 @@ class SvSurface(object):
     def evaluate_array(self, us, vs):
         raise Exception("not implemented!")
 
+    def evaluate_grid(self, us, vs):
+        """
+        Evaluate the surface at all combinations of given U and V values.
+
+        Returns:
+            np.array of shape (len(us), len(vs), 3).
+        """
+        us, vs = np.meshgrid(us, vs, indexing='ij')
+        points = self.evaluate_array(us.flatten(), vs.flatten())
+        return points.reshape(us.shape + (3,))
+
     def normal(self, u, v):
         h = self.normal_delta
         p = self.evaluate(u, v)
@@ -1015,38 +1015,103 @@ class SvNativeNurbsSurface(SvNurbsSurface):
     def evaluate(self, u, v):
         return self.evaluate_array(np.array([u]), np.array([v]))[0]
 
-    def fraction(self, deriv_order_u, deriv_order_v, us, vs):
+    def _span_indexes(self, spans, degree, n_cpts):
+        idxs = spans[np.newaxis].T - degree + np.arange(degree+1) # (n, p+1)
+        valid = (idxs >= 0) & (idxs < n_cpts)
+        return np.clip(idxs, 0, n_cpts-1), valid
+
+    def fractions(self, orders, us, vs):
+        """
+        Calculate numerators and denominators of NURBS surface formula,
+        or their partial derivatives, at given pairs of (u, v) parameters.
+        Only (pu+1)*(pv+1) nonzero products of basis functions are evaluated
+        for each point.
+
+        Args:
+            orders: list of (deriv_order_u, deriv_order_v) tuples.
+            us, vs: arrays of parameter values of shape (n,).
+
+        Returns:
+            list of (numerator, denominator) tuples, one for each item of
+            orders; numerator has shape (n, 3), denominator has shape (n, 1).
+        """
         pu = self.degree_u
         pv = self.degree_v
         ku, kv, _ = self.control_points.shape
-        nsu = np.array([self.basis_u.derivative(i, pu, deriv_order_u)(us) for i in range(ku)]) # (ku, n)
-        nsv = np.array([self.basis_v.derivative(i, pv, deriv_order_v)(vs) for i in range(kv)]) # (kv, n)
-        nsu = np.transpose(nsu[np.newaxis], axes=(1,0,2)) # (ku, 1, n)
-        nsv = nsv[np.newaxis] # (1, kv, n)
-        ns = nsu * nsv # (ku, kv, n)
-        weights = np.transpose(self.weights[np.newaxis], axes=(1,2,0)) # (ku, kv, 1)
-        coeffs = ns * weights # (ku, kv, n)
-        coeffs = np.transpose(coeffs[np.newaxis], axes=(3,1,2,0)) # (n,ku,kv,1)
-        controls = self.control_points # (ku,kv,3)
-
-        numerator = coeffs * controls # (n,ku,kv,3)
-        numerator = numerator.sum(axis=1).sum(axis=1) # (n,3)
-        denominator = coeffs.sum(axis=1).sum(axis=1)
-
-        return numerator, denominator
+        max_order_u = max(order_u for order_u, _ in orders)
+        max_order_v = max(order_v for _, order_v in orders)
+        spans_u, _, nsu = self.basis_u.nonzero_derivatives(pu, us, max_order_u) # (max_order_u+1, n, pu+1)
+        spans_v, _, nsv = self.basis_v.nonzero_derivatives(pv, vs, max_order_v) # (max_order_v+1, n, pv+1)
+        idxs_u, valid_u = self._span_indexes(spans_u, pu, ku)
+        idxs_v, valid_v = self._span_indexes(spans_v, pv, kv)
+
+        n = len(spans_u)
+        numerators = [np.zeros((n, 3)) for _ in orders]
+        denominators = [np.zeros((n,)) for _ in orders]
+        for r in range(pu+1):
+            iu = idxs_u[:,r]
+            for s in range(pv+1):
+                iv = idxs_v[:,s]
+                weights = np.where(valid_u[:,r] & valid_v[:,s], self.weights[iu, iv], 0.0) # (n,)
+                controls = self.control_points[iu, iv] # (n, 3)
+                for i, (order_u, order_v) in enumerate(orders):
+                    coeffs = nsu[order_u][:,r] * nsv[order_v][:,s] * weights # (n,)
+                    numerators[i] += coeffs[np.newaxis].T * controls
+                    denominators[i] += coeffs
+
+        return [(numerator, denominator[np.newaxis].T) for numerator, denominator in zip(numerators, denominators)]
+
+    def fraction(self, deriv_order_u, deriv_order_v, us, vs):
+        return self.fractions([(deriv_order_u, deriv_order_v)], us, vs)[0]
 
     def evaluate_array(self, us, vs):
         numerator, denominator = self.fraction(0, 0, us, vs)
         return nurbs_divide(numerator, denominator)
 
+    def evaluate_grid(self, us, vs):
+        """
+        Evaluate the surface on a rectangular grid of parameters. This uses
+        tensor-product structure of the surface: basis functions are
+        calculated once per each of len(us) and len(vs) values, instead of
+        once per each of len(us)*len(vs) points.
+
+        Returns:
+            np.array of shape (len(us), len(vs), 3).
+        """
+        us = np.asarray(us)
+        vs = np.asarray(vs)
+        pu = self.degree_u
+        pv = self.degree_v
+        ku, kv, _ = self.control_points.shape
+        spans_u, _, nsu = self.basis_u.nonzero_derivatives(pu, us) # (1, n_u, pu+1)
+        spans_v, _, nsv = self.basis_v.nonzero_derivatives(pv, vs) # (1, n_v, pv+1)
+        idxs_u, valid_u = self._span_indexes(spans_u, pu, ku)
+        idxs_v, valid_v = self._span_indexes(spans_v, pv, kv)
+        nsu = np.where(valid_u, nsu[0], 0.0)
+        nsv = np.where(valid_v, nsv[0], 0.0)
+        controls = self.get_homogenous_control_points() # (ku, kv, 4)
+
+        # Contract along U first, then along V.
+        along_u = np.zeros((len(us), kv, 4))
+        for r in range(pu+1):
+            along_u += nsu[:,r][:,np.newaxis,np.newaxis] * controls[idxs_u[:,r]]
+        result = np.zeros((len(us), len(vs), 4))
+        for s in range(pv+1):
+            result += nsv[:,s][np.newaxis,:,np.newaxis] * along_u[:, idxs_v[:,s]]
+
+        result = result.reshape((len(us)*len(vs), 4))
+        points = nurbs_divide(result[:,:3], result[:,3])
+        return points.reshape((len(us), len(vs), 3))
+
     def normal(self, u, v):
         return self.normal_array(np.array([u]), np.array([v]))[0]
 
     def normal_array(self, us, vs):
-        numerator, denominator = self.fraction(0, 0, us, vs)
+        fractions = self.fractions([(0, 0), (1, 0), (0, 1)], us, vs)
+        numerator, denominator = fractions[0]
         surface = nurbs_divide(numerator, denominator)
-        numerator_u, denominator_u = self.fraction(1, 0, us, vs)
-        numerator_v, denominator_v = self.fraction(0, 1, us, vs)
+        numerator_u, denominator_u = fractions[1]
+        numerator_v, denominator_v = fractions[2]
         surface_u = nurbs_divide(numerator_u - surface*denominator_u, denominator)
         surface_v = nurbs_divide(numerator_v - surface*denominator_v, denominator)
         normal = np.cross(surface_u, surface_v)
@@ -1090,20 +1155,21 @@ class SvNativeNurbsSurface(SvNurbsSurface):
                 return curve
 
     def derivatives_data_array(self, us, vs):
-        numerator, denominator = self.fraction(0, 0, us, vs)
+        fractions = self.fractions([(0, 0), (1, 0), (0, 1)], us, vs)
+        numerator, denominator = fractions[0]
         surface = nurbs_divide(numerator, denominator)
-        numerator_u, denominator_u = self.fraction(1, 0, us, vs)
-        numerator_v, denominator_v = self.fraction(0, 1, us, vs)
+        numerator_u, denominator_u = fractions[1]
+        numerator_v, denominator_v = fractions[2]
         surface_u = (numerator_u - surface*denominator_u) / denominator
         surface_v = (numerator_v - surface*denominator_v) / denominator
         return SurfaceDerivativesData(surface, surface_u, surface_v)
 
     def curvature_calculator(self, us, vs, order=True):
-    
-        numerator, denominator = self.fraction(0, 0, us, vs)
+        fractions = self.fractions([(0, 0), (1, 0), (0, 1), (2, 0), (0, 2), (1, 1)], us, vs)
+        numerator, denominator = fractions[0]
         surface = nurbs_divide(numerator, denominator)
-        numerator_u, denominator_u = self.fraction(1, 0, us, vs)
-        numerator_v, denominator_v = self.fraction(0, 1, us, vs)
+        numerator_u, denominator_u = fractions[1]
+        numerator_v, denominator_v = fractions[2]
         surface_u = (numerator_u - surface*denominator_u) / denominator
         surface_v = (numerator_v - surface*denominator_v) / denominator
 
@@ -1111,12 +1177,12 @@ class SvNativeNurbsSurface(SvNurbsSurface):
         n = np.linalg.norm(normal, axis=1, keepdims=True)
         normal = normal / n
 
-        numerator_uu, denominator_uu = self.fraction(2, 0, us, vs)
+        numerator_uu, denominator_uu = fractions[3]
         surface_uu = (numerator_uu - 2*surface_u*denominator_u - surface*denominator_uu) / denominator
-        numerator_vv, denominator_vv = self.fraction(0, 2, us, vs)
+        numerator_vv, denominator_vv = fractions[4]
         surface_vv = (numerator_vv - 2*surface_v*denominator_v - surface*denominator_vv) / denominator
 
-        numerator_uv, denominator_uv = self.fraction(1, 1, us, vs)
+        numerator_uv, denominator_uv = fractions[5]
         surface_uv = (numerator_uv - surface_v*denominator_u - surface_u*denominator_v - surface*denominator_uv) / denominator
 
         nuu = (surface_uu * normal).sum(axis=1)
@@ -8,9 +8,8 @@
 import numpy as np
 import random
 
-from mathutils.kdtree import KDTree
-
 from sverchok.utils.sv_logging import sv_logger
+from sverchok.utils.spatial_hash import SvSpatialHash
 
 
 def random_point(min_x, max_x, min_y, max_y):
@@ -18,32 +17,6 @@ def random_point(min_x, max_x, min_y, max_y):
     y = random.uniform(min_y, max_y)
     return x,y
 
-def _check_min_distance(v_new, vs_old, min_r):
-    kdt = KDTree(len(vs_old))
-    for i, v in enumerate(vs_old):
-        kdt.insert(v, i)
-    kdt.balance()
-    nearest, idx, dist = kdt.find(v_new)
-    if dist is None:
-        return True
-    return (dist >= min_r)
-
-#     for v_old in vs_old:
-#         distance = np.linalg.norm(v_new - v_old)
-#         if distance < min_r:
-#             return False
-#    return True
-
-def _check_min_radius(point, old_points, old_radiuses, min_r):
-    if not old_points:
-        return True
-    old_points = np.array(old_points)
-    old_radiuses = np.array(old_radiuses)
-    point = np.array(point)
-    distances = np.linalg.norm(old_points - point, axis=1)
-    ok = (old_radiuses + min_r < distances).all()
-    return ok
-
 BATCH_SIZE = 100
 MAX_ITERATIONS = 1000
 
@@ -100,6 +73,8 @@ def populate_surface(surface, field, count, threshold,
     generated_uv = []
     generated_radiuses = []
     iterations = 0
+    # index of old and generated points, to check distances from candidates
+    index = None
 
     if field is None and avoid_spheres is None and min_r == 0 and min_r_field is None and predicate is None:
         batch_size = count
@@ -162,21 +137,28 @@ def populate_surface(surface, field, count, threshold,
                 ys = np.array([p[1] for p in candidates])
                 zs = np.array([p[2] for p in candidates])
                 min_rs = min_r_field.evaluate_grid(xs, ys, zs).tolist()
+                if index is None:
+                    index = SvSpatialHash.for_spheres(old_points, old_radiuses, 2*max(min_rs))
+                batch_index = SvSpatialHash(index.cell_size)
                 good_verts = []
                 good_uvs = []
-                for candidate_uv, candidate, min_r in zip(candidate_uvs, candidates, min_rs):
+                for candidate_uv, candidate, min_r in zip(candidate_uvs.tolist(), candidates.tolist(), min_rs):
                     if random_radius:
                         min_r = random.uniform(0, min_r)
-                    if _check_min_radius(candidate, old_points + generated_verts + good_verts, old_radiuses + generated_radiuses + good_radiuses, min_r):
+                    if index.is_free(candidate, min_r) and batch_index.is_free(candidate, min_r):
+                        batch_index.add(candidate, min_r)
                         good_verts.append(tuple(candidate))
                         good_uvs.append(tuple(candidate_uv))
                         good_radiuses.append(min_r)
             else: # min_r != 0
+                if index is None:
+                    index = SvSpatialHash.for_spheres(old_points, [0 for p in old_points], min_r)
+                batch_index = SvSpatialHash(index.cell_size)
                 good_verts = []
                 good_uvs = []
-                for candidate_uv, candidate in zip(candidate_uvs, candidates):
-                    distance_ok = _check_min_distance(candidate, old_points + generated_verts + good_verts, min_r)
-                    if distance_ok:
+                for candidate_uv, candidate in zip(candidate_uvs.tolist(), candidates.tolist()):
+                    if index.is_free(candidate, min_r) and batch_index.is_free(candidate, min_r):
+                        batch_index.add(candidate)
                         good_verts.append(tuple(candidate))
                         good_uvs.append(tuple(candidate_uv))
                         good_radiuses.append(0)
@@ -187,6 +169,9 @@ def populate_surface(surface, field, count, threshold,
                 good_verts = [r[1] for r in results]
                 good_radiuses = [r[2] for r in results]
 
+            if index is not None:
+                for vert, radius in zip(good_verts, good_radiuses):
+                    index.add(vert, radius)
             generated_verts.extend(good_verts)
             generated_uv.extend(good_uvs)
             generated_radiuses.extend(good_radiuses)
@@ -117,10 +117,18 @@ from sverchok.utils.sv_logging import sv_logger
 from sverchok.utils.geom import center, LineEquation2D, CircleEquation2D
 from sverchok.utils.math import weighted_center
 from sverchok.utils.sv_bmesh_utils import pydata_from_bmesh, bmesh_from_pydata
+from sverchok.core.sv_custom_exceptions import DependencyError
+from sverchok.dependencies import scipy
+
+if scipy is not None:
+    from scipy.spatial import Voronoi
 
 TOLERANCE = 1e-9
 BIG_FLOAT = 1e38
 
+FORTUNE = 'FORTUNE'
+SCIPY = 'SCIPY'
+
 
 def cmp(x,y):
     return x.__cmp__(y)
@@ -1109,13 +1117,165 @@ class CircleBounds(Bounds):
         x,y = tuple(v)
         return x,y,0
 
-def voronoi_bounded(sites, bound_mode='BOX', clip=True, draw_bounds=True, draw_hangs=False, make_faces=False, ordered_faces=False, max_sides=10):
-
+def _clip_segments_by_box(starts, ends, bounds):
+    """Liang-Barsky clipping of many segments by a box at once.
+    Returns parameters of start and end of the clipped part of each segment
+    and mask of segments which intersect the box."""
+    dirs = ends - starts
+    t0 = np.zeros(len(starts))
+    t1 = np.ones(len(starts))
+    good = np.ones(len(starts), dtype=bool)
+    for p, q in [(-dirs[:,0], starts[:,0] - bounds.x_min),
+                 (dirs[:,0], bounds.x_max - starts[:,0]),
+                 (-dirs[:,1], starts[:,1] - bounds.y_min),
+                 (dirs[:,1], bounds.y_max - starts[:,1])]:
+        parallel = p == 0
+        good &= ~(parallel & (q < 0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = q / p
+        t0 = np.where(p < 0, np.maximum(t0, r), t0)
+        t1 = np.where(p > 0, np.minimum(t1, r), t1)
+    return t0, t1, good & (t0 <= t1)
+
+def _clip_segments_by_circle(starts, ends, bounds):
+    """Clipping of many segments by a circle at once, see _clip_segments_by_box"""
+    dirs = ends - starts
+    rel = starts - np.array(bounds.center)
+    a = (dirs * dirs).sum(axis=1)
+    b = 2 * (dirs * rel).sum(axis=1)
+    c = (rel * rel).sum(axis=1) - bounds.r_max ** 2
+    disc = b * b - 4 * a * c
+    good = (disc >= 0) & (a > 0)
+    sqrt_disc = np.sqrt(np.where(good, disc, 0))
+    a = np.where(good, a, 1)
+    t0 = np.maximum(0.0, (-b - sqrt_disc) / (2 * a))
+    t1 = np.minimum(1.0, (-b + sqrt_disc) / (2 * a))
+    return t0, t1, good & (t0 <= t1)
+
+def _voronoi_bounded_scipy(sites, bounds, draw_bounds, draw_hangs, make_faces, ordered_faces, max_sides):
+    """
+    Implementation of voronoi_bounded based on scipy.spatial.Voronoi.
+    Infinite ridges are replaced by long enough segments, then all ridges are
+    clipped by the bounds at once. Faces are made of ridges of each site,
+    plus corners of the bounding box which are nearest to the site.
+    Edges are the same as of the Fortune engine, except that corners of the
+    bounding box are extra vertices when bounds are drawn in BOX mode.
+    """
+    points = np.asarray(sites, dtype=np.float64)[:, :2]
+    diagram = Voronoi(points)
+    vor_verts = diagram.vertices
+    ridge_sites = diagram.ridge_points
+    ridge_verts = np.array(diagram.ridge_vertices, dtype=np.int64)
+
+    bounds_center = np.array(bounds.center)
+    if isinstance(bounds, BoxBounds):
+        size = sqrt((bounds.x_max - bounds.x_min)**2 + (bounds.y_max - bounds.y_min)**2)
+    else:
+        size = 2 * bounds.r_max
+
+    starts = vor_verts[ridge_verts.max(axis=1)]
+    ends = vor_verts[ridge_verts.min(axis=1)]
+    infinite = (ridge_verts < 0).any(axis=1)
+    if infinite.any():
+        # the infinite ridge goes from its finite vertex along the bisector
+        # of two sites, away from the other sites
+        site_1 = points[ridge_sites[infinite, 0]]
+        site_2 = points[ridge_sites[infinite, 1]]
+        tangent = site_2 - site_1
+        normal = np.stack([-tangent[:,1], tangent[:,0]], axis=1)
+        normal /= np.linalg.norm(normal, axis=1)[:, np.newaxis]
+        mid = (site_1 + site_2) / 2.0
+        sign = np.sign(((mid - points.mean(axis=0)) * normal).sum(axis=1))
+        sign[sign == 0] = 1
+        far = np.linalg.norm(starts[infinite] - bounds_center, axis=1) + 2 * size
+        ends[infinite] = starts[infinite] + (sign * far)[:, np.newaxis] * normal
+
+    if isinstance(bounds, BoxBounds):
+        t0, t1, good = _clip_segments_by_box(starts, ends, bounds)
+    else:
+        t0, t1, good = _clip_segments_by_circle(starts, ends, bounds)
+    start_clipped = good & (t0 > 0)
+    end_clipped = good & ((t1 < 1) | infinite)
+    if not (draw_bounds or draw_hangs):
+        good &= ~(start_clipped | end_clipped)
+        start_clipped[:] = False
+        end_clipped[:] = False
+    # sites which cells are cut by the bounds
+    bound_sites = np.zeros(len(points), dtype=bool)
+    bound_sites[ridge_sites[~good | start_clipped | end_clipped].ravel()] = True
+
+    # vertices: diagram vertices inside bounds, then bounding vertices, then corners
+    dirs = ends - starts
+    used_verts = np.unique(np.concatenate([ridge_verts[good & ~start_clipped].max(axis=1),
+                                           ridge_verts[good & ~end_clipped].min(axis=1)]))
+    vert_index = np.full(len(vor_verts), -1, dtype=np.int64)
+    vert_index[used_verts] = np.arange(len(used_verts))
+    bound_verts = np.concatenate([starts[start_clipped] + t0[start_clipped][:, np.newaxis] * dirs[start_clipped],
+                                  starts[end_clipped] + t1[end_clipped][:, np.newaxis] * dirs[end_clipped]])
+    n_inner = len(used_verts)
+    start_idxs = vert_index[ridge_verts.max(axis=1)]
+    start_idxs[start_clipped] = n_inner + np.arange(start_clipped.sum())
+    end_idxs = vert_index[ridge_verts.min(axis=1)]
+    end_idxs[end_clipped] = n_inner + start_clipped.sum() + np.arange(end_clipped.sum())
+
+    verts = [vor_verts[used_verts], bound_verts]
+    if draw_bounds and isinstance(bounds, BoxBounds):
+        corners = np.array([(bounds.x_min, bounds.y_min), (bounds.x_max, bounds.y_min),
+                            (bounds.x_max, bounds.y_max), (bounds.x_min, bounds.y_max)])
+        verts.append(corners)
+    else:
+        corners = np.zeros((0, 2))
+    verts = np.concatenate(verts)
+    edges = [np.stack([start_idxs[good], end_idxs[good]], axis=1)]
+
+    if draw_bounds and len(verts) > n_inner + 1:
+        boundary = np.arange(n_inner, len(verts))
+        rel = verts[boundary] - bounds_center
+        angles = np.arctan2(rel[:,1], rel[:,0])
+        boundary = boundary[np.argsort(angles)]
+        edges.append(np.stack([boundary, np.roll(boundary, -1)], axis=1))
+    edges = np.concatenate(edges)
+
+    new_faces = []
+    if make_faces:
+        face_sites = [ridge_sites[good, 0], ridge_sites[good, 1]] * 2
+        face_verts = [start_idxs[good]] * 2 + [end_idxs[good]] * 2
+        if len(corners):
+            corner_dists = np.linalg.norm(corners[:, np.newaxis] - points[np.newaxis], axis=2)
+            face_sites.append(corner_dists.argmin(axis=1))
+            face_verts.append(len(verts) - len(corners) + np.arange(len(corners)))
+        n_verts = len(verts)
+        pairs = np.unique(np.concatenate(face_sites) * n_verts + np.concatenate(face_verts))
+        face_sites, face_verts = pairs // n_verts, pairs % n_verts
+        # cells are convex, so their vertices can be sorted by angle around their centers
+        counts = np.bincount(face_sites, minlength=len(points))
+        centers = np.stack([np.bincount(face_sites, weights=verts[face_verts, i], minlength=len(points))
+                            for i in range(2)], axis=1) / np.maximum(counts, 1)[:, np.newaxis]
+        rel = verts[face_verts] - centers[face_sites]
+        face_verts = face_verts[np.lexsort((np.arctan2(rel[:,1], rel[:,0]), face_sites))].tolist()
+        face_starts = np.concatenate([[0], np.cumsum(counts)]).tolist()
+        bad_sites = (counts < 3) | (counts > max_sides)
+        if not draw_bounds:
+            bad_sites |= bound_sites
+        for site_idx, is_bad in enumerate(bad_sites.tolist()):
+            if is_bad:
+                if ordered_faces:
+                    raise Exception(f"Can't find a face for site #{site_idx}")
+                continue
+            new_faces.append(face_verts[face_starts[site_idx] : face_starts[site_idx + 1]])
+
+    new_vertices = [(x, y, 0) for x, y in verts.tolist()]
+    return new_vertices, edges.tolist(), new_faces
+
+def voronoi_bounded(sites, bound_mode='BOX', clip=True, draw_bounds=True, draw_hangs=False, make_faces=False, ordered_faces=False, max_sides=10, engine=FORTUNE):
+    """
+    Voronoi diagram of sites on XOY plane, bounded by a box or a circle.
+    Engine is either FORTUNE (pure python implementation of Fortune's
+    algorithm) or SCIPY (scipy.spatial.Voronoi, much faster on big numbers
+    of sites).
+    """
     bounds = Bounds.new(bound_mode)
     bounds.init_from_sites(sites)
-    source_sites = []
-    for x, y, z in sites:
-        source_sites.append(Site(x, y))
 
     delta = clip
     bounds.x_max = bounds.x_max + delta
@@ -1126,6 +1286,17 @@ def voronoi_bounded(sites, bound_mode='BOX', clip=True, draw_bounds=True, draw_h
 
     bounds.r_max = bounds.r_max + delta
 
+    if engine == SCIPY:
+        if scipy is None:
+            raise DependencyError("SciPy engine of Voronoi diagram requires scipy library to be installed")
+        # Qhull can not process less than 3 sites or sites on a line
+        if len(sites) > 2 and np.linalg.matrix_rank(np.asarray(sites)[1:, :2] - np.asarray(sites)[0, :2]) == 2:
+            return _voronoi_bounded_scipy(sites, bounds, draw_bounds, draw_hangs, make_faces, ordered_faces, max_sides)
+
+    source_sites = []
+    for x, y, z in sites:
+        source_sites.append(Site(x, y))
+
     voronoi_data = computeVoronoiDiagram(source_sites, raise_exception=True)
     verts = voronoi_data.vertices
     lines = voronoi_data.lines
@@ -1298,7 +1469,7 @@ def unique_points(points, eps=1e-4):
                 repeating.append(p)
     return mask, unique, repeating
 
-def lloyd2d(bound_mode, verts, n_iterations, clip=0.0, weight_field=None):
+def lloyd2d(bound_mode, verts, n_iterations, clip=0.0, weight_field=None, engine=FORTUNE):
     bounds = Bounds.new(bound_mode)
     bounds.init_from_sites(verts)
 
@@ -1327,7 +1498,8 @@ def lloyd2d(bound_mode, verts, n_iterations, clip=0.0, weight_field=None):
                     draw_hangs = True,
                     make_faces = True,
                     ordered_faces = True,
-                    max_sides = 20)
+                    max_sides = 20,
+                    engine = engine)
         centers = []
         for face in voronoi_faces[:n]:
             face_verts = np.array([voronoi_verts[i] for i in face])
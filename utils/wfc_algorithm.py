@@ -3,6 +3,7 @@ Initial code was taken from Houdini software implementation
 https://github.com/sideeffects/SideFXLabs
 """
 
+import heapq
 from itertools import chain
 
 import numpy as np
@@ -33,15 +34,29 @@ class WaveFunctionCollapse:
         self.patterns_transforms = []
         self.pattern_frequencies = []
         self.number_of_unique_patterns = None
-        self.output_grid = {}
-        self.entropy_grid = {}
+        # wave[cell] is a bit mask of patterns which are still allowed in the cell,
+        # pattern_index bit is set while the pattern is allowed
+        self.wave = None
+        self.collapsed = None
+        self.entropy_heap = []
+        self.cell_neighbors = None
         self.solve_starting_point_index = None
-        self.allowed_pattern_adjacencies = {}
+        # propagator[direction, pattern_index1, pattern_index2] is True if pattern 2
+        # can be placed next to pattern 1 in given direction
+        self.propagator = None
+        # the same as bit masks, propagator_masks[direction][pattern_index1] has bits of patterns 2
+        self.propagator_masks = None
+        # propagator_tables[direction][n][byte] is the union of masks of patterns 8 * n + bit
+        # for bits set in the byte, so that masks are combined by bytes instead of by bits
+        self.propagator_tables = None
+        # (direction, bit mask of patterns of a cell) -> bit mask of patterns allowed in the neighbor
+        self.allowed_cache = dict()
         self.nbr_directions = ((-1, 0), (1, 0), (0, -1), (0, 1))
         self.respect_user_constraints = False
         self.use_input_pattern_frequency = 1
 
         self.create_patterns_from_input()
+        self.calculate_adjacencies()
 
     def solve(self,
               output_size=(10, 10),
@@ -51,6 +66,7 @@ class WaveFunctionCollapse:
 
         self.output_grid_size = output_size
         self.tile_around_bounds = tiling_output
+        self.calculate_neighbors()
 
         for solve_attempt in range(max_number_contradiction_tries):
 
@@ -60,7 +76,6 @@ class WaveFunctionCollapse:
             # Initialize WFC process
             self.initialize_grid()
             self.initialize_entropy_grid()
-            self.calculate_adjacencies()
 
             if self.respect_user_constraints:
                 success = ForceUserConstraints()  # is this need?
@@ -105,7 +120,7 @@ class WaveFunctionCollapse:
                         list_index = int(((x + sub_items) % self.input_grid_size[0]) + (
                                         ((item[0] + self.input_grid_size[0] * y) / self.input_grid_size[0])
                                         % self.input_grid_size[1]) * self.input_grid_size[0])
-                        tmp.append(self.input_sample_image[list_index])
+                        tmp.append(tuple(self.input_sample_image[list_index]))
 
                     # This is where variations would take place
 
@@ -130,174 +145,207 @@ class WaveFunctionCollapse:
         self.patterns = []
         self.patterns_transforms = []
         self.pattern_frequencies = []
+        pattern_indices = dict()
 
         for i, pattern in enumerate(all_temp_patterns):
-            if pattern not in self.patterns:
+            index = pattern_indices.get(pattern)
+            if index is None:
+                pattern_indices[pattern] = len(self.patterns)
                 self.patterns.append(pattern)
                 self.pattern_frequencies.append(1)
                 self.patterns_transforms.append(all_temp_patterns_transforms[i])
             else:
-                index = self.patterns.index(pattern)
                 self.pattern_frequencies[index] += 1
 
         self.number_of_unique_patterns = len(self.pattern_frequencies)
 
     def initialize_grid(self):
-        # Here we create a list that will be used as our output grid. (Used for solving in)
+        # Here we create a wave that will be used as our output grid. (Used for solving in)
+        # Initially all patterns are allowed in all cells
 
-        for x in range(self.output_grid_size[0] * self.output_grid_size[1]):
-            self.output_grid[x] = set(range(self.number_of_unique_patterns))
+        number_of_cells = self.output_grid_size[0] * self.output_grid_size[1]
+        self.wave = [(1 << self.number_of_unique_patterns) - 1] * number_of_cells
+        self.collapsed = [False] * number_of_cells
 
     def initialize_entropy_grid(self):
-        # Here we create grid that matches the output grid, but we store entropy values instead.
+        # Here we create heap of cells ordered by entropy values.
         # (Entropy = Number of remaining legal patterns)
+        # Cells with equal entropy are picked in random order.
+        # Cells are pushed again each time their entropy changes, outdated records are skipped
 
-        for x in range(self.output_grid_size[0] * self.output_grid_size[1]):
-            self.entropy_grid[x] = self.number_of_unique_patterns
+        number_of_cells = len(self.wave)
+        noise = np.random.random(number_of_cells)
+        self.entropy_heap = [(self.number_of_unique_patterns, n, cell) for cell, n in enumerate(noise.tolist())]
 
         # Pick starting point for solve. (Random if not specified)
         if self.solve_starting_point_index is None:
-            # solve_starting_point_index = np.random.randint(NumberOfUniquePatterns)
-            self.solve_starting_point_index = np.random.randint(len(self.entropy_grid.keys()))
+            self.solve_starting_point_index = np.random.randint(number_of_cells)
 
-        self.entropy_grid[self.solve_starting_point_index] = self.number_of_unique_patterns - 1
+        start = self.solve_starting_point_index % number_of_cells
+        self.entropy_heap[start] = (self.number_of_unique_patterns - 1, 0.0, start)
+        heapq.heapify(self.entropy_heap)
 
     def calculate_adjacencies(self):
         # If PatternIndex = 10 has been observed to be to the left of of PatternIndex = 15 in the InputGrid:
-        # AllowedPatternAdjacencies[PatternIndex=15][0].add(PatternIndex=10)
+        # propagator[0, 15, 10] = True
         # Directions: 0 = left, 1 = right, 2 = up, 3 = down
-        # OUTPUT EXAMPLE PatternIndex = 15 --> (LEFT: set([65, 36, 69, 44, 87, 56, 29]),
-        # RIGHT: set([8]), UP: set([32, 64, 10, 12, 14, 83, 21]), DOWN: set([15]))
 
-        # Initialize empty AllowedPatternAdjacencies
-        for x in range(self.number_of_unique_patterns):
-            self.allowed_pattern_adjacencies[x] = tuple(set() for _ in range(len(self.nbr_directions)))
-
-        # Comparing patterns to each other
-        for PatternIndex1 in range(self.number_of_unique_patterns):
-            for PatternIndex2 in range(self.number_of_unique_patterns):
-
-                pattern1_boundary_columns = [n for i, n in enumerate(self.patterns[PatternIndex1]) if
-                                             i % self.pattern_size != (self.pattern_size - 1)]
-                pattern2_boundary_columns = [n for i, n in enumerate(self.patterns[PatternIndex2]) if
-                                             i % self.pattern_size != 0]
-
-                # Compare Columns compatibility
-                if pattern1_boundary_columns == pattern2_boundary_columns:
-                    self.allowed_pattern_adjacencies[PatternIndex1][0].add(PatternIndex2)
-                    self.allowed_pattern_adjacencies[PatternIndex2][1].add(PatternIndex1)
-
-                pattern1_boundary_rows = self.patterns[PatternIndex1][
-                                       :(self.pattern_size * self.pattern_size) - self.pattern_size]
-                pattern2_boundary_rows = self.patterns[PatternIndex2][self.pattern_size:]
-
-                if pattern1_boundary_rows == pattern2_boundary_rows:
-                    self.allowed_pattern_adjacencies[PatternIndex1][2].add(PatternIndex2)
-                    self.allowed_pattern_adjacencies[PatternIndex2][3].add(PatternIndex1)
+        size = self.pattern_size
+        patterns = np.array(self.patterns).reshape(self.number_of_unique_patterns, size, size, -1)
+
+        def overlapping(part1, part2):
+            # compare each part of first patterns with each part of second patterns
+            parts = np.concatenate([part1, part2]).reshape(2 * len(part1), -1)
+            _, ids = np.unique(parts, axis=0, return_inverse=True)
+            ids = ids.ravel()
+            return ids[:len(part1), np.newaxis] == ids[np.newaxis, len(part1):]
+
+        # Compare Columns compatibility
+        left = overlapping(patterns[:, :, :-1], patterns[:, :, 1:])
+        # Compare Rows compatibility
+        up = overlapping(patterns[:, :-1], patterns[:, 1:])
+        self.propagator = np.stack([left, left.T, up, up.T])
+        self.propagator_masks = [[int.from_bytes(np.packbits(row, bitorder='little').tobytes(), 'little')
+                                  for row in direction] for direction in self.propagator]
+        self.propagator_tables = []
+        for masks in self.propagator_masks:
+            tables = []
+            for start in range(0, len(masks), 8):
+                byte_masks = masks[start:start + 8]
+                table = [0] * (1 << len(byte_masks))
+                for byte in range(1, len(table)):
+                    lowest_bit = byte & -byte
+                    table[byte] = table[byte ^ lowest_bit] | byte_masks[lowest_bit.bit_length() - 1]
+                tables.append(table)
+            self.propagator_tables.append(tables)
+        self.allowed_cache = dict()
+
+    def calculate_neighbors(self):
+        # Indexes of neighbor cells in each direction, -1 if the neighbor is out of bounds
+        width, height = self.output_grid_size
+        xs, ys = np.meshgrid(np.arange(width), np.arange(height))
+        xs, ys = xs.ravel(), ys.ravel()
+        neighbors = []
+        for dx, dy in self.nbr_directions:
+            nxs, nys = xs + dx, ys + dy
+            valid = (nxs >= 0) & (nxs < width) & (nys >= 0) & (nys < height)
+            nbrs = (nxs % width) + (nys % height) * width
+            # If the user does not want the WFC solve to create a tiling output,
+            # we just state that the found neighbor cell is invalid and don't propagate it
+            if not self.tile_around_bounds:
+                nbrs[~valid] = -1
+            neighbors.append(nbrs)
+        self.cell_neighbors = np.stack(neighbors, axis=1).tolist()
 
     def run_wfc_solve(self):
         # This runs the actual WFC solve
-        running = True
-        while running:
+        while True:
 
             # Find the cell with the lowest entropy value, and assign a random valid PatternIndex
             lowest_entropy_cell = self.get_lowest_entropy_cell()
+            if lowest_entropy_cell is None:
+                # All cells in the OutputGrid have collapsed (done solving)
+                return True
+
             pattern_index_for_cell = self.get_random_allowed_pattern_index_from_cell(lowest_entropy_cell)
             self.assign_pattern_to_cell(lowest_entropy_cell, pattern_index_for_cell)
 
             # Propagate the OutputGrid after collapsing the LowestEntropyCell
-            running, error = self.propagate_grid_cells(lowest_entropy_cell)
-
-            # Check if all cells in the OutputGrid have collapsed yet (done solving)
-            if len(self.entropy_grid.keys()) == 0:
-                running = False
-
-        # Check if we have ran into an error. (contradiction while propagating)
-        if error == 1:
-            return False
-        else:
-            return True
+            if not self.propagate_grid_cells(lowest_entropy_cell):
+                # contradiction while propagating
+                return False
 
     def get_lowest_entropy_cell(self):
-        # Find the list entry in the entropy grid with the lowest value
-        return min(self.entropy_grid, key=self.entropy_grid.get)
+        # Pop the cell with the lowest entropy value, skipping outdated heap records
+        while self.entropy_heap:
+            entropy, _, cell = heapq.heappop(self.entropy_heap)
+            if not self.collapsed[cell]:
+                return cell
+        return None
 
     def get_random_allowed_pattern_index_from_cell(self, cell):
         # Assign a random allowed pattern_index to given cell.
         # This can either use frequency of found patterns as a weighted random or not depending on user parm
+        cell_patterns = self.wave[cell]
+        allowed = [i for i in range(self.number_of_unique_patterns) if cell_patterns >> i & 1]
         if self.use_input_pattern_frequency == 1:
-            return np.random.choice(
-                [pattern_index for pattern_index in self.output_grid[cell]
-                 for i in range(self.pattern_frequencies[pattern_index])])
+            weights = np.array(self.pattern_frequencies, dtype=np.float64)[allowed]
+            return np.random.choice(allowed, p=weights / weights.sum())
         else:
-            return np.random.choice([pattern_index for pattern_index in self.output_grid[cell]])
+            return np.random.choice(allowed)
 
     def assign_pattern_to_cell(self, cell, pattern_index):
-        # Assign given cell a chosen PatternIndex, and delete cell from EntropyGrid (Cell has collapsed)
-        self.output_grid[cell] = {pattern_index}
-        del self.entropy_grid[cell]
+        # Assign given cell a chosen PatternIndex, and mark the cell as collapsed
+        self.wave[cell] = 1 << int(pattern_index)
+        self.collapsed[cell] = True
+
+    def allowed_patterns(self, direction, cell_patterns):
+        # Bit mask of patterns which can be placed next to the cell in given direction.
+        # Cells have the same sets of patterns very often, so the results are cached
+        key = (direction, cell_patterns)
+        allowed = self.allowed_cache.get(key)
+        if allowed is None:
+            allowed = 0
+            patterns = cell_patterns
+            for table in self.propagator_tables[direction]:
+                if not patterns:
+                    break
+                allowed |= table[patterns & 255]
+                patterns >>= 8
+            self.allowed_cache[key] = allowed
+        return allowed
 
     def propagate_grid_cells(self, cell):
         # This propagates all the cells that should have been affected from the just-collapsed cell
+        # Returns False if some cell has no allowed patterns left
 
         # We are using a stack to add newly found to-be-updated cells to
-        to_update_stack = {cell}
-        while len(to_update_stack) != 0:
+        to_update_stack = [cell]
+        in_stack = {cell}
+        wave = self.wave
+        collapsed = self.collapsed
+        allowed_cache = self.allowed_cache
+        while to_update_stack:
             cell_index = to_update_stack.pop()
+            in_stack.discard(cell_index)
+            cell_patterns = wave[cell_index]
 
             # loop through neighbor cells of currently propagated cell
-            for direction, transform in enumerate(self.nbr_directions):
-
-                neighbor_index_is_valid = True
-
-                x = int((cell_index % self.output_grid_size[0] + transform[0]) % self.output_grid_size[0])
-                y = int((cell_index / self.output_grid_size[0] + transform[1]) % self.output_grid_size[1])
-                neighbor_cell_index = x + y * self.output_grid_size[0]  # index of neighboring cell
-
-                # If the user does not want the WFC solve to create a tiling output,
-                # we just state that the found neighbor cell is invalid and don't propagate it
-                if not self.tile_around_bounds:
-                    x_is_wrapping = abs(neighbor_cell_index % self.output_grid_size[0]
-                                        - cell_index % self.output_grid_size[0]) > 1
-                    y_is_wrapping = abs(neighbor_cell_index / self.output_grid_size[1]
-                                        - cell_index / self.output_grid_size[1]) > 1
-
-                    if x_is_wrapping or y_is_wrapping:
-                        neighbor_index_is_valid = False
-
-                # Cell has not yet been collapsed yet
-                if neighbor_cell_index in self.entropy_grid and neighbor_index_is_valid:
-
-                    # These are all the allowed patterns for the direction of the checked neighbor cell
-                    pattern_indices_in_cell = {n for pattern_index in self.output_grid[cell_index] for n in
-                                               self.allowed_pattern_adjacencies[pattern_index][direction]}
+            for direction, neighbor_cell_index in enumerate(self.cell_neighbors[cell_index]):
 
-                    # These are all the patterns the neighbor allows itself
-                    pattern_indices_in_neighbor_cell = self.output_grid[neighbor_cell_index]
+                # Skip cells out of bounds and cells which are collapsed already
+                if neighbor_cell_index < 0 or collapsed[neighbor_cell_index]:
+                    continue
 
-                    # Make sure we need to update the cell
-                    # by checking if the currently pattern_indices_in_cell patterns for the neighbor cells
-                    # are already fully contained in the now reduced set of patterns
-                    if not pattern_indices_in_neighbor_cell.issubset(pattern_indices_in_cell):
+                # These are all the allowed patterns for the direction of the checked neighbor cell
+                allowed = allowed_cache.get((direction, cell_patterns))
+                if allowed is None:
+                    allowed = self.allowed_patterns(direction, cell_patterns)
+                neighbor_patterns = wave[neighbor_cell_index]
+                shared = neighbor_patterns & allowed
 
-                        shared_cell_and_neighbor_pattern_indices = set(
-                            [x for x in pattern_indices_in_cell if x in pattern_indices_in_neighbor_cell])
+                # Make sure we need to update the cell
+                if shared != neighbor_patterns:
+                    if not shared:
+                        return False
 
-                        if len(shared_cell_and_neighbor_pattern_indices) == 0:
-                            return False, 1
+                    wave[neighbor_cell_index] = shared
+                    entropy = bin(shared).count('1')
+                    heapq.heappush(self.entropy_heap, (entropy, np.random.random(), neighbor_cell_index))
+                    if neighbor_cell_index not in in_stack:
+                        in_stack.add(neighbor_cell_index)
+                        to_update_stack.append(neighbor_cell_index)
 
-                        self.output_grid[neighbor_cell_index] = shared_cell_and_neighbor_pattern_indices
-                        self.entropy_grid[neighbor_cell_index] = len(self.output_grid[neighbor_cell_index])
-                        to_update_stack.add(neighbor_cell_index)
+        return True
 
-        return True, 0
+    def solved_pattern_indices(self):
+        # Index of the pattern of each cell, the wave should be solved
+        return [cell_patterns.bit_length() - 1 for cell_patterns in self.wave]
 
     def assign_wave_to_output(self):
         # This finds and assigns the picked PatternIndex to the output grid as attributes
-        flat_out_image = []
-        for x in self.output_grid.keys():
-            val = next(iter(self.output_grid[x]))
-            flat_out_image.append(self.patterns[val][0])
+        pattern_indices = self.solved_pattern_indices()
+        flat_out_image = [list(self.patterns[val][0]) for val in pattern_indices]
 
         out_image = []
         for i_row in range(self.output_grid_size[1]):